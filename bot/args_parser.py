@@ -1,6 +1,7 @@
 """Parses arguments for be parsed onto `controller.main`."""
 
 import argparse
+import os
 
 
 def args_parser():
@@ -38,6 +39,56 @@ def args_parser():
             (25=25%%).'
     )
 
+    argsParser.add_argument(
+        '-c',
+        '--combined-stream',
+        action='store_true',
+        default=False,
+        help='Receive the candles of every coin over a single combined stream\
+            connection?'
+    )
+
+    argsParser.add_argument(
+        '-r',
+        '--runtime',
+        action='store',
+        choices=['threads', 'asyncio'],
+        default='threads',
+        help='Run the traders in processes and threads, or in an asyncio event\
+            loop per worker? Without a combined stream or the market data\
+            bus, the threads runtime runs a process per coin for at most 20\
+            coins, and the coins are not split between workers.'
+    )
+
+    argsParser.add_argument(
+        '-b',
+        '--market-data-bus',
+        action='store_true',
+        default=False,
+        help='Receive the candles of every coin in a single process and share\
+            them with the workers through shared memory?'
+    )
+
+    argsParser.add_argument(
+        '-g',
+        '--rest-gateway',
+        action='store_true',
+        default=False,
+        help='Send the requests of every process through a single gateway\
+            process, prioritising orders?'
+    )
+
+    argsParser.add_argument(
+        '-w',
+        '--workers',
+        action='store',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes to split the coins between when\
+            using a combined stream, the market data bus or the asyncio\
+            runtime. Defaults to the number of cores.'
+    )
+
     args = argsParser.parse_args()
 
     # Validation
@@ -57,4 +108,7 @@ def args_parser():
                 'Must be able to cast `--balance-percent` to a float.'
             )
 
+    if args.workers < 1:
+        raise ValueError('`--workers` must be at least 1.')
+
     return args
@@ -0,0 +1,189 @@
+"""Runs many traders in a single asyncio event loop."""
+
+from typing import Dict, List, Optional
+import asyncio
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import websockets
+except ImportError:
+    websockets = None
+from backoff import Backoff
+from batch_trader import BatchTrader
+from combined_stream import MAX_STREAMS
+from kline_decoder import decode_closed_stream_kline
+from order_executor import AsyncOrderExecutor
+from trader import Trader
+from warmup import HISTORY_WEIGHT, WeightBudget
+
+
+class AsyncRuntime:
+    """Runs a collection of traders in one event loop.
+
+    The candles of every symbol are received over combined stream
+    connections, each limited to `MAX_STREAMS` symbols. Each closed candle is
+    queued for its trader, and the candles queued are traded together by a
+    `BatchTrader`.
+    REST calls, such as warming up and placing orders, are run on the
+    default executor of the loop so that they never block the connections.
+    Candles are traded on a separate pool, as trading logs and saves the
+    state of the trader, so that a burst of candles never holds up an order.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        traders: Dict[str, Trader],
+        weightPerMinute: int
+    ) -> None:
+        """Sets up the runtime.
+
+        Args:
+            config - (dict) Config dict.
+            traders - (dict) Trader of each trade symbol. The traders should
+                share a `SendOrderSignal` and `Ledger`.
+            weightPerMinute - (int) Request weight that can be used per
+                minute whilst warming up.
+        """
+        if websockets is None:
+            raise ImportError(
+                'websockets must be installed to use the asyncio runtime.'
+            )
+
+        self.config = config
+        defaults = config['defaults']
+
+        self._traders = {
+            f"{tradeSymbol.lower()}@kline_{defaults['interval']}": trader
+            for tradeSymbol, trader in traders.items()
+        }
+        self._budget = WeightBudget(weightPerMinute)
+        self._batch = BatchTrader(config)
+        self._queue: Optional[asyncio.Queue] = None
+        self._candleExecutor = ThreadPoolExecutor(
+            thread_name_prefix='candles'
+        )
+
+    async def _warm_up(
+        self,
+        trader: Trader,
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        """Loads the balances and candles of a trader, as `Trader.on_open`.
+        """
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            try:
+                # Both loading the history and catching up on a reconnect
+                # fetch klines.
+                await loop.run_in_executor(
+                    None,
+                    self._budget.acquire,
+                    HISTORY_WEIGHT
+                )
+                await loop.run_in_executor(None, trader.on_open, None)
+            except Exception:
+                trader.log_error(traceback.format_exc())
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        """Trades on the candles queued, taking every candle queued whilst
+        the previous ones were being traded.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            candles = [await queue.get()]
+            while not queue.empty():
+                candles.append(queue.get_nowait())
+
+            try:
+                await loop.run_in_executor(
+                    self._candleExecutor,
+                    self._batch.on_candles,
+                    candles
+                )
+            except Exception:
+                print(f'\033[92m{traceback.format_exc()}\033[0m')
+            finally:
+                for _ in candles:
+                    queue.task_done()
+
+    async def _connect(self, streams: List[str]) -> None:
+        """Receives the candles of a collection of streams over a single
+        connection, reconnecting whenever the connection is closed.
+        """
+        defaults = self.config['defaults']
+        socketAddress = (defaults['combined_socket_address']
+                         + '/'.join(streams))
+        backoff = Backoff(
+            defaults['reconnect_backoff_secs'],
+            defaults['reconnect_max_backoff_secs']
+        )
+        semaphore = asyncio.Semaphore(defaults['warmup_workers'])
+
+        while True:
+            try:
+                async with websockets.connect(
+                    socketAddress,
+                    max_size=None
+                ) as ws:
+                    print(f'\033[92m\nConnected to {len(streams)} '
+                          'streams.\033[0m')
+
+                    # Candles received before the connection was lost are
+                    # traded before the traders catch up. Messages are
+                    # buffered whilst the traders warm up.
+                    await self._queue.join()
+                    await asyncio.gather(*(
+                        self._warm_up(self._traders[stream], semaphore)
+                        for stream in streams
+                    ))
+
+                    async for message in ws:
+                        decoded = decode_closed_stream_kline(message)
+                        if decoded is None:
+                            continue
+
+                        stream, candle = decoded
+                        trader = self._traders.get(stream)
+                        if trader is not None:
+                            self._queue.put_nowait((trader, candle))
+
+                        # The connection is healthy again.
+                        backoff.reset()
+
+            except Exception:
+                print(f'\033[91m{traceback.format_exc()}\033[0m')
+
+            delay = backoff.next_delay()
+            print(f'\033[91mReconnecting to {len(streams)} streams in '
+                  f'{delay} seconds.\033[0m')
+            await asyncio.sleep(delay)
+
+    async def run_async(self) -> None:
+        """Runs the traders until cancelled."""
+        loop = asyncio.get_running_loop()
+
+        for trader in self._traders.values():
+            trader.orderExecutor = AsyncOrderExecutor(
+                trader.place_order,
+                trader.on_order_result,
+                loop
+            )
+        self._queue = asyncio.Queue()
+
+        streams = list(self._traders)
+        connections = [
+            self._connect(streams[idx:idx + MAX_STREAMS])
+            for idx in range(0, len(streams), MAX_STREAMS)
+        ]
+
+        await asyncio.gather(self._consume(self._queue), *connections)
+
+    def run(self) -> None:
+        """Runs the traders until interrupted."""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            self._candleExecutor.shutdown()
+            for trader in self._traders.values():
+                trader.close()
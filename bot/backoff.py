@@ -0,0 +1,77 @@
+"""Exponential backoff between reconnection attempts."""
+
+from typing import Callable
+import time
+
+
+class Backoff:
+    """Doubles the delay after each failed attempt, up to a maximum."""
+
+    def __init__(self, baseSecs: float, maxSecs: float) -> None:
+        """Sets up the backoff.
+
+        Args:
+            baseSecs - (float) Delay before the first attempt.
+            maxSecs - (float) Maximum delay.
+        """
+        self._baseSecs = baseSecs
+        self._maxSecs = maxSecs
+        self._failures = 0
+
+    def reset(self) -> None:
+        """Resets the delay once a connection is healthy."""
+        self._failures = 0
+
+    def next_delay(self) -> float:
+        """Returns the delay before the next attempt and increases it."""
+        delay = min(self._baseSecs * 2 ** self._failures, self._maxSecs)
+        self._failures += 1
+        return delay
+
+    def wait(self) -> float:
+        """Sleeps before the next attempt.
+
+        Returns:
+            float - Number of seconds slept.
+        """
+        delay = self.next_delay()
+        time.sleep(delay)
+        return delay
+
+
+def run_reconnecting(
+    connect: Callable[[Callable], object],
+    backoff: Backoff,
+    name: str
+) -> None:
+    """Runs a websocket connection, reconnecting whenever it is closed, until
+    interrupted. Connections torn down by an error are reopened after the
+    backoff, those closed cleanly by the server are reopened straight away.
+
+    Args:
+        connect - (Callable) Creates a `websocket.WebSocketApp`, given the
+            `on_error` callback it should use.
+        backoff - (Backoff) Backoff between reconnection attempts.
+        name - (str) Name of the connection to report.
+    """
+    interrupted = False
+
+    def on_error(ws, err: Exception) -> None:
+        # `run_forever` catches the interrupt itself and only reports it
+        # through this callback.
+        nonlocal interrupted
+        if isinstance(err, KeyboardInterrupt):
+            interrupted = True
+
+    while True:
+        errored = connect(on_error).run_forever()
+        if interrupted:
+            return
+
+        if errored:
+            delay = backoff.next_delay()
+            print(f'\033[91mReconnecting to {name} in {delay} '
+                  'seconds.\033[0m')
+            time.sleep(delay)
+        else:
+            print(f'\033[91mReconnecting to {name}.\033[0m')
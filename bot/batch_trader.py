@@ -0,0 +1,139 @@
+"""Trades the candles of many symbols together."""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+import queue
+import traceback
+import numpy as np
+from kline_decoder import Candle
+from strategies import BatchEvaluator
+from trader import Trader
+
+
+class BatchTrader:
+    """Trades the candles closed at the same time by many traders together.
+
+    The candles are added to each trader first, then the strategies of every
+    trader sharing the same strategies are applied in a single call to a
+    `BatchEvaluator`, rather than once per trader.
+
+    Candles can be handed over from another thread with `submit`, in which
+    case they are traded by `run`, taking every candle queued since it last
+    traded.
+    """
+
+    def __init__(self, config: dict) -> None:
+        """Sets up the batch trader.
+
+        Args:
+            config - (dict) Config dict.
+        """
+        self.config = config
+        self._evaluators: Dict[Tuple[type, ...], BatchEvaluator] = {}
+        self._queue = queue.Queue()
+
+    def evaluator(self, strategies: Sequence[type]) -> BatchEvaluator:
+        """Fetches the evaluator of a set of strategies, creating it when
+        first needed.
+
+        Args:
+            strategies - (type[]) Strategy classes.
+
+        Returns:
+            BatchEvaluator - Evaluator applying the strategies.
+        """
+        key = tuple(strategies)
+        evaluator = self._evaluators.get(key)
+        if evaluator is None:
+            evaluator = self._evaluators[key] = BatchEvaluator(key,
+                                                               self.config)
+        return evaluator
+
+    def on_candles(self, candles: Iterable[Tuple[Trader, Candle]]) -> None:
+        """Trades on closed candles. A trader given many candles trades on
+        each of them in turn.
+
+        Args:
+            candles - (tuple[]) Trader and closed candle pairs, oldest first
+                for each trader.
+        """
+        rounds: List[List[Tuple[Trader, Candle]]] = []
+        seen: Dict[int, int] = {}
+        for trader, candle in candles:
+            idx = seen.get(id(trader), 0)
+            seen[id(trader)] = idx + 1
+            if idx == len(rounds):
+                rounds.append([])
+            rounds[idx].append((trader, candle))
+
+        for candleRound in rounds:
+            self._trade(candleRound)
+
+    def _trade(self, candles: Sequence[Tuple[Trader, Candle]]) -> None:
+        """Trades on a closed candle of each of a collection of distinct
+        traders.
+
+        Args:
+            candles - (tuple[]) Trader and closed candle pairs.
+        """
+        groups: Dict[Tuple[type, ...], List[Trader]] = {}
+        for trader, candle in candles:
+            try:
+                if trader.add_candle(candle):
+                    groups.setdefault(tuple(trader.strategies),
+                                      []).append(trader)
+            except Exception:
+                trader.log_error(traceback.format_exc())
+
+        for strategies, traders in groups.items():
+            try:
+                decisions, results = self.evaluator(strategies).evaluate(
+                    np.array([trader.closes[-1] for trader in traders]),
+                    np.array([len(trader.candles) for trader in traders]),
+                    [trader.indicators for trader in traders],
+                    [trader.ownCoins for trader in traders]
+                )
+            except Exception:
+                # Each trader runs its own strategies instead.
+                traders[0].log_error(traceback.format_exc())
+                decisions = results = [None] * len(traders)
+
+            for idx, trader in enumerate(traders):
+                try:
+                    trader.trade(trader.closes[-1], decisions[idx],
+                                 results[idx])
+                    trader.save_state_throttled()
+                except Exception:
+                    err = traceback.format_exc()
+                    trader.log_error(err)
+                    print(f'\033[92m{err}\033[0m')
+
+    def submit(self, trader: Trader, candle: Candle) -> None:
+        """Queues a closed candle to be traded by `run`.
+
+        Args:
+            trader - (Trader) Trader of the candle's symbol.
+            candle - (Candle) Closed candle.
+        """
+        self._queue.put((trader, candle))
+
+    def join(self) -> None:
+        """Waits until every candle submitted has been traded."""
+        self._queue.join()
+
+    def run(self) -> None:
+        """Trades on the submitted candles, forever."""
+        while True:
+            candles = [self._queue.get()]
+            try:
+                while True:
+                    candles.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                self.on_candles(candles)
+            except Exception:
+                print(f'\033[92m{traceback.format_exc()}\033[0m')
+            finally:
+                for _ in candles:
+                    self._queue.task_done()
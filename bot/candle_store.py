@@ -0,0 +1,139 @@
+"""Fixed size store of the latest candles for a single coin."""
+
+from typing import Optional
+import numpy as np
+
+
+class CandleStore:
+    """Fixed size circular buffer of the latest candles for a single coin.
+
+    Each field is stored as a row of a preallocated float64 block. Every
+    candle is written to two positions, `idx` and `idx + capacity`, so the
+    latest candles of any field can always be returned as a contiguous view
+    of the block without copying or reordering.
+
+    Views are only valid until the next candle is added.
+    """
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume', 'open_time')
+
+    def __init__(self, capacity: int, buffer: Optional[np.array] = None):
+        """Sets up an empty store.
+
+        Args:
+            capacity - (int) Number of candles to keep.
+            buffer - (np.array) float64 array of shape
+                (len(FIELDS), 2 * capacity) to store the candles in. A new
+                array is created if one is not provided.
+        """
+        self.capacity = capacity
+        self._data = (np.zeros((len(self.FIELDS), 2 * capacity))
+                      if buffer is None else buffer)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def clear(self) -> None:
+        """Removes every candle."""
+        self._count = 0
+
+    def append(
+        self,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        openTime: float
+    ) -> None:
+        """Adds the latest candle, dropping the oldest candle once the store
+        is full.
+
+        Args:
+            open - (float) Open price.
+            high - (float) High price.
+            low - (float) Low price.
+            close - (float) Close price.
+            volume - (float) Volume.
+            openTime - (float) Open time in milliseconds.
+        """
+        idx = self._count % self.capacity
+        data = self._data
+        data[0, idx] = data[0, idx + self.capacity] = open
+        data[1, idx] = data[1, idx + self.capacity] = high
+        data[2, idx] = data[2, idx + self.capacity] = low
+        data[3, idx] = data[3, idx + self.capacity] = close
+        data[4, idx] = data[4, idx + self.capacity] = volume
+        data[5, idx] = data[5, idx + self.capacity] = openTime
+        self._count += 1
+
+    def extend(
+        self,
+        opens: np.array,
+        highs: np.array,
+        lows: np.array,
+        closes: np.array,
+        volumes: np.array,
+        openTimes: np.array
+    ) -> None:
+        """Adds a collection of candles, oldest first.
+
+        Args:
+            opens - (np.array) Open prices.
+            highs - (np.array) High prices.
+            lows - (np.array) Low prices.
+            closes - (np.array) Close prices.
+            volumes - (np.array) Volumes.
+            openTimes - (np.array) Open times in milliseconds.
+        """
+        candles = np.array(
+            [opens, highs, lows, closes, volumes, openTimes],
+            dtype=float
+        )[:, -self.capacity:]
+
+        for candle in candles.T:
+            self.append(*candle)
+
+    def field(self, name: str) -> np.array:
+        """Returns a contiguous view of a field for the candles in the store,
+        oldest first.
+
+        Args:
+            name - (str) Field name, one of `FIELDS`.
+
+        Returns:
+            np.array - View of the field.
+        """
+        end = (self._count - 1) % self.capacity + 1 + self.capacity
+        return self._data[self.FIELDS.index(name), end - len(self):end]
+
+    @property
+    def opens(self) -> np.array:
+        """Open prices."""
+        return self.field('open')
+
+    @property
+    def highs(self) -> np.array:
+        """High prices."""
+        return self.field('high')
+
+    @property
+    def lows(self) -> np.array:
+        """Low prices."""
+        return self.field('low')
+
+    @property
+    def closes(self) -> np.array:
+        """Close prices."""
+        return self.field('close')
+
+    @property
+    def volumes(self) -> np.array:
+        """Volumes."""
+        return self.field('volume')
+
+    @property
+    def openTimes(self) -> np.array:
+        """Open times in milliseconds."""
+        return self.field('open_time')
@@ -0,0 +1,139 @@
+"""Trades many symbols over a single combined stream connection."""
+
+from typing import Dict, Optional
+import sys
+import traceback
+import websocket
+from backoff import Backoff, run_reconnecting
+from batch_trader import BatchTrader
+from kline_decoder import decode_closed_stream_kline
+from trader import Trader
+
+# Maximum number of streams a single connection can subscribe to.
+MAX_STREAMS = 1024
+
+
+class CombinedStream:
+    """Subscribes to the kline stream of many symbols over one connection and
+    routes each message to the trader of its symbol.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        traders: Dict[str, Trader],
+        batch: Optional[BatchTrader] = None
+    ) -> None:
+        """Sets up the connection.
+
+        Args:
+            config - (dict) Config dict.
+            traders - (dict) Trader of each trade symbol. The traders should
+                share a `SendOrderSignal` and `Ledger`.
+            batch - (BatchTrader) When given, the candles are submitted to
+                it to be traded together, rather than traded by each trader
+                as they are received. Its `run` must be running on another
+                thread.
+        """
+        if len(traders) > MAX_STREAMS:
+            raise ValueError(
+                f'A combined stream is limited to {MAX_STREAMS} symbols.'
+            )
+
+        self.config = config
+        defaults = config['defaults']
+
+        self._traders = {
+            f"{tradeSymbol.lower()}@kline_{defaults['interval']}": trader
+            for tradeSymbol, trader in traders.items()
+        }
+        self._batch = batch
+        self._socketAddress = (defaults['combined_socket_address']
+                               + '/'.join(self._traders))
+        self._backoff = Backoff(
+            defaults['reconnect_backoff_secs'],
+            defaults['reconnect_max_backoff_secs']
+        )
+
+    def on_open(self, ws: websocket.WebSocketApp):
+        """Method to run when the socket is opened.
+
+        Args:
+            ws - (websocket.WebSocketApp) Websocket object.
+        """
+        print(f'\033[92m\nConnected to {len(self._traders)} streams.\033[0m')
+
+        # Candles received before the connection was lost are traded before
+        # the traders catch up.
+        if self._batch is not None:
+            self._batch.join()
+
+        for trader in self._traders.values():
+            try:
+                trader.on_open(ws)
+            except Exception:
+                trader.log_error(traceback.format_exc())
+
+    def on_close(self, ws: websocket.WebSocketApp, *args):
+        """Method to run when the socket is closed. The connection is
+        reopened by `run`.
+
+         Args:
+            ws - (websocket.WebSocketApp) Websocket object.
+        """
+        print(f'\033[91mConnection to {len(self._traders)} streams '
+              'closed.\033[0m')
+
+    def on_message(self, ws: websocket.WebSocketApp, message: str) -> None:
+        """Routes a closed candle to the trader of its stream.
+
+         Args:
+            ws - (websocket.WebSocketApp) Websocket object.
+            message - (str) Message returned from websocket.
+        """
+        try:
+            decoded = decode_closed_stream_kline(message)
+            if decoded is None:
+                return
+
+            stream, candle = decoded
+            trader = self._traders.get(stream)
+            if trader is not None:
+                if self._batch is not None:
+                    self._batch.submit(trader, candle)
+                else:
+                    trader.on_candle(candle)
+
+            # The connection is healthy again.
+            self._backoff.reset()
+
+        except Exception:
+            err = traceback.format_exc()
+            print(f'\033[92m{err}\033[0m')
+
+    def run(self):
+        """Runs the traders, reconnecting whenever the connection is closed,
+        until interrupted. Reconnection attempts after an error are backed
+        off exponentially until a candle is received.
+        """
+        try:
+            run_reconnecting(
+                lambda onError: websocket.WebSocketApp(
+                    self._socketAddress,
+                    on_open=self.on_open,
+                    on_close=self.on_close,
+                    on_message=self.on_message,
+                    on_error=onError
+                ),
+                self._backoff,
+                f'{len(self._traders)} streams'
+            )
+        except KeyboardInterrupt:
+            # Interrupted whilst waiting to reconnect.
+            pass
+
+        if self._batch is not None:
+            self._batch.join()
+        for trader in self._traders.values():
+            trader.close()
+        sys.exit()
@@ -2,13 +2,24 @@
 singals
 """
 
-import time
+from typing import Dict, Optional, Tuple
+from functools import partial
 import json
-import os
-from datetime import datetime, timedelta
+import threading
+import traceback
 from copy import deepcopy
-from multiprocessing import Process
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
 from trader import Trader
+from send_order_signal import SendOrderSignal, HistoricalData
+from ledger import Ledger
+from batch_trader import BatchTrader
+from combined_stream import CombinedStream, MAX_STREAMS
+from warmup import WarmupScheduler, WeightBudget
+from kline_cache import KlineCache
+from shards import assign_shards, ShardSupervisor
+from market_data_bus import MarketDataBus, BusPublisher, BusSubscriber
+from rest_gateway import RestGateway, GATEWAY_ADDRESS
 from args_parser import args_parser
 
 
@@ -48,71 +59,422 @@ def load_config(options) -> dict:
     # Update test mode.
     config['testing']['testing'] = options.test_mode
 
+    # Requests are sent through the REST gateway if one is used.
+    defaults['rest_gateway_address'] = (GATEWAY_ADDRESS
+                                        if options.rest_gateway else None)
+
     # Returns a deep copy just in case the dictionary is mutated.
     return deepcopy(config)
 
 
-def run_trader(config: dict, tradeSymbol: str, seed: int) -> None:
+def fetch_history(
+    signalDispatcher: SendOrderSignal,
+    config: dict,
+    tradeSymbol: str,
+    seed: int
+) -> HistoricalData:
+    """Fetches the historical data needed by the trader of a symbol. Only the
+    candles missing from the symbol's cache are requested.
+
+    Args:
+        signalDispatcher - (SendOrderSignal) Used to request the candles.
+        config - (dict) Config dict.
+        tradeSymbol - (str) Trade symbol.
+        seed - (int) Seed number for selecting strategies to run.
+
+    Returns:
+        HistoricalData - Latest candles.
+    """
+    interval = config['defaults']['interval']
+    return KlineCache(
+        tradeSymbol,
+        interval,
+        Trader.lookback(config, Trader.select_strategies(seed))
+    ).sync(partial(signalDispatcher.historical_data, tradeSymbol, interval))
+
+
+def run_trader(
+    config: dict,
+    tradeSymbol: str,
+    seed: int,
+    historicalData: Optional[tuple] = None
+) -> None:
     """Runs an instance of the trader.
 
     Args:
         config - (dict) Config dict.
         tradeSymbol - (str) Trade symbol to trade in.
         seed - (int) Seed number for selecting strategies to run.
+        historicalData - (namedtuple) Historical data already fetched for
+            the symbol.
     """
-    Trader(config, tradeSymbol, seed).run()
+    Trader(config, tradeSymbol, seed, historicalData).run()
+
+
+def create_traders(
+    config: dict,
+    seeds: Dict[str, int]
+) -> Tuple[Dict[str, Trader], SendOrderSignal]:
+    """Creates the traders run by a single process, resuming each from its
+    snapshot if it has one. The traders share a single client and ledger.
+
+    Args:
+        config - (dict) Config dict.
+        seeds - (dict) Seed number for selecting the strategies of each
+            trade symbol.
+
+    Returns:
+        tuple - Trader of each trade symbol and the shared
+            `SendOrderSignal`.
+    """
+    defaults = config['defaults']
+
+    signalDispatcher = SendOrderSignal(
+        defaults['exchange_info_ttl_secs'],
+        defaults['rest_gateway_address']
+    )
+    ledger = Ledger(defaults['balance_reconcile_secs'])
+
+    traders = {}
+    for tradeSymbol, seed in seeds.items():
+        trader = Trader(config, tradeSymbol, seed, ledger=ledger)
+        trader.signalDispatcher = signalDispatcher
+        trader.restore_state()
+        traders[tradeSymbol] = trader
+
+    return traders, signalDispatcher
+
+
+def run_gateway(config: dict) -> None:
+    """Runs the REST gateway that every process sends its requests through.
+
+    Args:
+        config - (dict) Config dict.
+    """
+    defaults = config['defaults']
+    RestGateway([
+        SendOrderSignal(defaults['exchange_info_ttl_secs']).get_client()
+        for _ in range(defaults['rest_gateway_sessions'])
+    ]).run()
+
+
+def warm_up(
+    config: dict,
+    traders: Dict[str, Trader],
+    signalDispatcher: SendOrderSignal,
+    seeds: Dict[str, int],
+    weightPerMinute: int
+) -> None:
+    """Loads the historical data of the traders that could not be resumed
+    from a snapshot.
+
+    Args:
+        config - (dict) Config dict.
+        traders - (dict) Trader of each trade symbol.
+        signalDispatcher - (SendOrderSignal) Used to request the candles.
+        seeds - (dict) Seed number for selecting the strategies of each
+            trade symbol.
+        weightPerMinute - (int) Request weight that can be used per minute.
+    """
+    def load_history(tradeSymbol: str, historicalData: tuple) -> None:
+        # Traders whose data could not be fetched fetch it themselves once
+        # their connection is opened.
+        if historicalData is not None:
+            traders[tradeSymbol].load_historical_data(historicalData)
+
+    WarmupScheduler(
+        lambda tradeSymbol: fetch_history(
+            signalDispatcher,
+            config,
+            tradeSymbol,
+            seeds[tradeSymbol]
+        ),
+        WeightBudget(weightPerMinute),
+        config['defaults']['warmup_workers']
+    ).run(
+        [tradeSymbol for tradeSymbol, trader in traders.items()
+         if not trader.historyLoaded],
+        load_history
+    )
+
+
+def run_streams(
+    config: dict,
+    traders: Dict[str, object],
+    batch: Optional[BatchTrader] = None
+) -> None:
+    """Receives the candles of every symbol over combined stream
+    connections, handing each candle to the trader of its symbol.
+
+    Args:
+        config - (dict) Config dict.
+        traders - (dict) Trader, or `BusPublisher`, of each trade symbol.
+        batch - (BatchTrader) Batch trader to submit the candles to, rather
+            than handing them to the traders.
+    """
+    # Each connection is limited in the number of streams it can subscribe
+    # to, so the symbols are split across connections, each run on its own
+    # thread.
+    tradeSymbols = list(traders)
+    streams = [
+        CombinedStream(
+            config,
+            {tradeSymbol: traders[tradeSymbol]
+             for tradeSymbol in tradeSymbols[idx:idx + MAX_STREAMS]},
+            batch
+        )
+        for idx in range(0, len(tradeSymbols), MAX_STREAMS)
+    ]
+    for stream in streams[1:]:
+        threading.Thread(target=stream.run, daemon=True).start()
+    streams[0].run()
+
+
+def run_combined(
+    config: dict,
+    seeds: Dict[str, int],
+    weightPerMinute: int
+) -> None:
+    """Runs a trader for each symbol in a single process, receiving the
+    candles of every symbol over combined stream connections.
+
+    Args:
+        config - (dict) Config dict.
+        seeds - (dict) Seed number for selecting the strategies of each
+            trade symbol.
+        weightPerMinute - (int) Request weight that can be used per minute
+            whilst warming up.
+    """
+    traders, signalDispatcher = create_traders(config, seeds)
+    warm_up(config, traders, signalDispatcher, seeds, weightPerMinute)
+
+    # The candles closed at the same time are traded together.
+    batch = BatchTrader(config)
+    threading.Thread(target=batch.run, daemon=True).start()
+    run_streams(config, traders, batch)
+
+
+def run_ingestion(
+    config: dict,
+    bus: MarketDataBus,
+    notifies: Dict[str, Connection]
+) -> None:
+    """Receives the candles of every symbol and writes them to the market
+    data bus.
+
+    Args:
+        config - (dict) Config dict.
+        bus - (MarketDataBus) Bus to write to.
+        notifies - (dict) Write end of the pipe of the worker running the
+            trader of each trade symbol.
+    """
+    run_streams(config, {
+        tradeSymbol: BusPublisher(bus, tradeSymbol, notify)
+        for tradeSymbol, notify in notifies.items()
+    })
+
+
+def run_bus_worker(
+    config: dict,
+    seeds: Dict[str, int],
+    weightPerMinute: int,
+    bus: MarketDataBus,
+    notify: Connection
+) -> None:
+    """Runs a trader for each symbol in a single process, reading the
+    candles of every symbol from the market data bus.
+
+    Args:
+        config - (dict) Config dict.
+        seeds - (dict) Seed number for selecting the strategies of each
+            trade symbol.
+        weightPerMinute - (int) Request weight that can be used per minute
+            whilst warming up.
+        bus - (MarketDataBus) Bus to read from.
+        notify - (Connection) Read end of the pipe the ingestion process
+            writes to whenever one of the symbols has a new candle.
+    """
+    traders, signalDispatcher = create_traders(config, seeds)
+    subscriber = BusSubscriber(config, bus, traders, notify)
+
+    warm_up(config, traders, signalDispatcher, seeds, weightPerMinute)
+    for trader in traders.values():
+        try:
+            trader.on_open(None)
+        except Exception:
+            trader.log_error(traceback.format_exc())
+
+    subscriber.run()
+
+
+def run_async(
+    config: dict,
+    seeds: Dict[str, int],
+    weightPerMinute: int
+) -> None:
+    """Runs a trader for each symbol in a single asyncio event loop.
+
+    Args:
+        config - (dict) Config dict.
+        seeds - (dict) Seed number for selecting the strategies of each
+            trade symbol.
+        weightPerMinute - (int) Request weight that can be used per minute
+            whilst warming up.
+    """
+    # Imported here as the asyncio runtime depends on `websockets`, which is
+    # only needed for this runtime.
+    from async_runtime import AsyncRuntime
+
+    traders, _ = create_traders(config, seeds)
+    AsyncRuntime(config, traders, weightPerMinute).run()
 
 
 def main():
-    # Limits the number of coins to trade in, this is to prevent IP bans or
-    # having to timeout before sending further API requests.
+    # Limits the number of coins to trade in when each coin has its own
+    # connection, this is to prevent IP bans or having to timeout before
+    # sending further API requests.
     NO_COINS_TO_TRADE = 20
 
-    config = load_config(args_parser())
+    options = args_parser()
+    config = load_config(options)
+    defaults = config['defaults']
 
     processes = []
 
-    # To prevent an IP ban between each connection, we will simulate a delay
-    # pause before each connection.
-    tradeSyms = set(config['trade_symbols'])
+    tradeSyms = list(dict.fromkeys(config['trade_symbols']))
 
     # In test mode use only 1 coin.
     if config['testing']['testing']:
-        tradeSyms = config['trade_symbols'][0: 1]
+        tradeSyms = tradeSyms[0: 1]
 
-    delaySecs = 5
+    if (not options.combined_stream and not options.market_data_bus
+            and options.runtime == 'threads'):
+        if len(tradeSyms) > NO_COINS_TO_TRADE:
+            print(f'\033[93mTrading the first {NO_COINS_TO_TRADE} of '
+                  f'{len(tradeSyms)} coins, use -c, -b or -r asyncio to '
+                  'trade every coin across the workers.\033[0m')
+        tradeSyms = tradeSyms[:NO_COINS_TO_TRADE]
+    seeds = {tradeSymbol: idx % 2 for idx, tradeSymbol in enumerate(tradeSyms)}
 
-    totalSyms = min(len(tradeSyms), NO_COINS_TO_TRADE)
+    if options.rest_gateway:
+        # The gateway is restarted if it crashes, and ends with the
+        # controller. Callers reconnect to it on their next request.
+        threading.Thread(
+            target=ShardSupervisor(
+                run_gateway,
+                {'gateway': (config,)},
+                defaults['reconnect_backoff_secs'],
+                defaults['reconnect_max_backoff_secs'],
+                daemon=True
+            ).run,
+            daemon=True
+        ).start()
 
-    reqWaitTimeLoc = os.path.abspath(
-        os.path.join(
-            __file__,
-            os.pardir,
-            'request_wait_time.txt'
-        )
+    signalDispatcher = SendOrderSignal(
+        defaults['exchange_info_ttl_secs'],
+        defaults['rest_gateway_address']
     )
 
-    if not os.path.isfile(reqWaitTimeLoc):
-        with open(reqWaitTimeLoc, 'w+') as f:
-            f.write(datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S'))
+    # The trading rules of every symbol are requested once and shared with
+    # the traders through the exchange information cache, which is then
+    # refreshed on a timer rather than when placing an order.
+    signalDispatcher.refresh_exchange_info()
+    threading.Thread(
+        target=signalDispatcher.run_exchange_info_refresher,
+        daemon=True
+    ).start()
+
+    if options.market_data_bus:
+        # A single ingestion process receives the candles of every symbol
+        # and shares them through shared memory with the workers, which
+        # only run the traders.
+        shards = assign_shards(tradeSyms, options.workers)
+        bus = MarketDataBus(tradeSyms)
+        pipes = {shard: Pipe(duplex=False) for shard in shards}
 
-    for idx, tradeSymbol in enumerate(tradeSyms):
+        shardArgs = {
+            shard: (config,
+                    {tradeSymbol: seeds[tradeSymbol]
+                     for tradeSymbol in shardSyms},
+                    defaults['request_weight_limit'] // len(shards),
+                    bus,
+                    pipes[shard][0])
+            for shard, shardSyms in shards.items()
+        }
+        # The ingestion process is supervised with the workers so that it is
+        # restarted if it crashes. The candles published before the crash
+        # are kept on the bus.
+        shardArgs['ingestion'] = (
+            config,
+            bus,
+            {tradeSymbol: pipes[shard][1]
+             for shard, shardSyms in shards.items()
+             for tradeSymbol in shardSyms}
+        )
+
+        print(f'Running {len(tradeSyms)} symbols across {len(shards)} '
+              'workers.')
+        try:
+            ShardSupervisor(
+                run_bus_worker,
+                shardArgs,
+                defaults['reconnect_backoff_secs'],
+                defaults['reconnect_max_backoff_secs'],
+                {'ingestion': run_ingestion}
+            ).run()
+        finally:
+            bus.close()
+        return
+
+    if options.combined_stream or options.runtime == 'asyncio':
+        # The symbols are split across a fixed number of worker processes,
+        # each hosting the traders of its shard and a share of the request
+        # weight. Consistent hashing keeps a symbol on the same shard as the
+        # symbols or workers change, and a crashed shard is restarted on its
+        # own, resuming its traders from their snapshots.
+        shards = assign_shards(tradeSyms, options.workers)
+        weightPerMinute = defaults['request_weight_limit'] // len(shards)
 
-        if idx == NO_COINS_TO_TRADE:
-            break
+        print(f'Running {len(tradeSyms)} symbols across {len(shards)} '
+              'workers.')
+        ShardSupervisor(
+            run_async if options.runtime == 'asyncio' else run_combined,
+            {
+                shard: (config,
+                        {tradeSymbol: seeds[tradeSymbol]
+                         for tradeSymbol in shardSyms},
+                        weightPerMinute)
+                for shard, shardSyms in shards.items()
+            },
+            defaults['reconnect_backoff_secs'],
+            defaults['reconnect_max_backoff_secs']
+        ).run()
+        return
 
+    def start_trader(tradeSymbol: str, historicalData: tuple) -> None:
         process = Process(
             target=run_trader,
-            args=[config, tradeSymbol, idx % 2]
+            args=[config, tradeSymbol, seeds[tradeSymbol], historicalData]
         )
         process.start()
         processes.append(process)
 
-        print(
-            f'{idx+1} of {totalSyms} Set up. ETA: {timedelta(seconds=(totalSyms-idx+1)*delaySecs)}',  # noqa: E501
-            end='\r'
-        )
-        time.sleep(delaySecs)
+    # The historical data of every symbol is fetched concurrently, limited
+    # by the request weight, and each trader is started as soon as its data
+    # is ready.
+    readySecs = WarmupScheduler(
+        lambda tradeSymbol: fetch_history(
+            signalDispatcher,
+            config,
+            tradeSymbol,
+            seeds[tradeSymbol]
+        ),
+        WeightBudget(defaults['request_weight_limit']),
+        defaults['warmup_workers']
+    ).run(tradeSyms, start_trader)
+
+    print(f'{len(readySecs)} of {len(tradeSyms)} set up in '
+          f'{max(readySecs.values(), default=0):.1f}s.')
 
     for process in processes:
         process.join()
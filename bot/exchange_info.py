@@ -0,0 +1,164 @@
+"""Caches the trading rules of each symbol so that they are not requested
+for every order.
+"""
+
+from typing import Callable, Dict, Optional
+import os
+import json
+import time
+import traceback
+from collections import namedtuple
+
+
+SymbolFilters = namedtuple(
+    'SymbolFilters',
+    ['stepSize', 'minQty', 'quotePrecision', 'baseAssetPrecision',
+     'minNotional']
+)
+
+DEFAULT_PATH = os.path.abspath(
+    os.path.join(__file__, os.pardir, 'cache', 'exchange_info.json')
+)
+
+# Number of seconds to wait before retrying a failed refresh.
+RETRY_SECS = 60
+
+
+def parse_exchange_info(exchangeInfo: dict) -> Dict[str, SymbolFilters]:
+    """Extracts the filters used when placing orders for each symbol.
+
+    Args:
+        exchangeInfo - (dict) Response from `Client.get_exchange_info`.
+
+    Returns:
+        dict - Filters of each symbol.
+    """
+    table = {}
+    for symbolInfo in exchangeInfo['symbols']:
+        stepSize = minQty = minNotional = 0.0
+
+        for filt in symbolInfo['filters']:
+            if filt['filterType'] == 'LOT_SIZE':
+                stepSize = float(filt['stepSize'])
+                minQty = float(filt['minQty'])
+            # Newer symbols use the `NOTIONAL` filter.
+            elif filt['filterType'] in ('MIN_NOTIONAL', 'NOTIONAL'):
+                minNotional = float(filt['minNotional'])
+
+        table[symbolInfo['symbol']] = SymbolFilters(
+            stepSize,
+            minQty,
+            symbolInfo['quotePrecision'],
+            symbolInfo['baseAssetPrecision'],
+            minNotional
+        )
+
+    return table
+
+
+class ExchangeInfo:
+    """Table of the filters of each symbol, loaded from a single exchange
+    information request.
+
+    The table is stored on disk so that it is shared between the trader
+    processes. The request is only made whilst warming up, by `load`, and by
+    the process running `run_refresher`, never when placing an order. Once
+    the table is older than the TTL, `symbol` reads the shared file again,
+    keeping the table it has until the file has been refreshed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict],
+        ttl: float,
+        path: str = DEFAULT_PATH
+    ) -> None:
+        """Sets up the cache, nothing is loaded until `load` is called.
+
+        Args:
+            fetch - (Callable) Returns the exchange information, as
+                `Client.get_exchange_info`.
+            ttl - (float) Number of seconds before the table is refreshed.
+            path - (str) Location of the file shared between processes.
+        """
+        self._fetch = fetch
+        self._ttl = ttl
+        self._path = path
+        self._table: Dict[str, SymbolFilters] = {}
+        self._loadedAt: Optional[float] = None
+
+    def _expired(self, loadedAt: Optional[float]) -> bool:
+        return loadedAt is None or time.time() - loadedAt >= self._ttl
+
+    def refresh(self) -> None:
+        """Requests the exchange information and replaces the shared file."""
+        self._table = parse_exchange_info(self._fetch())
+        self._loadedAt = time.time()
+
+        # The file is written under a temporary name and then renamed so
+        # that other processes never read a partially written file.
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmpPath = f'{self._path}.{os.getpid()}.tmp'
+        with open(tmpPath, 'w') as f:
+            json.dump(
+                {'loaded_at': self._loadedAt, 'symbols': self._table},
+                f
+            )
+        os.replace(tmpPath, self._path)
+
+    def _read(self) -> bool:
+        """Loads the table from the shared file when it is newer than the
+        table held.
+
+        Returns:
+            bool - Was a table loaded that has not expired?
+        """
+        try:
+            with open(self._path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if self._loadedAt is None or cached['loaded_at'] > self._loadedAt:
+            self._table = {
+                symbol: SymbolFilters(*filters)
+                for symbol, filters in cached['symbols'].items()
+            }
+            self._loadedAt = cached['loaded_at']
+
+        return not self._expired(self._loadedAt)
+
+    def load(self) -> None:
+        """Loads the table, from the shared file unless it is missing or has
+        expired, in which case it is requested. Called whilst warming up.
+        """
+        if self._expired(self._loadedAt) and not self._read():
+            self.refresh()
+
+    def run_refresher(self) -> None:
+        """Refreshes the table, and the shared file, whenever it expires.
+        Runs forever, so should be run on its own thread of one process.
+        """
+        while True:
+            if self._loadedAt is not None:
+                time.sleep(max(self._loadedAt + self._ttl - time.time(), 0))
+            try:
+                self.refresh()
+            except Exception:
+                print(f'\033[91m{traceback.format_exc()}\033[0m')
+                time.sleep(RETRY_SECS)
+
+    def symbol(self, tradeSymbol: str) -> SymbolFilters:
+        """Fetches the filters of a symbol. No request is made, the table
+        must have been loaded with `load`.
+
+        Args:
+            tradeSymbol - (str) Trade symbol.
+
+        Returns:
+            SymbolFilters - Filters of the symbol.
+        """
+        if self._expired(self._loadedAt):
+            self._read()
+
+        return self._table[tradeSymbol]
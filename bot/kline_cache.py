@@ -0,0 +1,182 @@
+"""Keeps the closed candles of each symbol on disk so that a restart only
+needs to fetch the candles missed whilst the bot was down.
+"""
+
+from typing import Callable, Union
+import os
+import time
+import numpy as np
+from binance.helpers import interval_to_milliseconds
+from send_order_signal import HistoricalData
+
+DEFAULT_DIR = os.path.abspath(
+    os.path.join(__file__, os.pardir, 'cache', 'klines')
+)
+
+# Order of the fields of each candle in the cache file.
+FIELDS = ('open', 'high', 'low', 'close', 'volume', 'open_time')
+
+
+class KlineCache:
+    """Append-only file of the closed candles of a symbol.
+
+    Each candle is stored as a row of float64 values laid out as `FIELDS`,
+    so the file can be read back into an array in a single call.
+    """
+
+    def __init__(
+        self,
+        tradeSymbol: str,
+        interval: str,
+        lookback: int,
+        directory: str = DEFAULT_DIR
+    ) -> None:
+        """Sets up the cache of a symbol.
+
+        Args:
+            tradeSymbol - (str) Trade symbol.
+            interval - (str) Kline interval, i.e: `1m`.
+            lookback - (int) Number of candles to load.
+            directory - (str) Directory the cache files are stored in.
+        """
+        self.lookback = lookback
+        self._intervalMs = interval_to_milliseconds(interval)
+        self._path = os.path.join(directory, f'{tradeSymbol}_{interval}.bin')
+        os.makedirs(directory, exist_ok=True)
+
+    def _read(self) -> np.array:
+        """Reads every candle in the cache."""
+        if not os.path.isfile(self._path):
+            return np.empty((0, len(FIELDS)))
+
+        candles = np.fromfile(self._path)
+        # Drop a partially written candle, i.e: if the bot was killed whilst
+        # writing.
+        return candles[:len(candles) // len(FIELDS) * len(FIELDS)].reshape(
+            -1, len(FIELDS)
+        )
+
+    def _replace(self, candles: np.array) -> None:
+        """Replaces the cache with rows of candles. The rows are written to a
+        temporary file first so that the cache is never partially written.
+        """
+        tmpPath = f'{self._path}.{os.getpid()}.tmp'
+        np.ascontiguousarray(candles, dtype=float).tofile(tmpPath)
+        os.replace(tmpPath, self._path)
+
+    def _write(self, candles: np.array) -> None:
+        """Appends rows of candles to the cache."""
+        with open(self._path, 'ab') as f:
+            f.write(np.ascontiguousarray(candles, dtype=float).tobytes())
+
+    def append(
+        self,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        openTime: float
+    ) -> None:
+        """Adds a closed candle to the cache.
+
+        Args:
+            open - (float) Open price.
+            high - (float) High price.
+            low - (float) Low price.
+            close - (float) Close price.
+            volume - (float) Volume.
+            openTime - (float) Open time in milliseconds.
+        """
+        self._write(np.array([open, high, low, close, volume, openTime]))
+
+    def load(self) -> HistoricalData:
+        """Loads the latest `lookback` candles in the cache. Candles older
+        than the lookback are removed from the file.
+
+        Returns:
+            HistoricalData - Cached candles.
+        """
+        candles = self._read()
+
+        # Compact the file once it holds a lot more than is needed.
+        if len(candles) > self.lookback * 2:
+            candles = candles[-self.lookback:]
+            self._replace(candles)
+
+        candles = candles[-self.lookback:]
+        return HistoricalData(
+            candles[:, 3],
+            candles[:, 2],
+            candles[:, 1],
+            candles[:, 0],
+            candles[:, 4],
+            candles[:, 5]
+        )
+
+    def gap_start(self, cached: HistoricalData) -> int:
+        """Works out the open time of the first candle missing from the
+        cache, going back no further than the lookback.
+
+        Args:
+            cached - (HistoricalData) Candles loaded from the cache.
+
+        Returns:
+            int - Timestamp in milliseconds.
+        """
+        lookbackStart = (int(time.time() * 1000)
+                         - self.lookback * self._intervalMs)
+
+        if not len(cached.openTimes):
+            return lookbackStart
+
+        return max(int(cached.openTimes[-1]) + self._intervalMs,
+                   lookbackStart)
+
+    def sync(
+        self,
+        fetch: Callable[[Union[str, int]], HistoricalData]
+    ) -> HistoricalData:
+        """Fetches the candles missing from the cache, adds them to the cache
+        and returns the latest `lookback` candles.
+
+        Args:
+            fetch - (Callable) Fetches the closed candles from a timestamp in
+                milliseconds, i.e: `SendOrderSignal.historical_data`.
+
+        Returns:
+            HistoricalData - Latest candles.
+        """
+        cached = self.load()
+        fetched = fetch(self.gap_start(cached))
+
+        # Skip anything already cached, i.e: if the candle closed whilst the
+        # request was being made.
+        if len(cached.openTimes):
+            newer = fetched.openTimes > cached.openTimes[-1]
+            fetched = HistoricalData(*(field[newer] for field in fetched))
+
+        rows = np.column_stack((
+            fetched.opens,
+            fetched.highs,
+            fetched.lows,
+            fetched.closes,
+            fetched.volumes,
+            fetched.openTimes
+        ))
+
+        # When the bot has been down for longer than the lookback, the
+        # cached candles are no longer contiguous with the new ones and are
+        # replaced.
+        if (len(cached.openTimes) and len(fetched.openTimes)
+                and fetched.openTimes[0] - cached.openTimes[-1]
+                > self._intervalMs):
+            cached = HistoricalData(*(field[:0] for field in cached))
+            self._replace(rows)
+        elif len(rows):
+            self._write(rows)
+
+        return HistoricalData(*(
+            np.concatenate((old, new))[-self.lookback:]
+            for old, new in zip(cached, fetched)
+        ))
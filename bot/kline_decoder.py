@@ -0,0 +1,83 @@
+"""Decodes kline messages received from the Binance websocket."""
+
+from typing import Optional, Tuple, Union
+from collections import namedtuple
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+
+Candle = namedtuple(
+    'Candle',
+    ['open', 'high', 'low', 'close', 'volume', 'openTime']
+)
+
+# Most kline messages are updates to a candle that has not closed yet. These
+# can be discarded by searching the raw message for the flag rather than
+# parsing it.
+_OPEN_CANDLE = '"x":false'
+
+
+def decode_closed_kline(message: Union[str, bytes]) -> Optional[Candle]:
+    """Decodes a kline message, only if it is for a closed candle.
+
+    Message response information can be found by visting:
+    https://github.com/binance/binance-spot-api-docs/blob/master/web-socket-streams.md
+
+    Args:
+        message - (str|bytes) Raw message from the websocket.
+
+    Returns:
+        Candle - The closed candle, `None` if the candle has not closed.
+    """
+    if isinstance(message, bytes):
+        message = message.decode()
+
+    if _OPEN_CANDLE in message:
+        return None
+
+    return _closed_candle(json.loads(message)['k'])
+
+
+def decode_closed_stream_kline(
+    message: Union[str, bytes]
+) -> Optional[Tuple[str, Candle]]:
+    """Decodes a kline message received from a combined stream, only if it is
+    for a closed candle. Combined stream messages wrap the kline message as
+    `{"stream": "<symbol>@kline_<interval>", "data": {...}}`.
+
+    Args:
+        message - (str|bytes) Raw message from the websocket.
+
+    Returns:
+        tuple - The stream name and the closed candle, `None` if the candle
+            has not closed.
+    """
+    if isinstance(message, bytes):
+        message = message.decode()
+
+    if _OPEN_CANDLE in message:
+        return None
+
+    msg = json.loads(message)
+    candle = _closed_candle(msg['data']['k'])
+    if candle is None:
+        return None
+
+    return msg['stream'], candle
+
+
+def _closed_candle(candle: dict) -> Optional[Candle]:
+    """Extracts the fields of a kline if the candle has closed."""
+    if not candle['x']:
+        return None
+
+    return Candle(
+        float(candle['o']),
+        float(candle['h']),
+        float(candle['l']),
+        float(candle['c']),
+        float(candle['v']),
+        candle['t']
+    )
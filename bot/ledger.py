@@ -0,0 +1,104 @@
+"""Keeps track of the asset balances without calling the API."""
+
+from typing import Dict, Iterable
+import threading
+import time
+from binance.enums import SIDE_BUY
+
+
+class Ledger:
+    """In-memory record of the free balance of each asset.
+
+    The ledger is loaded from an account snapshot and then updated from the
+    responses of the orders placed. As other processes may trade with the
+    same assets, the ledger should be reloaded once it is `stale`.
+    """
+
+    def __init__(self, reconcileSecs: float) -> None:
+        """Sets up an empty ledger.
+
+        Args:
+            reconcileSecs - (float) Number of seconds after which the ledger
+                should be reloaded from a new snapshot.
+        """
+        self._reconcileSecs = reconcileSecs
+        self._balances: Dict[str, float] = {}
+        self._loadedAt = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Has a snapshot been loaded?"""
+        return self._loadedAt is not None
+
+    @property
+    def stale(self) -> bool:
+        """Should the ledger be reloaded from a new snapshot?"""
+        return (not self.loaded
+                or time.monotonic() - self._loadedAt >= self._reconcileSecs)
+
+    def invalidate(self) -> None:
+        """Marks the ledger as stale, i.e: when an order was rejected because
+        the balances no longer match the account.
+        """
+        with self._lock:
+            self._loadedAt = None
+
+    def load(self, balances: Iterable[dict]) -> None:
+        """Replaces the balances with an account snapshot.
+
+        Args:
+            balances - (dict[]) Balances as returned in the `balances` key of
+                `Client.get_account`.
+        """
+        with self._lock:
+            self._balances = {
+                balance['asset']: float(balance['free'])
+                for balance in balances
+            }
+            self._loadedAt = time.monotonic()
+
+    def balance(self, asset: str) -> float:
+        """Fetches the free balance of an asset.
+
+        Args:
+            asset - (str) Asset name.
+
+        Returns:
+            float - Asset balance.
+        """
+        with self._lock:
+            return self._balances.get(asset, 0.0)
+
+    def apply_order(
+        self,
+        side: str,
+        baseAsset: str,
+        quoteAsset: str,
+        order: dict
+    ) -> None:
+        """Updates the balances from an order response.
+
+        Args:
+            side - (str) Buy or sell command.
+            baseAsset - (str) Asset bought or sold.
+            quoteAsset - (str) Asset paid or received.
+            order - (dict) Response from `Client.create_order`. Test orders
+                return an empty response and leave the balances unchanged.
+        """
+        executedQty = float(order.get('executedQty', 0))
+        quoteQty = float(order.get('cummulativeQuoteQty', 0))
+
+        if side != SIDE_BUY:
+            executedQty = -executedQty
+            quoteQty = -quoteQty
+
+        with self._lock:
+            balances = self._balances
+            balances[baseAsset] = balances.get(baseAsset, 0.0) + executedQty
+            balances[quoteAsset] = balances.get(quoteAsset, 0.0) - quoteQty
+
+            for fill in order.get('fills', []):
+                asset = fill['commissionAsset']
+                balances[asset] = (balances.get(asset, 0.0)
+                                   - float(fill['commission']))
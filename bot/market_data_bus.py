@@ -0,0 +1,288 @@
+"""Shares the closed candles received by one ingestion process with the
+worker processes running the traders.
+"""
+
+from typing import Dict, List, Optional
+import os
+import traceback
+from itertools import zip_longest
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+import numpy as np
+from binance.helpers import interval_to_milliseconds
+from batch_trader import BatchTrader
+from kline_decoder import Candle
+from trader import Trader
+
+# Number of candles kept for each symbol. Workers only need the candles
+# they have not processed yet, so this only has to cover how far a worker
+# can fall behind.
+BUS_CAPACITY = 64
+
+_NO_FIELDS = len(Candle._fields)
+
+
+class MarketDataBus:
+    """Ring buffer of the latest closed candles of each symbol in shared
+    memory.
+
+    The block starts with a sequence counter for each symbol, the number of
+    candles written for the symbol, followed by the candles themselves. A
+    candle is written before its counter is increased, so a reader never
+    sees the counter of a candle that has not been written. Readers read the
+    block through NumPy views without copying or unpickling.
+
+    Only one process should write to the bus.
+    """
+
+    def __init__(
+        self,
+        tradeSymbols: List[str],
+        capacity: int = BUS_CAPACITY,
+        name: Optional[str] = None
+    ) -> None:
+        """Creates the shared memory block, or attaches to an existing one.
+
+        Args:
+            tradeSymbols - (str[]) Trade symbols, in the same order for
+                every process.
+            capacity - (int) Number of candles kept for each symbol.
+            name - (str) Name of the block to attach to. A new block is
+                created if a name is not provided.
+        """
+        self.tradeSymbols = list(tradeSymbols)
+        self.capacity = capacity
+        self._indices = {tradeSymbol: idx
+                         for idx, tradeSymbol in enumerate(self.tradeSymbols)}
+
+        noSymbols = len(self.tradeSymbols)
+        seqsSize = noSymbols * np.dtype(np.int64).itemsize
+        size = (seqsSize
+                + noSymbols * _NO_FIELDS * capacity
+                * np.dtype(np.float64).itemsize)
+
+        self._owner = name is None
+        self._shm = (shared_memory.SharedMemory(create=True, size=size)
+                     if name is None
+                     else shared_memory.SharedMemory(name=name))
+
+        self._seqs = np.ndarray((noSymbols,), np.int64, self._shm.buf)
+        self._data = np.ndarray(
+            (noSymbols, capacity, _NO_FIELDS),
+            np.float64,
+            self._shm.buf,
+            seqsSize
+        )
+        if self._owner:
+            self._seqs[:] = 0
+
+    def __reduce__(self):
+        # Processes started with spawn attach to the block by name.
+        return (MarketDataBus,
+                (self.tradeSymbols, self.capacity, self._shm.name))
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    def index(self, tradeSymbol: str) -> int:
+        """Position of a symbol on the bus."""
+        return self._indices[tradeSymbol]
+
+    def seq(self, idx: int) -> int:
+        """Number of candles written for the symbol at `idx`."""
+        return int(self._seqs[idx])
+
+    def publish(self, idx: int, candle: Candle) -> None:
+        """Writes the latest closed candle of the symbol at `idx`.
+
+        Args:
+            idx - (int) Position of the symbol.
+            candle - (Candle) Closed candle.
+        """
+        seq = self._seqs[idx]
+        self._data[idx, seq % self.capacity] = candle
+        self._seqs[idx] = seq + 1
+
+    def read(self, idx: int, seq: int) -> Optional[Candle]:
+        """Reads a candle of the symbol at `idx`.
+
+        Args:
+            idx - (int) Position of the symbol.
+            seq - (int) Sequence number of the candle, starting at 0.
+
+        Returns:
+            Candle - The candle, `None` if it has been, or is being,
+                overwritten.
+        """
+        candle = Candle(*self._data[idx, seq % self.capacity].tolist())
+
+        # The slot may have been reused whilst it was being read. The slot of
+        # the candle `capacity` candles before the latest one is the next to
+        # be written, so it may have been partially overwritten.
+        if self._seqs[idx] - seq >= self.capacity:
+            return None
+        return candle
+
+    def close(self) -> None:
+        """Detaches from the block, removing it if this bus created it."""
+        self._seqs = self._data = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class BusPublisher:
+    """Takes the place of a trader in a `CombinedStream`, writing each closed
+    candle of its symbol to the bus and waking the worker running the
+    symbol's trader.
+    """
+
+    def __init__(
+        self,
+        bus: MarketDataBus,
+        tradeSymbol: str,
+        notify: Connection
+    ) -> None:
+        """Sets up the publisher.
+
+        Args:
+            bus - (MarketDataBus) Bus to write to.
+            tradeSymbol - (str) Trade symbol.
+            notify - (Connection) Write end of the pipe of the worker
+                running the symbol's trader.
+        """
+        self.tradeSymbol = tradeSymbol
+        self._bus = bus
+        self._idx = bus.index(tradeSymbol)
+        self._notifyFd = notify.fileno()
+
+        # A worker that is busy may not drain its pipe. It will still see
+        # every candle through the counters, so the ingestion process never
+        # waits on it.
+        os.set_blocking(self._notifyFd, False)
+
+    def on_open(self, ws) -> None:
+        pass
+
+    def on_candle(self, candle: Candle) -> None:
+        """Publishes a closed candle.
+
+        Args:
+            candle - (Candle) Closed candle.
+        """
+        self._bus.publish(self._idx, candle)
+        try:
+            os.write(self._notifyFd, b'\0')
+        except BlockingIOError:
+            pass
+
+    def log_error(self, msg: str) -> None:
+        print(f'\033[91m{self.tradeSymbol}: {msg}\033[0m')
+
+    def close(self) -> None:
+        pass
+
+
+class BusSubscriber:
+    """Runs a collection of traders on the candles read from the bus."""
+
+    def __init__(
+        self,
+        config: dict,
+        bus: MarketDataBus,
+        traders: Dict[str, Trader],
+        notify: Connection
+    ) -> None:
+        """Sets up the subscriber.
+
+        Args:
+            config - (dict) Config dict.
+            bus - (MarketDataBus) Bus to read from.
+            traders - (dict) Trader of each trade symbol.
+            notify - (Connection) Read end of the pipe the publishers of the
+                traders' symbols write to.
+        """
+        self._bus = bus
+        self._traders = {bus.index(tradeSymbol): trader
+                         for tradeSymbol, trader in traders.items()}
+        self._notify = notify
+        self._intervalMs = interval_to_milliseconds(
+            config['defaults']['interval']
+        )
+
+        # Candles still on the bus are offered again, those the traders
+        # already have are skipped.
+        self._seqs = {idx: max(bus.seq(idx) - bus.capacity, 0)
+                      for idx in self._traders}
+        self._batch = BatchTrader(config)
+
+    def accept(self, trader: Trader, candle: Candle) -> bool:
+        """Checks whether a closed candle is new to its trader, loading any
+        candles missed before it.
+
+        Args:
+            trader - (Trader) Trader of the candle's symbol.
+            candle - (Candle) Closed candle.
+
+        Returns:
+            bool - Should the trader trade on the candle?
+        """
+        candles = trader.candles
+        if len(candles):
+            lastOpenTime = candles.openTimes[-1]
+            if candle.openTime <= lastOpenTime:
+                return False
+
+            # Candles were missed whilst the ingestion process was
+            # disconnected or this worker fell behind.
+            if candle.openTime - lastOpenTime > self._intervalMs:
+                trader.catch_up()
+                if candle.openTime <= candles.openTimes[-1]:
+                    return False
+
+        return True
+
+    def poll(self) -> None:
+        """Processes the candles written since the last poll. The candles
+        of every symbol are traded together, in rounds of at most one candle
+        per symbol.
+        """
+        bus = self._bus
+        pending = []
+        for idx, trader in self._traders.items():
+            seq = bus.seq(idx)
+            nextSeq = max(self._seqs[idx], seq - bus.capacity)
+
+            candles = [bus.read(idx, candleSeq)
+                       for candleSeq in range(nextSeq, seq)]
+            pending.append((trader, [candle for candle in candles
+                                     if candle is not None]))
+            self._seqs[idx] = seq
+
+        for candleRound in zip_longest(*(candles for _, candles in pending)):
+            accepted = []
+            for (trader, _), candle in zip(pending, candleRound):
+                if candle is None:
+                    continue
+                try:
+                    if self.accept(trader, candle):
+                        accepted.append((trader, candle))
+                except Exception:
+                    trader.log_error(traceback.format_exc())
+
+            self._batch.on_candles(accepted)
+
+    def run(self) -> None:
+        """Processes candles as they are published, until interrupted."""
+        notifyFd = self._notify.fileno()
+        try:
+            while True:
+                self.poll()
+                wait([self._notify])
+                os.read(notifyFd, 4096)
+
+        except KeyboardInterrupt:
+            for trader in self._traders.values():
+                trader.close()
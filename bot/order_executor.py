@@ -0,0 +1,170 @@
+"""Runs orders away from the market data path so that candles keep being
+processed whilst orders are in flight.
+"""
+
+from typing import Callable, Optional
+import asyncio
+import queue
+import threading
+import traceback
+from collections import namedtuple
+
+
+OrderIntent = namedtuple('OrderIntent', ['side', 'close', 'reason'])
+
+
+def _failed_result(intent: OrderIntent) -> dict:
+    """Reports an error raised whilst placing an order in the same format as
+    a failed `send_signal`.
+    """
+    return {
+        'success': False,
+        'params': intent._asdict(),
+        'error': traceback.format_exc()
+    }
+
+
+class OrderExecutor:
+    """Takes order intents from a trader and runs them, one at a time, on a
+    worker thread. Once an order has been run, the result is reported back
+    through a callback on the worker thread.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[OrderIntent], dict],
+        onResult: Callable[[OrderIntent, dict], None],
+        name: Optional[str] = None
+    ) -> None:
+        """Sets up the executor.
+
+        Args:
+            execute - (Callable) Places the order for an intent and returns
+                the result, as returned by `SendOrderSignal.send_signal`.
+            onResult - (Callable) Called with the intent and its result once
+                the order has been run.
+            name - (str) Name of the worker thread.
+        """
+        self._execute = execute
+        self._onResult = onResult
+        self._name = name
+        self._intents = queue.Queue()
+        self._worker = None
+
+    @property
+    def running(self) -> bool:
+        """Is the worker thread running?"""
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        """Starts the worker thread if it is not already running."""
+        if self.running:
+            return
+
+        self._worker = threading.Thread(
+            target=self._run,
+            name=self._name,
+            daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops the worker thread once the queued intents have been run.
+
+        Args:
+            timeout - (float) Number of seconds to wait for the worker.
+        """
+        if not self.running:
+            return
+
+        self._intents.put(None)
+        self._worker.join(timeout)
+
+    def submit(self, intent: OrderIntent) -> None:
+        """Queues an order intent to be run.
+
+        Args:
+            intent - (OrderIntent) Order to place.
+        """
+        self.start()
+        self._intents.put(intent)
+
+    def _run(self) -> None:
+        """Runs the queued intents until stopped."""
+        while True:
+            intent = self._intents.get()
+            if intent is None:
+                return
+
+            try:
+                result = self._execute(intent)
+            except Exception:
+                result = _failed_result(intent)
+
+            try:
+                self._onResult(intent, result)
+            except Exception:
+                print(f'\033[91m{traceback.format_exc()}\033[0m')
+
+
+class AsyncOrderExecutor:
+    """Runs order intents on the default executor of an event loop, for
+    traders run by the asyncio runtime. The result is reported back through
+    a callback on the event loop.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[OrderIntent], dict],
+        onResult: Callable[[OrderIntent, dict], None],
+        loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Sets up the executor.
+
+        Args:
+            execute - (Callable) Places the order for an intent and returns
+                the result, as returned by `SendOrderSignal.send_signal`.
+            onResult - (Callable) Called with the intent and its result once
+                the order has been run.
+            loop - (asyncio.AbstractEventLoop) Event loop to run on.
+        """
+        self._execute = execute
+        self._onResult = onResult
+        self._loop = loop
+        self._pending = set()
+
+    @property
+    def running(self) -> bool:
+        """Is an order in flight?"""
+        return bool(self._pending)
+
+    def submit(self, intent: OrderIntent) -> None:
+        """Schedules an order intent to be run.
+
+        Args:
+            intent - (OrderIntent) Order to place.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._run(intent),
+                                                  self._loop)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancels any orders that have not been sent yet."""
+        for future in list(self._pending):
+            future.cancel()
+
+    async def _run(self, intent: OrderIntent) -> None:
+        try:
+            result = await self._loop.run_in_executor(
+                None,
+                self._execute,
+                intent
+            )
+        except Exception:
+            result = _failed_result(intent)
+
+        try:
+            self._onResult(intent, result)
+        except Exception:
+            print(f'\033[91m{traceback.format_exc()}\033[0m')
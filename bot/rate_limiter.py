@@ -0,0 +1,212 @@
+"""Keeps the REST requests sent by every process within the Binance request
+weight and order rate limits.
+"""
+
+from typing import Optional
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from binance.client import Client
+
+# Weight of each endpoint. Endpoints that are not listed weigh 1.
+ENDPOINT_WEIGHTS = {
+    '/api/v3/klines': 2,
+    '/api/v3/exchangeInfo': 20,
+    '/api/v3/account': 20,
+}
+
+# Endpoints that count towards the order rate limits when posted to.
+ORDER_ENDPOINTS = {'/api/v3/order'}
+
+# Endpoints that can use the request weight kept for orders when posted to.
+RESERVED_ENDPOINTS = ORDER_ENDPOINTS | {'/api/v3/order/test'}
+
+# Request weight of each window kept for orders. Other requests are delayed
+# once they would leave less than this, so an order is never held up
+# behind warming up or balance checks.
+ORDER_RESERVE_WEIGHT = 60
+
+# Header reporting the usage of each limit, the length of its window in
+# seconds and the limit itself.
+WEIGHT_LIMIT = ('X-MBX-USED-WEIGHT-1M', 60, 1200)
+ORDER_LIMITS = (
+    ('X-MBX-ORDER-COUNT-10S', 10, 50),
+    ('X-MBX-ORDER-COUNT-1D', 86400, 160000),
+)
+
+# Window and usage of each limit, followed by the time any ban ends.
+_STATE = struct.Struct('<6qd')
+
+
+class RateLimiter:
+    """Counts the request weight and orders used in the current window of
+    each limit, delaying any request that would exceed a limit until its
+    window resets.
+
+    The counts are kept in a memory mapped file shared by every process, so
+    the limits hold for the bot as a whole. The counts are corrected from the
+    usage Binance reports in the headers of each response. If Binance still
+    asks for requests to stop, no request is sent by any process until the
+    time it asks for has passed.
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.abspath(os.path.join(
+            __file__,
+            os.pardir,
+            'cache',
+            'rate_limit.bin'
+        ))
+    ) -> None:
+        """Opens the shared counts, creating them if they do not exist.
+
+        Args:
+            path - (str) Location of the shared counts.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+        with self._locked():
+            if os.fstat(self._fd).st_size < _STATE.size:
+                os.ftruncate(self._fd, _STATE.size)
+        self._state = mmap.mmap(self._fd, _STATE.size)
+
+    @contextmanager
+    def _locked(self):
+        # The file lock is held by the process, so threads also need to be
+        # locked out from each other.
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _costs(path: str, method: str) -> tuple:
+        """Returns the weight and number of orders used by a request."""
+        orders = int(method.upper() == 'POST' and path in ORDER_ENDPOINTS)
+        return (ENDPOINT_WEIGHTS.get(path, 1),) + (orders,) * len(ORDER_LIMITS)
+
+    @staticmethod
+    def _limits(path: str, method: str) -> tuple:
+        """Returns the limits a request is held to, keeping part of the
+        request weight for orders.
+        """
+        weightLimit = WEIGHT_LIMIT[2]
+        if not (method.upper() == 'POST' and path in RESERVED_ENDPOINTS):
+            weightLimit -= ORDER_RESERVE_WEIGHT
+        return (weightLimit,) + tuple(limit for _, _, limit in ORDER_LIMITS)
+
+    def acquire(self, path: str, method: str = 'get') -> None:
+        """Blocks until a request can be sent without exceeding any limit,
+        then counts it. Requests other than orders are not allowed to use
+        the weight kept for orders.
+
+        Args:
+            path - (str) Path of the endpoint, i.e: /api/v3/klines.
+            method - (str) HTTP method.
+        """
+        costs = self._costs(path, method)
+        limits = self._limits(path, method)
+
+        while True:
+            with self._locked():
+                now = time.time()
+                state = list(_STATE.unpack_from(self._state))
+                waitSecs = state[-1] - now
+
+                for idx, (_, windowSecs, _) in enumerate(
+                    (WEIGHT_LIMIT,) + ORDER_LIMITS
+                ):
+                    window = int(now // windowSecs)
+                    if state[2 * idx] != window:
+                        state[2 * idx] = window
+                        state[2 * idx + 1] = 0
+
+                    used = state[2 * idx + 1]
+                    if (costs[idx] and used
+                            and used + costs[idx] > limits[idx]):
+                        waitSecs = max(waitSecs,
+                                       (window + 1) * windowSecs - now)
+                    state[2 * idx + 1] += costs[idx]
+
+                if waitSecs <= 0:
+                    _STATE.pack_into(self._state, 0, *state)
+                    return
+
+            print(f'\033[94mREQUEST LIMIT REACHED. SLEEPING FOR '
+                  f'{waitSecs:.1f} SECONDS.\033[0m')
+            time.sleep(waitSecs)
+
+    def update(self, headers: dict) -> None:
+        """Corrects the counts from the usage reported in the headers of a
+        response.
+
+        Args:
+            headers - (dict) Response headers.
+        """
+        with self._locked():
+            now = time.time()
+            state = list(_STATE.unpack_from(self._state))
+
+            for idx, (header, windowSecs, _) in enumerate(
+                (WEIGHT_LIMIT,) + ORDER_LIMITS
+            ):
+                used = headers.get(header)
+                if used is None:
+                    continue
+
+                window = int(now // windowSecs)
+                if state[2 * idx] != window:
+                    state[2 * idx] = window
+                    state[2 * idx + 1] = int(used)
+                else:
+                    # Requests counted after this one was sent are not
+                    # included in the header.
+                    state[2 * idx + 1] = max(state[2 * idx + 1], int(used))
+
+            # Sent with 429 and 418 responses, once a limit has been broken.
+            retryAfter = headers.get('Retry-After')
+            if retryAfter:
+                state[-1] = max(state[-1], now + int(retryAfter))
+
+            _STATE.pack_into(self._state, 0, *state)
+
+
+class RateLimitedClient(Client):
+    """Binance client that sends every request through a `RateLimiter`."""
+
+    def __init__(
+        self,
+        *args,
+        rateLimiter: Optional[RateLimiter] = None,
+        **kwargs
+    ) -> None:
+        """Connects to Binance.
+
+        Args:
+            rateLimiter - (RateLimiter) Limiter to use, a limiter sharing the
+                default counts is created if one is not provided.
+            The remaining arguments are passed to `Client`.
+        """
+        # The client sends a request whilst it is being set up.
+        self.rateLimiter = rateLimiter or RateLimiter()
+        super().__init__(*args, **kwargs)
+
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        self.rateLimiter.acquire(urlsplit(uri).path, method)
+        self.response = None
+        try:
+            return super()._request(method, uri, signed, force_params,
+                                    **kwargs)
+        finally:
+            if self.response is not None:
+                self.rateLimiter.update(self.response.headers)
@@ -0,0 +1,285 @@
+"""Sends the REST requests of every process through a single gateway process
+so that orders are never held up behind other requests.
+"""
+
+from typing import Any, Dict, List, Optional
+import heapq
+import itertools
+import os
+import pickle
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError, current_process
+from multiprocessing.connection import Client, Connection, Listener
+
+PRIORITY_ORDER = 0
+PRIORITY_BALANCE = 1
+PRIORITY_HISTORY = 2
+
+# Client methods that can be called through the gateway and their priority,
+# lowest first.
+METHOD_PRIORITIES = {
+    'create_order': PRIORITY_ORDER,
+    'create_test_order': PRIORITY_ORDER,
+    'get_account': PRIORITY_BALANCE,
+    'get_asset_balance': PRIORITY_BALANCE,
+    'get_exchange_info': PRIORITY_BALANCE,
+    'get_historical_klines': PRIORITY_HISTORY,
+}
+
+GATEWAY_ADDRESS = os.path.abspath(os.path.join(
+    __file__,
+    os.pardir,
+    'cache',
+    'gateway.sock'
+))
+
+
+class GatewayError(Exception):
+    """Raised when a call could not be run through the gateway."""
+    pass
+
+
+def _portable_error(err: Exception) -> Exception:
+    """Returns the error if it can be sent to another process, otherwise a
+    `GatewayError` describing it.
+    """
+    try:
+        pickle.loads(pickle.dumps(err))
+        return err
+    except Exception:
+        return GatewayError(''.join(traceback.format_exception(
+            type(err),
+            err,
+            err.__traceback__
+        )))
+
+
+class RestGateway:
+    """Runs the client calls sent by every process on a small pool of
+    clients, each keeping its own connections to Binance alive.
+
+    Calls are queued by priority, so orders are run before balance checks
+    and both before historical data. The first client is kept for orders so
+    that neither a long backfill nor a balance check waiting on the rate
+    limiter ever holds up an order. Results are sent back as soon as each
+    call finishes, in any order.
+    """
+
+    def __init__(self, clients: List[Any], address: str = GATEWAY_ADDRESS):
+        """Sets up the gateway.
+
+        Args:
+            clients - (binance.client.Client[]) Clients to run calls on.
+            address - (str) Path of the socket to listen on.
+        """
+        self._clients = clients
+        self._address = address
+        self._queue = []
+        self._queued = threading.Condition()
+        self._seq = itertools.count()
+
+    def _put(self, priority: int, call: tuple) -> None:
+        with self._queued:
+            heapq.heappush(self._queue, (priority, next(self._seq), call))
+            self._queued.notify_all()
+
+    def _take(self, maxPriority: int) -> tuple:
+        """Waits for the next call with a priority up to `maxPriority`."""
+        with self._queued:
+            while not self._queue or self._queue[0][0] > maxPriority:
+                self._queued.wait()
+            return heapq.heappop(self._queue)[2]
+
+    @staticmethod
+    def _reply(
+        conn: Connection,
+        sendLock: threading.Lock,
+        reply: tuple
+    ) -> None:
+        try:
+            with sendLock:
+                conn.send(reply)
+        except (EOFError, OSError):
+            # The caller has gone.
+            pass
+
+    def _work(self, client: Any, maxPriority: int) -> None:
+        """Runs queued calls on a client."""
+        while True:
+            conn, sendLock, callId, method, args, kwargs = self._take(
+                maxPriority
+            )
+            try:
+                reply = (callId, True, getattr(client, method)(*args,
+                                                               **kwargs))
+            except Exception as err:
+                reply = (callId, False, _portable_error(err))
+            self._reply(conn, sendLock, reply)
+
+    def _serve(self, conn: Connection) -> None:
+        """Queues the calls received from a caller."""
+        sendLock = threading.Lock()
+        try:
+            while True:
+                callId, method, args, kwargs = conn.recv()
+                if method not in METHOD_PRIORITIES:
+                    self._reply(conn, sendLock, (
+                        callId,
+                        False,
+                        GatewayError(f'{method} cannot be called through '
+                                     'the gateway.')
+                    ))
+                    continue
+
+                self._put(
+                    METHOD_PRIORITIES[method],
+                    (conn, sendLock, callId, method, args, kwargs)
+                )
+        except (EOFError, OSError):
+            pass
+
+    def run(self) -> None:
+        """Serves callers until the process is stopped."""
+        os.makedirs(os.path.dirname(self._address), exist_ok=True)
+        if os.path.exists(self._address):
+            os.remove(self._address)
+
+        for idx, client in enumerate(self._clients):
+            maxPriority = (PRIORITY_ORDER
+                           if idx == 0 and len(self._clients) > 1
+                           else PRIORITY_HISTORY)
+            threading.Thread(
+                target=self._work,
+                args=(client, maxPriority),
+                daemon=True
+            ).start()
+
+        with Listener(
+            self._address,
+            'AF_UNIX',
+            authkey=current_process().authkey
+        ) as listener:
+            print(f'\033[92mREST gateway listening with '
+                  f'{len(self._clients)} sessions.\033[0m')
+            while True:
+                try:
+                    conn = listener.accept()
+                except AuthenticationError:
+                    continue
+
+                threading.Thread(
+                    target=self._serve,
+                    args=(conn,),
+                    daemon=True
+                ).start()
+
+
+class GatewayClient:
+    """Stands in for `binance.client.Client`, running each call through the
+    gateway. Calls can be made from any thread.
+    """
+
+    def __init__(
+        self,
+        address: str = GATEWAY_ADDRESS,
+        connectTimeout: float = 10
+    ) -> None:
+        """Connects to the gateway.
+
+        Args:
+            address - (str) Path of the socket the gateway listens on.
+            connectTimeout - (float) Seconds to wait for the gateway to
+                start listening.
+        """
+        self._address = address
+        self._connectTimeout = connectTimeout
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._callIds = itertools.count()
+
+        with self._lock:
+            self._connect()
+
+    def _connect(self) -> None:
+        """Connects to the gateway, waiting for it to start listening."""
+        deadline = time.monotonic() + self._connectTimeout
+        while True:
+            try:
+                conn = Client(
+                    self._address,
+                    'AF_UNIX',
+                    authkey=current_process().authkey
+                )
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+        self._conn = conn
+        threading.Thread(
+            target=self._receive,
+            args=(conn,),
+            daemon=True
+        ).start()
+
+    def _receive(self, conn: Connection) -> None:
+        """Completes each call as its result is received."""
+        try:
+            while True:
+                callId, success, result = conn.recv()
+                with self._lock:
+                    future = self._pending.pop(callId, None)
+                if future is None:
+                    continue
+                if success:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+
+        except (EOFError, OSError):
+            with self._lock:
+                self._conn = None
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                future.set_exception(GatewayError(
+                    'Connection to the gateway closed.'
+                ))
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """Sends a call to the gateway without waiting for its result.
+
+        Args:
+            method - (str) Name of the client method to call.
+            The remaining arguments are passed to the method.
+
+        Returns:
+            Future - Result of the call.
+        """
+        future = Future()
+        with self._lock:
+            if self._conn is None:
+                self._connect()
+
+            callId = next(self._callIds)
+            self._pending[callId] = future
+            try:
+                self._conn.send((callId, method, args, kwargs))
+            except (EOFError, OSError):
+                del self._pending[callId]
+                raise
+
+        return future
+
+    def __getattr__(self, method: str):
+        if method not in METHOD_PRIORITIES:
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            return self.submit(method, *args, **kwargs).result()
+
+        return call
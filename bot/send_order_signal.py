@@ -1,101 +1,65 @@
 """Connects and sends signals to the Binance server."""
 
-from typing import Callable, Optional
+from typing import Optional, Union
 import os
 import math
 import json
 import traceback
 import time
-from datetime import datetime
 from collections import namedtuple
+import numpy as np
 from binance.client import Client
 from binance.enums import ORDER_TYPE_MARKET
+from exchange_info import ExchangeInfo, SymbolFilters
+from rate_limiter import RateLimitedClient
+from rest_gateway import GatewayClient
 
 
-class PreventBanError(Exception):
-    pass
+HistoricalData = namedtuple(
+    'historicalData',
+    ['closes', 'lows', 'highs', 'opens', 'volumes', 'openTimes']
+)
 
 
 class SendOrderSignal:
     """Connects and sends signals to the Binance server."""
 
-    def __init__(self):
-        self._client = self._set_client()
-
-    def respect_request_limit(
-        fn: Optional[Callable] = None,
-        *args,
-        **kwargs
-    ) -> Callable:
-        """Delays a call whilst if the headers are asking us to limit the
-        number of request.
+    def __init__(
+        self,
+        exchangeInfoTTL: float = 86400,
+        gatewayAddress: Optional[str] = None
+    ):
+        """Connects to Binance.
 
         Args:
-            fn - (Callable) Function/method to call.
-
-        Returns:
-            Callable - A decorator function.
+            exchangeInfoTTL - (float) Number of seconds the exchange
+                information is cached for.
+            gatewayAddress - (str) Socket of the REST gateway to send
+                requests through. When not provided, requests are sent
+                directly.
         """
-
-        def decorate(self, *args, **kwargs):
-            reqWaitTimeLoc = os.path.abspath(
-                os.path.join(
-                    __file__,
-                    os.pardir,
-                    'request_wait_time.txt'
-                )
-            )
-
-            with open(reqWaitTimeLoc, mode='r') as f:
-                bannedTime = f.readlines()
-                bannedTime = datetime.strptime(''.join(bannedTime),
-                                               '%Y-%m-%d %H:%M:%S')
-
-            if bannedTime > datetime.now():
-                sleepTime = (bannedTime - datetime.now()).seconds
-                print(
-                    f'\033[91mSleeping for {sleepTime}. This iteration will be skipped\033[0m'  # noqa E501
-                )
-                time.sleep(sleepTime)
-
-                raise PreventBanError(
-                    f'Skipping slept for {sleepTime} seconds.'
-                )
-
-            retryAfter = self.get_client().response.headers.get('Retry-After')
-            self.get_client().response.headers['Retry-After'] = 30
-            if retryAfter:
-                sleepTime = (int(retryAfter) or 60) + 100
-                print(
-                    f'\033[94mREQUEST LIMIT REACHED. SLEEPING FOR {sleepTime} SECONDS.\033[0m'  # noqa: E501
-                )
-                with open(reqWaitTimeLoc, 'w') as f:
-                    f.write(datetime.strftime(datetime.now(),
-                                              '%Y-%m-%d %H:%M:%S'))
-
-                print(f'\033[91mSleeping for {sleepTime} seconds.\033[0m')
-                time.sleep(sleepTime)
-            if fn:
-                return fn(self, *args, **kwargs)
-
-        return decorate
+        self._client = (self._set_client() if gatewayAddress is None
+                        else GatewayClient(gatewayAddress))
+        self._exchangeInfo = ExchangeInfo(self.exchange_info, exchangeInfoTTL)
 
     @staticmethod
     def _set_client() -> Client:
-        """Set the client object to connect to Binance."""
+        """Set the client object to connect to Binance. Every request is
+        rate limited across processes.
+        """
         with open(
             os.path.abspath(os.path.join(__file__, os.pardir, '.keys.json')),
             'r'
         ) as keysFile:
             keys = json.load(keysFile)
 
-        return Client(keys['BINANCE_API_KEY'], keys['BINANCE_SECRET_KEY'])
+        return RateLimitedClient(keys['BINANCE_API_KEY'],
+                                 keys['BINANCE_SECRET_KEY'])
 
     def get_client(self) -> Client:
         """Returns the client object."""
         return self._client
 
-    @respect_request_limit
     def send_signal(
         self,
         side: str,
@@ -154,37 +118,74 @@ class SendOrderSignal:
                 'error': traceback.format_exc()
             }
 
-    @respect_request_limit
-    def apply_filters(self, tradeSymbol: str, quantity: float) -> float:
+    def exchange_info(self) -> dict:
+        """Fetch the trading rules of every symbol."""
+        return self.get_client().get_exchange_info()
+
+    def refresh_exchange_info(self) -> None:
+        """Requests the exchange information and shares it with the other
+        processes.
+        """
+        self._exchangeInfo.refresh()
+
+    def load_exchange_info(self) -> None:
+        """Loads the exchange information shared by the other processes,
+        requesting it only if it is missing or has expired.
+        """
+        self._exchangeInfo.load()
+
+    def run_exchange_info_refresher(self) -> None:
+        """Refreshes the exchange information shared with the other processes
+        whenever it expires, forever.
+        """
+        self._exchangeInfo.run_refresher()
+
+    def symbol_filters(self, tradeSymbol: str) -> SymbolFilters:
+        """Fetch the filters of a symbol from the cached exchange
+        information.
+
+        Args:
+            tradeSymbol - (str) Trade symbol.
+
+        Returns:
+            SymbolFilters - Filters of the symbol.
+        """
+        return self._exchangeInfo.symbol(tradeSymbol)
+
+    def apply_filters(
+        self,
+        tradeSymbol: str,
+        quantity: float,
+        price: float
+    ) -> Optional[str]:
         """Applies filters onto the `quantity` so that the value send later
         for trade is valid.
 
         Args:
             tradeSymbol - (str) Trade symbol.
             quantity - (float) Quantity.
+            price - (float) Price the order is expected to be filled at.
 
         Returns:
-            float - Quantity to buy/sell.
+            str|None - Quantity to buy/sell or `None` if the value of the
+                order would be below the minimum notional of the symbol,
+                in which case the exchange would reject it.
         """
 
-        symbolInfo = self.get_client().get_symbol_info(tradeSymbol)
-
-        filters = symbolInfo['filters']
-        for filt in filters:
-            if filt['filterType'] == 'LOT_SIZE':
-                stepSize = float(filt['stepSize'])
+        filters = self.symbol_filters(tradeSymbol)
+        if filters.stepSize:
+            # Adding an higher level round to remove any floating point
+            # errors.
+            quantity = round(
+                math.floor(quantity / filters.stepSize) * filters.stepSize,
+                filters.quotePrecision
+            )
 
-                # Adding an higher level round to remove any floating point
-                # errors.
-                quantity = round(
-                    math.floor(quantity / stepSize) * stepSize,
-                    symbolInfo['quotePrecision']
-                )
-                break
+        if quantity * price < filters.minNotional:
+            return None
 
         return format(quantity, '.8f')
 
-    @respect_request_limit
     def asset_balance(self, asset: str) -> float:
         """Fetch the asset balance.
 
@@ -196,8 +197,21 @@ class SendOrderSignal:
         """
         return float(self.get_client().get_asset_balance(asset=asset)['free'])
 
-    @respect_request_limit
-    def has_coins(self, asset: str, tradeSymbol: str) -> bool:
+    def account_balances(self) -> list:
+        """Fetch the balance of every asset in a single request.
+
+        Returns:
+            dict[] - Balances, each containing the `asset`, `free` and
+                `locked` keys.
+        """
+        return self.get_client().get_account()['balances']
+
+    def has_coins(
+        self,
+        asset: str,
+        tradeSymbol: str,
+        balance: Optional[float] = None
+    ) -> bool:
         """Checks if the user has coins that they can trade. This will require
         the `tradeSymbol` to be provided as supposed to just the `asset`. By
         doing so, we can check if the quantity owned, is greater than the
@@ -206,41 +220,42 @@ class SendOrderSignal:
         Args:
             asset - (str) Asset name.
             tradeSymbol - (str) Trade symbol.
+            balance - (float) Balance of the coin if already known, otherwise
+                it is fetched.
 
         Returns
             bool - Indicate whether the user has coins they can trade.
         """
-        balance = float(
-            self.get_client().get_asset_balance(asset=tradeSymbol.replace(
-                asset,
-                ''
-            ))['free']
-        )
+        if balance is None:
+            balance = float(
+                self.get_client().get_asset_balance(asset=tradeSymbol.replace(
+                    asset,
+                    ''
+                ))['free']
+            )
 
-        filters = self.get_client().get_symbol_info(tradeSymbol)['filters']
-        for filt in filters:
-            if filt['filterType'] == 'LOT_SIZE':
-                return balance >= float(filt['minQty'])
-        else:
-            return False
+        filters = self.symbol_filters(tradeSymbol)
+        return bool(filters.stepSize) and balance >= filters.minQty
 
-    @respect_request_limit
     def historical_data(
         self,
         tradeSymbol: str,
         interval: str = Client.KLINE_INTERVAL_1MINUTE,
-        dateFromStr: str = '20 mins ago UTC'
-    ) -> namedtuple:
-        """Returns a set of historical closing data.
+        dateFromStr: Union[str, int] = '20 mins ago UTC'
+    ) -> HistoricalData:
+        """Returns a set of historical closing data. Only candles that have
+        closed are returned.
 
         Args:
             tradeSymbol - (str) Trade symbol.
             interval - (str) Interval.
-            dateFromStr - (str) Date from which to start collecting historical
-                data.
+            dateFromStr - (str|int) Date from which to start collecting
+                historical data, either as a string or a timestamp in
+                milliseconds.
 
         Returns:
-            namedtuple - Collection of closing, low and high prices.
+            HistoricalData - Collection of closing, low, high and open prices,
+                volumes and open times.
         """
 
         # Information on the returned values can be found in:
@@ -252,16 +267,21 @@ class SendOrderSignal:
             dateFromStr
         )
 
-        closes = []
-        lows = []
-        highs = []
-
-        for d in data:
-            closes.append(float(d[4]))
-            lows.append(float(d[3]))
-            highs.append(float(d[2]))
-
-        return namedtuple(
-            'historicalData',
-            ['closes', 'lows', 'highs']
-        )(closes, lows, highs)
+        # Each kline starts with the open time, open, high, low, close,
+        # volume and close time.
+        candles = np.array(
+            [kline[:7] for kline in data],
+            dtype=float
+        ).reshape(-1, 7)
+
+        # The latest kline is still open.
+        candles = candles[candles[:, 6] < time.time() * 1000]
+
+        return HistoricalData(
+            candles[:, 4],
+            candles[:, 3],
+            candles[:, 2],
+            candles[:, 1],
+            candles[:, 5],
+            candles[:, 0]
+        )
@@ -0,0 +1,179 @@
+"""Splits the symbols between a fixed number of worker processes and keeps
+the workers running.
+"""
+
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+import bisect
+import hashlib
+import time
+from multiprocessing import Process
+from multiprocessing.connection import wait
+from backoff import Backoff
+
+
+def _hash(key: str) -> int:
+    return int(hashlib.md5(key.encode()).hexdigest()[:16], 16)
+
+
+class ConsistentHashRing:
+    """Maps keys onto a set of nodes so that changing the number of nodes
+    only moves the keys of the nodes added or removed.
+    """
+
+    def __init__(self, nodes: Iterable[int], replicas: int = 100) -> None:
+        """Places each node on the ring.
+
+        Args:
+            nodes - (int[]) Node IDs.
+            replicas - (int) Number of points each node has on the ring,
+                more points spread the keys more evenly.
+        """
+        points = sorted(
+            (_hash(f'{node}:{replica}'), node)
+            for node in nodes
+            for replica in range(replicas)
+        )
+        self._hashes = [point[0] for point in points]
+        self._nodes = [point[1] for point in points]
+
+    def node_for(self, key: str) -> int:
+        """Fetches the node a key belongs to.
+
+        Args:
+            key - (str) Key, i.e: a trade symbol.
+
+        Returns:
+            int - Node ID.
+        """
+        idx = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[idx]
+
+
+def assign_shards(
+    tradeSymbols: Iterable[str],
+    numShards: int
+) -> Dict[int, List[str]]:
+    """Assigns each symbol to a shard using consistent hashing.
+
+    Args:
+        tradeSymbols - (str[]) Trade symbols.
+        numShards - (int) Number of shards.
+
+    Returns:
+        dict - Symbols of each shard. Shards without symbols are not
+            included.
+    """
+    ring = ConsistentHashRing(range(numShards))
+    shards = {}
+    for tradeSymbol in tradeSymbols:
+        shards.setdefault(ring.node_for(tradeSymbol), []).append(tradeSymbol)
+    return shards
+
+
+class ShardSupervisor:
+    """Runs a process for each shard, restarting only the shard whose process
+    crashed. Shards that exit cleanly are not restarted. A crashed shard is
+    restarted once its delay has passed whilst the other shards carry on
+    being supervised.
+    """
+
+    def __init__(
+        self,
+        target: Callable,
+        shardArgs: Dict[Hashable, tuple],
+        backoffSecs: float,
+        maxBackoffSecs: float,
+        targets: Optional[Dict[Hashable, Callable]] = None,
+        daemon: bool = False
+    ) -> None:
+        """Sets up the supervisor.
+
+        Args:
+            target - (Callable) Function run by each shard process.
+            shardArgs - (dict) Arguments `target` is called with for each
+                shard.
+            backoffSecs - (float) Seconds to wait before restarting a shard,
+                doubled each time the shard crashes again.
+            maxBackoffSecs - (float) Maximum seconds to wait before
+                restarting a shard. A shard that has run for longer than
+                this is considered healthy and its delay is reset.
+            targets - (dict) Function run by specific shards instead of
+                `target`, i.e: a process the other shards depend on.
+            daemon - (bool) Should the shard processes end with the process
+                that started them?
+        """
+        self._target = target
+        self._targets = targets or {}
+        self._daemon = daemon
+        self._shardArgs = shardArgs
+        self._maxBackoffSecs = maxBackoffSecs
+        self._backoffs = {shard: Backoff(backoffSecs, maxBackoffSecs)
+                          for shard in shardArgs}
+        self._processes: Dict[Hashable, Process] = {}
+        self._startedAt: Dict[Hashable, float] = {}
+        self._restartAt: Dict[Hashable, float] = {}
+
+    def _start(self, shard: Hashable) -> None:
+        process = Process(
+            target=self._targets.get(shard, self._target),
+            args=self._shardArgs[shard],
+            name=f'shard-{shard}',
+            daemon=self._daemon
+        )
+        process.start()
+        self._processes[shard] = process
+        self._startedAt[shard] = time.monotonic()
+
+    def _schedule_restart(self, shard: Hashable, exitcode: int) -> None:
+        backoff = self._backoffs[shard]
+        now = time.monotonic()
+        if now - self._startedAt[shard] > self._maxBackoffSecs:
+            backoff.reset()
+
+        delay = backoff.next_delay()
+        print(f'\033[91mShard {shard} exited with code {exitcode}. '
+              f'Restarting in {delay} seconds.\033[0m')
+        self._restartAt[shard] = now + delay
+
+    def _restart_due(self) -> Optional[float]:
+        """Restarts the shards whose delay has passed.
+
+        Returns:
+            float - Seconds until the next restart is due, `None` if there
+                are no restarts scheduled.
+        """
+        now = time.monotonic()
+        for shard, restartAt in list(self._restartAt.items()):
+            if restartAt <= now:
+                del self._restartAt[shard]
+                self._start(shard)
+
+        if not self._restartAt:
+            return None
+        return max(min(self._restartAt.values()) - now, 0)
+
+    def run(self) -> None:
+        """Starts every shard and supervises them until they have all exited
+        cleanly.
+        """
+        for shard in self._shardArgs:
+            self._start(shard)
+
+        try:
+            while self._processes or self._restartAt:
+                timeout = self._restart_due()
+                sentinels = {process.sentinel: shard
+                             for shard, process in self._processes.items()}
+
+                for sentinel in wait(list(sentinels), timeout):
+                    shard = sentinels[sentinel]
+                    process = self._processes.pop(shard)
+                    process.join()
+
+                    if process.exitcode != 0:
+                        self._schedule_restart(shard, process.exitcode)
+
+        except KeyboardInterrupt:
+            # The shards receive the interrupt too and close their traders.
+            for process in self._processes.values():
+                process.join()
@@ -0,0 +1,58 @@
+"""Saves and loads the state of a trader so that it can resume after a
+reconnect or restart.
+"""
+
+from typing import Dict, Optional
+import os
+import zipfile
+import numpy as np
+
+DEFAULT_DIR = os.path.abspath(
+    os.path.join(__file__, os.pardir, 'cache', 'state')
+)
+
+
+def snapshot_path(tradeSymbol: str, directory: str = DEFAULT_DIR) -> str:
+    """Location of the snapshot of a symbol.
+
+    Args:
+        tradeSymbol - (str) Trade symbol.
+        directory - (str) Directory the snapshots are stored in.
+
+    Returns:
+        str - Path to the snapshot.
+    """
+    return os.path.join(directory, f'{tradeSymbol}.npz')
+
+
+def save_snapshot(path: str, state: Dict[str, np.array]) -> None:
+    """Writes a snapshot as an uncompressed `.npz` archive of arrays. The
+    snapshot is written to a temporary file first so that an existing
+    snapshot is never left partially written.
+
+    Args:
+        path - (str) Location of the snapshot.
+        state - (dict) Arrays to save by name.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmpPath = f'{path}.{os.getpid()}.tmp'
+    with open(tmpPath, 'wb') as f:
+        np.savez(f, **state)
+    os.replace(tmpPath, path)
+
+
+def load_snapshot(path: str) -> Optional[Dict[str, np.array]]:
+    """Reads a snapshot.
+
+    Args:
+        path - (str) Location of the snapshot.
+
+    Returns:
+        dict - Saved arrays by name, `None` if there is no readable snapshot.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
@@ -1,7 +1,11 @@
 # flake8: noqa
-from .rsi import RSI
-from .bollinger import Bollinger
+from .rsi import RSI, StreamingRSI
+from .bollinger import Bollinger, RollingBollinger
 from .keltner_channels import KeltnerChannels
-from .stochrsi import StochRSI
+from .stochrsi import StochRSI, StreamingStochRSI
 from .ema_buy_100 import EMABuy100
 from .ema_buy_50_100 import EMABuy50And100
+from .ema import EMA, StreamingEMA
+from .atr import ATR, RollingATR
+from .indicators import IndicatorRegistry
+from .batch import BatchEvaluator
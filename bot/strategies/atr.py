@@ -1,5 +1,7 @@
 """Calculates the average true range."""
 
+from collections import deque
+from typing import Iterable, Optional
 import numpy as np
 
 
@@ -17,21 +19,157 @@ class ATR:
         if len(closePrices) < period + 1:
             raise Exception('Not enough periods provided.')
 
-        # Truncate the lists to be equal to the length of the period.
-        closePrices = closePrices[-period - 1: -1]
-        lowPrices = lowPrices[-period:]
-        highPrices = highPrices[-period:]
-
-        trueRanges = [self.true_range(high, low, close)
-                      for high, low, close
-                      in zip(highPrices, lowPrices, closePrices)]
-
-        return sum(trueRanges) / period
+        return float(self.true_ranges(
+            closePrices[-period - 1:],
+            lowPrices[-period - 1:],
+            highPrices[-period - 1:]
+        ).mean())
 
     @staticmethod
     def true_range(currentHigh, currentLow, prevClose):
-        return max([
+        return max(
             currentHigh - currentLow,
-            abs(currentLow - prevClose),
-            abs(prevClose - prevClose)
-        ])
+            abs(currentHigh - prevClose),
+            abs(currentLow - prevClose)
+        )
+
+    @staticmethod
+    def true_ranges(
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array
+    ) -> np.array:
+        """Calculates the true range of every candle that has a previous
+        candle.
+
+        Args:
+            closePrices - (np.array) Collection of closing prices.
+            lowPrices - (np.array) Collection of low prices.
+            highPrices - (np.array) Collection of high prices.
+
+        Returns:
+            np.array - True ranges, one shorter than the prices provided.
+        """
+        prevCloses = np.asarray(closePrices, dtype=float)[:-1]
+        lows = np.asarray(lowPrices, dtype=float)[1:]
+        highs = np.asarray(highPrices, dtype=float)[1:]
+
+        return np.maximum(
+            highs - lows,
+            np.maximum(np.abs(highs - prevCloses), np.abs(lows - prevCloses))
+        )
+
+    @classmethod
+    def atr_series(
+        cls,
+        period: int,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array
+    ) -> np.array:
+        """Calculates the ATR for every candle.
+
+        Args:
+            period - (int) Period.
+            closePrices - (np.array) Collection of closing prices.
+            lowPrices - (np.array) Collection of low prices.
+            highPrices - (np.array) Collection of high prices.
+
+        Returns:
+            np.array - ATR for each candle. Candles without `period` previous
+                candles are NaN.
+        """
+        atrs = np.full(len(closePrices), np.nan)
+        if len(closePrices) < period + 1:
+            return atrs
+
+        cumTrueRanges = np.concatenate((
+            [0.0],
+            np.cumsum(cls.true_ranges(closePrices, lowPrices, highPrices))
+        ))
+        atrs[period:] = (cumTrueRanges[period:]
+                         - cumTrueRanges[:-period]) / period
+        return atrs
+
+
+class RollingATR:
+    """Maintains the average true range over the latest `period` candles so
+    that it can be updated in constant time each time a candle closes.
+    """
+
+    def __init__(self, period: int) -> None:
+        """Sets up an empty ATR.
+
+        Args:
+            period - (int) Period.
+        """
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the state of the ATR."""
+        self._trueRanges = deque(maxlen=self.period)
+        self._sum = 0.0
+        self._prevClose = None
+
+    @property
+    def ready(self) -> bool:
+        """Have `period` true ranges been collected?"""
+        return len(self._trueRanges) == self.period
+
+    @property
+    def value(self) -> Optional[float]:
+        """Latest ATR or `None` if there is not enough data."""
+        return self._sum / self.period if self.ready else None
+
+    def seed(
+        self,
+        closePrices: Iterable[float],
+        lowPrices: Iterable[float],
+        highPrices: Iterable[float]
+    ) -> Optional[float]:
+        """Resets the ATR and loads historical candles.
+
+        Args:
+            closePrices - (np.array) Collection of closing prices.
+            lowPrices - (np.array) Collection of low prices.
+            highPrices - (np.array) Collection of high prices.
+
+        Returns:
+            float|None - Latest ATR or `None` if there is not enough data.
+        """
+        self.reset()
+        closePrices = np.asarray(closePrices, dtype=float)
+        if not len(closePrices):
+            return None
+
+        trueRanges = ATR.true_ranges(
+            closePrices[-self.period - 1:],
+            np.asarray(lowPrices, dtype=float)[-self.period - 1:],
+            np.asarray(highPrices, dtype=float)[-self.period - 1:]
+        )
+        self._trueRanges.extend(trueRanges.tolist())
+        self._sum = float(trueRanges.sum())
+        self._prevClose = float(closePrices[-1])
+        return self.value
+
+    def update(self, close: float, low: float, high: float) -> Optional[float]:
+        """Adds the latest candle to the ATR.
+
+        Args:
+            close - (float) Closing price.
+            low - (float) Low price.
+            high - (float) High price.
+
+        Returns:
+            float|None - Latest ATR or `None` if there is not enough data.
+        """
+        if self._prevClose is not None:
+            if self.ready:
+                self._sum -= self._trueRanges[0]
+            trueRange = ATR.true_range(high, low, self._prevClose)
+            self._trueRanges.append(trueRange)
+            self._sum += trueRange
+
+        self._prevClose = float(close)
+        return self.value
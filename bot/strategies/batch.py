@@ -0,0 +1,232 @@
+"""Applies strategies to the latest candle of many symbols at once."""
+
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
+import numpy as np
+try:
+    from .rsi import RSI
+    from .bollinger import Bollinger
+    from .keltner_channels import KeltnerChannels
+    from .stochrsi import StochRSI
+    from .ema_buy_100 import EMABuy100
+    from .ema_buy_50_100 import EMABuy50And100
+except ImportError:
+    from rsi import RSI
+    from bollinger import Bollinger
+    from keltner_channels import KeltnerChannels
+    from stochrsi import StochRSI
+    from ema_buy_100 import EMABuy100
+    from ema_buy_50_100 import EMABuy50And100
+
+if TYPE_CHECKING:
+    from .indicators import IndicatorRegistry
+
+
+# Each kernel takes the latest closing price and number of candles of each
+# symbol, along with the `IndicatorRegistry` of each symbol, already updated
+# with the latest candle. Row `i` produces the same results and decision as
+# the strategy's `apply_indicator` would given registry `i`.
+
+def _gather(
+    registries: Sequence['IndicatorRegistry'],
+    key: Tuple,
+    attr: str = 'value',
+    mask: Optional[np.array] = None
+) -> np.array:
+    """Fetches an attribute of an indicator from each registry. Missing
+    values, and those of registries left out by `mask`, are NaN.
+    """
+    values = np.full(len(registries), np.nan)
+    for idx, registry in enumerate(registries):
+        if mask is None or mask[idx]:
+            value = getattr(registry[key], attr)
+            if value is not None:
+                values[idx] = value
+    return values
+
+
+def _ready(registries: Sequence['IndicatorRegistry'], key: Tuple) -> np.array:
+    """Is the indicator of each registry ready?"""
+    return np.fromiter((registry[key].ready for registry in registries),
+                       dtype=bool, count=len(registries))
+
+
+def _threshold_decisions(
+    buyMask: np.array,
+    sellMask: np.array,
+    coinsOwned: np.array
+) -> np.array:
+    """Combines buy/sell masks with the owned state of each symbol."""
+    decisions = np.zeros(len(coinsOwned), dtype=np.int8)
+    decisions[buyMask & ~coinsOwned] = 1
+    decisions[sellMask & coinsOwned] = -1
+    return decisions
+
+
+def _rsi(closes, counts, registries, config, coinsOwned):
+    rsis = _gather(registries, ('rsi', config['period']))
+    with np.errstate(invalid='ignore'):
+        decisions = _threshold_decisions(
+            rsis <= config['oversold_limit'],
+            rsis >= config['overbought_limit'],
+            coinsOwned
+        )
+    return (rsis,), decisions
+
+
+def _bollinger(closes, counts, registries, config, coinsOwned):
+    period = config['period']
+    key = ('bollinger', period)
+    ready = (counts >= period + 1) & _ready(registries, key)
+    lower = _gather(registries, key, 'lower', ready)
+    upper = _gather(registries, key, 'upper', ready)
+    with np.errstate(invalid='ignore'):
+        decisions = _threshold_decisions(
+            closes < lower,
+            closes > upper,
+            coinsOwned
+        )
+    return (lower, upper), decisions
+
+
+def _stochrsi(closes, counts, registries, config, coinsOwned):
+    period = config['period']
+    stochRSIs = _gather(registries, ('stochrsi', period, 3, 3),
+                        mask=counts >= period * 2)
+    with np.errstate(invalid='ignore'):
+        decisions = _threshold_decisions(
+            stochRSIs <= config['oversold_limit'],
+            stochRSIs >= config['overbought_limit'],
+            coinsOwned
+        )
+    return (stochRSIs,), decisions
+
+
+def _keltner_channels(closes, counts, registries, config, coinsOwned):
+    emaKey = ('ema', config['ema_period'])
+    atrKey = ('atr', config['atr_period'])
+    ready = _ready(registries, emaKey) & _ready(registries, atrKey)
+    channels = KeltnerChannels.channels(
+        _gather(registries, emaKey, mask=ready),
+        _gather(registries, atrKey, mask=ready),
+        config['atr_multi']
+    )
+    with np.errstate(invalid='ignore'):
+        decisions = _threshold_decisions(
+            closes <= channels.lowerBand,
+            closes >= channels.upperBand,
+            coinsOwned
+        )
+    results = (channels.middleLine, channels.lowerBand, channels.upperBand)
+    return results, decisions
+
+
+def _ema_buy(closes, counts, registries, coinsOwned, buy):
+    """Decisions of the EMA buy strategies. Once there are more than 100
+    closes, owned coins are always sold and the EMAs are only fetched for
+    the symbols whose coins are not owned.
+    """
+    ready = counts > 100
+    buying = ready & ~coinsOwned
+    emas, buyMask = buy(buying)
+
+    decisions = np.zeros(len(closes), dtype=np.int8)
+    decisions[ready & coinsOwned] = -1
+    with np.errstate(invalid='ignore'):
+        decisions[buying & buyMask] = 1
+    return emas, decisions
+
+
+def _ema_buy_100(closes, counts, registries, config, coinsOwned):
+    def buy(mask):
+        ema = _gather(registries, ('ema', 100), mask=mask)
+        return (ema,), ema <= closes
+
+    return _ema_buy(closes, counts, registries, coinsOwned, buy)
+
+
+def _ema_buy_50_100(closes, counts, registries, config, coinsOwned):
+    def buy(mask):
+        ema50 = _gather(registries, ('ema', 50), mask=mask)
+        ema100 = _gather(registries, ('ema', 100), mask=mask)
+        return (ema50, ema100), ema50 >= ema100
+
+    return _ema_buy(closes, counts, registries, coinsOwned, buy)
+
+
+BATCH_STRATEGIES: Dict[type, Callable] = {
+    RSI: _rsi,
+    Bollinger: _bollinger,
+    StochRSI: _stochrsi,
+    KeltnerChannels: _keltner_channels,
+    EMABuy100: _ema_buy_100,
+    EMABuy50And100: _ema_buy_50_100,
+}
+
+
+class BatchEvaluator:
+    """Applies a set of strategies to the latest candle of many symbols in
+    one vectorised call per strategy.
+
+    The indicators are read from the `IndicatorRegistry` of each symbol, so
+    the decisions are those each trader would make on its own.
+    """
+
+    def __init__(self, strategies: Sequence[type], config: dict) -> None:
+        """Sets up the evaluator.
+
+        Args:
+            strategies - (type[]) Strategy classes to apply, each must have a
+                kernel in `BATCH_STRATEGIES`.
+            config - (dict) Config dict.
+        """
+        self._pipeline = [
+            (BATCH_STRATEGIES[strat],
+             config['strategies'][strat.__name__.lower()])
+            for strat in strategies
+        ]
+        self.columns = tuple(
+            column for strat in strategies for column in strat.columns
+        )
+
+    def evaluate(
+        self,
+        closes: np.array,
+        counts: np.array,
+        registries: Sequence['IndicatorRegistry'],
+        coinsOwned: Sequence[bool]
+    ) -> Tuple[np.array, np.array]:
+        """Applies the strategies to the latest candle of every symbol.
+
+        Args:
+            closes - (np.array) Latest closing price of each symbol.
+            counts - (np.array) Number of candles kept for each symbol.
+            registries - (IndicatorRegistry[]) Indicators of each symbol,
+                updated with the latest candle.
+            coinsOwned - (bool[]) Are the coins owned, for each symbol?
+
+        Returns:
+            tuple - (symbols x strategies) decisions and a (symbols x columns)
+                float64 array of results, laid out as the rows written by
+                each strategy's `apply_indicator`.
+        """
+        closes = np.asarray(closes, dtype=float)
+        counts = np.asarray(counts)
+        coinsOwned = np.asarray(coinsOwned, dtype=bool)
+
+        decisions = np.empty((len(closes), len(self._pipeline)), dtype=np.int8)
+        results = np.empty((len(closes), len(self.columns)))
+
+        col = 0
+        for idx, (kernel, config) in enumerate(self._pipeline):
+            values, decisions[:, idx] = kernel(
+                closes, counts, registries, config, coinsOwned
+            )
+            for value in values:
+                results[:, col] = value
+                col += 1
+
+            # The decision is always the last column of a strategy.
+            results[:, col] = decisions[:, idx]
+            col += 1
+
+        return decisions, results
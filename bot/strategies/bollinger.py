@@ -1,5 +1,8 @@
 """Applies the Bollinger stategory on a collection of closing prices."""
 
+from collections import deque
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+import math
 import numpy as np
 import pandas as pd
 try:
@@ -7,66 +10,197 @@ try:
 except ImportError:
     from strategy_base import Strategy
 
+if TYPE_CHECKING:
+    from .indicators import IndicatorRegistry
+
 
 class Bollinger(Strategy):
     """Applies the Bollinger stategory onto a collection of closing prices."""
 
+    columns = ('Bollinger Low', 'Bollinger High', 'Bollinger Decision')
+
+    @staticmethod
+    def indicators(config: dict) -> List[Tuple]:
+        return [('bollinger', config['period'])]
+
+    @staticmethod
+    def lookback(config: dict) -> int:
+        return config['period'] + 1
+
     def apply_indicator(
         self,
         npCloses: np.array,
         config: dict,
         coinsOwned: bool,
-    ) -> dict:
+        indicators: Optional['IndicatorRegistry'] = None
+    ) -> int:
 
         period = config['period']
 
+        if indicators is not None:
+            bands = indicators[('bollinger', period)]
+        else:
+            bands = None
+
         # Edgecase
-        if len(npCloses) < period + 1:
-            return {
-                'results': {
-                    'Bollinger Low': '',
-                    'Bollinger High': '',
-                    'Bollinger Decision': 0
-                },
-                'decision': 0
-            }
-
-        # Convert the closing prices into a Pandas dataframe and add columns
-        # with certain statistical information that will help calculate the
-        # Bollinger value.
-        npCloses = npCloses[-period - 1:]
-        df = pd.DataFrame(npCloses, columns=['Close'])
-
-        df['SMA'] = df['Close'].rolling(window=period).mean()
-        df['STD'] = df['Close'].rolling(window=period).std()
-        df['Upper'] = df['SMA'] + (df['STD'] * 2)
-        df['Lower'] = df['SMA'] - (df['STD'] * 2)
-
-        self.log(f'BOLLINGER: Upper={df["Upper"].iat[-1]}\
-            Lower={df["Lower"].iat[-1]}')
+        if (len(npCloses) < period + 1
+                or (bands is not None and not bands.ready)):
+            return self._no_decision()
+
+        # The bands only depend on the latest `period` closing prices.
+        if bands is None:
+            bands = RollingBollinger(period).seed(npCloses[-period:])
+        close = npCloses[-1]
+
+        self.log(f'BOLLINGER: Upper={bands.upper}\
+            Lower={bands.lower}')
 
         # Calculate buy/sell signals.
-        if df['Close'].iat[-1] > df['Upper'].iat[-1] and coinsOwned:
+        if close > bands.upper and coinsOwned:
             self.log('BOLLINGER: SELL')
             decision = -1
 
-        elif df['Close'].iat[-1] < df['Lower'].iat[-1] and not coinsOwned:
+        elif close < bands.lower and not coinsOwned:
             self.log('BOLLINGER: BUY')
             decision = 1
 
         else:
             decision = 0
 
+        results = self.results
+        results[0] = bands.lower
+        results[1] = bands.upper
+        results[2] = decision
+        return decision
+
+    def apply_series(
+        self,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array,
+        config: dict
+    ) -> dict:
+        period = config['period']
+        closes = pd.Series(np.asarray(closePrices, dtype=float))
+        sma = closes.rolling(window=period).mean()
+        std = closes.rolling(window=period).std()
+        upper = (sma + std * 2).to_numpy()
+        lower = (sma - std * 2).to_numpy()
+
+        # Like `apply_indicator`, decisions need `period + 1` closes.
+        closePrices = closes.to_numpy()
+        ready = np.arange(len(closePrices)) >= period
+        with np.errstate(invalid='ignore'):
+            decisions = self._threshold_decisions(
+                closePrices,
+                ready & (closePrices < lower),
+                ready & (closePrices > upper)
+            )
+
         return {
-            'results': {
-                'Bollinger Low': df['Lower'].iat[-1],
-                'Bollinger High': df['Upper'].iat[-1],
-                'Bollinger Decision': decision
-            },
-            'decision': decision
+            'results': {'Bollinger Low': lower, 'Bollinger High': upper},
+            'decisions': decisions
         }
 
 
+class RollingBollinger:
+    """Maintains the Bollinger bands over a fixed window of closing prices.
+
+    The running mean and sum of squared differences are updated using
+    Welford's method as prices enter and leave the window, so each update is
+    constant time and does not suffer from the cancellation of a naive
+    sum/sum-of-squares. The standard deviation is the sample standard
+    deviation, matching `pd.Series.rolling().std()`.
+    """
+
+    def __init__(self, period: int, stdMulti: float = 2) -> None:
+        """Sets up an empty window.
+
+        Args:
+            period - (int) Number of closing prices in the window.
+            stdMulti - (float) Multiplier applied to the standard deviation.
+        """
+        self.period = period
+        self.stdMulti = stdMulti
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the window."""
+        self._window = deque(maxlen=self.period)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Is the window full?"""
+        return len(self._window) == self.period
+
+    @property
+    def mean(self) -> float:
+        """Simple moving average of the window."""
+        return self._mean if self.ready else float('nan')
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the window."""
+        if not self.ready or self.period < 2:
+            return float('nan')
+        return math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+
+    @property
+    def upper(self) -> float:
+        """Upper Bollinger band."""
+        return self.mean + self.std * self.stdMulti
+
+    @property
+    def lower(self) -> float:
+        """Lower Bollinger band."""
+        return self.mean - self.std * self.stdMulti
+
+    def seed(self, npCloses: Iterable[float]) -> 'RollingBollinger':
+        """Resets the window and fills it with the latest `period` closing
+        prices.
+
+        Args:
+            npCloses - (np.array) Collection of closing prices.
+
+        Returns:
+            RollingBollinger - The calculator itself.
+        """
+        npCloses = np.asarray(npCloses, dtype=float)[-self.period:]
+        self.reset()
+        self._window.extend(npCloses.tolist())
+        if len(npCloses):
+            self._mean = float(npCloses.mean())
+            self._m2 = float(((npCloses - self._mean) ** 2).sum())
+        return self
+
+    def update(self, close: float) -> 'RollingBollinger':
+        """Adds the latest closing price to the window, dropping the oldest
+        price once the window is full.
+
+        Args:
+            close - (float) Latest closing price.
+
+        Returns:
+            RollingBollinger - The calculator itself.
+        """
+        close = float(close)
+        if len(self._window) < self.period:
+            self._window.append(close)
+            delta = close - self._mean
+            self._mean += delta / len(self._window)
+            self._m2 += delta * (close - self._mean)
+            return self
+
+        oldest = self._window[0]
+        self._window.append(close)
+        oldMean = self._mean
+        self._mean += (close - oldest) / self.period
+        self._m2 += (close - oldest) * (close - self._mean + oldest - oldMean)
+        return self
+
+
 if __name__ == '__main__':
     import os
     print(os.path.abspath('.'))
@@ -74,15 +208,16 @@ if __name__ == '__main__':
 
     phasedData = []
     coinsOwned = False
+    bollinger = Bollinger()
     for d in data:
         phasedData.append(float(d))
-        results = Bollinger().apply_indicator(
+        decision = bollinger.apply_indicator(
             np.array(phasedData),
             {'period': 20},
             coinsOwned
         )
-        print(f"{results['results']['Bollinger Low']}|{results['results']['Bollinger High']}|{results['results']['Bollinger Decision']}")
-        if results['decision'] == 1:
+        print('|'.join(str(result) for result in bollinger.results))
+        if decision == 1:
             coinsOwned = True
-        elif results['decision'] == -1:
+        elif decision == -1:
             coinsOwned = False
@@ -1,3 +1,4 @@
+from typing import Iterable, Optional
 import numpy as np
 import pandas as pd
 
@@ -27,6 +28,100 @@ class EMA:
 
         return pd.concat([sma, rest]).ewm(span=period, adjust=False).mean()
 
+    @staticmethod
+    def latest_ema(npCloses: np.array, period: int) -> float:
+        """Calculates the latest EMA without building the whole series.
+
+        Produces the same value as `calc_ema(npCloses, period).iloc[-1]`, the
+        SMA of the first `period` prices is used as the starting EMA and the
+        remaining prices are applied as a single weighted sum.
+
+        Args:
+            npCloses - (np.array) Collection of closing prices.
+            period - (int) Period.
+
+        Returns:
+            float - Latest EMA value, NaN if there are less than `period`
+                closing prices.
+        """
+        npCloses = np.asarray(npCloses, dtype=float)
+        if len(npCloses) < period:
+            return float('nan')
+
+        alpha = 2 / (period + 1)
+        rest = npCloses[period:]
+        decay = (1 - alpha) ** np.arange(len(rest) - 1, -1, -1)
+
+        return float(
+            npCloses[:period].mean() * (1 - alpha) ** len(rest)
+            + alpha * np.dot(decay, rest)
+        )
+
+
+class StreamingEMA:
+    """Keeps the latest EMA value so that it can be updated in constant time
+    each time a candle closes.
+    """
+
+    def __init__(self, period: int) -> None:
+        """Sets up an empty EMA.
+
+        Args:
+            period - (int) Period.
+        """
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the state of the EMA."""
+        self._warmup = []
+        self.value = None
+
+    @property
+    def ready(self) -> bool:
+        """Has enough data been provided to produce an EMA value?"""
+        return self.value is not None
+
+    def seed(self, npCloses: Iterable[float]) -> Optional[float]:
+        """Resets the EMA and loads a collection of historical closing prices.
+
+        Args:
+            npCloses - (np.array) Collection of closing prices.
+
+        Returns:
+            float|None - Latest EMA value or `None` if there are less than
+                `period` closing prices.
+        """
+        self.reset()
+        npCloses = np.asarray(npCloses, dtype=float)
+        if len(npCloses) < self.period:
+            self._warmup = npCloses.tolist()
+            return None
+
+        self.value = EMA.latest_ema(npCloses, self.period)
+        return self.value
+
+    def update(self, close: float) -> Optional[float]:
+        """Adds the latest closing price to the EMA.
+
+        Args:
+            close - (float) Latest closing price.
+
+        Returns:
+            float|None - Latest EMA value or `None` if there are less than
+                `period` closing prices.
+        """
+        if self.value is None:
+            self._warmup.append(float(close))
+            if len(self._warmup) == self.period:
+                self.value = sum(self._warmup) / self.period
+                self._warmup = []
+            return self.value
+
+        self.value += self.alpha * (float(close) - self.value)
+        return self.value
+
 
 if __name__ == '__main__':
     e = EMA().calc_ema(np.array([2, 4, 6, 8, 12, 14, 16, 18, 20]), 2)
@@ -1,38 +1,57 @@
+import numpy as np
 from .strategy_base import Strategy
 from .ema import EMA
+from . import kernels
 
 
 class EMABuy100(Strategy):
 
-    def apply_indicator(self, closePrices, config, coinsOwned):
+    columns = ('EMA Value', 'Decision')
+
+    @staticmethod
+    def indicators(config):
+        return [('ema', 100)]
+
+    @staticmethod
+    def lookback(config):
+        return 101
+
+    def apply_indicator(self, closePrices, config, coinsOwned,
+                        indicators=None):
 
         period = 100
         if len(closePrices) <= period:
-            return {
-                'results': {
-                    'EMA Value': '',
-                    'Decision': 0
-                },
-                'decision': 0
-            }
+            return self._no_decision()
 
         if not coinsOwned:
-            emaVal = EMA().calc_ema(closePrices, period)
-            decision = 1 if emaVal.iloc[-1] <= closePrices[-1] else 0
-            self.log(f'EMA: {emaVal.iloc[-1]}')
-            return {
-                'results': {
-                    'EMA Value': emaVal.iloc[-1],
-                    'Decision': decision
-                },
-                'decision': decision
-            }
+            if indicators is not None:
+                emaVal = indicators[('ema', period)].value
+            else:
+                emaVal = EMA.latest_ema(closePrices, period)
+            decision = 1 if emaVal <= closePrices[-1] else 0
+            self.log(f'EMA: {emaVal}')
+            self.results[0] = emaVal
+            self.results[1] = decision
+            return decision
 
         else:
-            return {
-                'results': {
-                    'EMA Value': '',
-                    'Decision': -1,
-                },
-                'decision': -1
-            }
+            self.results[0] = np.nan
+            self.results[1] = -1
+            return -1
+
+    def apply_series(self, closePrices, lowPrices, highPrices, config):
+
+        period = 100
+        closePrices = np.asarray(closePrices, dtype=float)
+        emas = kernels.ema_series(closePrices, period)
+
+        # Decisions are only made once there are more than `period` closes.
+        ready = np.arange(len(closePrices)) >= period
+        with np.errstate(invalid='ignore'):
+            decisions = self._threshold_decisions(
+                closePrices,
+                ready & (emas <= closePrices),
+                ready
+            )
+
+        return {'results': {'EMA Value': emas}, 'decisions': decisions}
@@ -1,44 +1,67 @@
+import numpy as np
 from .strategy_base import Strategy
 from .ema import EMA
+from . import kernels
 
 
 class EMABuy50And100(Strategy):
 
-    def apply_indicator(self, closePrices, config, coinsOwned):
+    columns = ('EMA 50', 'EMA 100', 'Decision')
+
+    @staticmethod
+    def indicators(config):
+        return [('ema', 50), ('ema', 100)]
+
+    @staticmethod
+    def lookback(config):
+        return 101
+
+    def apply_indicator(self, closePrices, config, coinsOwned,
+                        indicators=None):
 
         period = 100
         if len(closePrices) <= period:
-            return {
-                'results': {
-                    'EMA 50': '',
-                    'EMA 100': '',
-                    'Decision': 0
-                },
-                'decision': 0
-            }
+            return self._no_decision()
 
         if not coinsOwned:
-            ema100 = EMA().calc_ema(closePrices, period)
-            ema50 = EMA().calc_ema(closePrices, 50)
+            if indicators is not None:
+                ema100 = indicators[('ema', period)].value
+                ema50 = indicators[('ema', 50)].value
+            else:
+                ema100 = EMA.latest_ema(closePrices, period)
+                ema50 = EMA.latest_ema(closePrices, 50)
             
             # decision = 1 if emaVal.iloc[-1] >= closePrices[-1] else 0
-            decision = 1 if ema50.iloc[-1] >= ema100.iloc[-1] else 0
-            self.log(f'EMA 50: {ema50.iloc[-1]}, EMA 100: {ema100.iloc[-1]}')
-            return {
-                'results': {
-                    'EMA 50': ema50.iloc[-1],
-                    'EMA 100': ema100.iloc[-1],
-                    'Decision': decision
-                },
-                'decision': decision
-            }
+            decision = 1 if ema50 >= ema100 else 0
+            self.log(f'EMA 50: {ema50}, EMA 100: {ema100}')
+            self.results[0] = ema50
+            self.results[1] = ema100
+            self.results[2] = decision
+            return decision
 
         else:
-            return {
-                'results': {
-                    'EMA 50': '',
-                    'EMA 100': '',
-                    'Decision': -1,
-                },
-                'decision': -1
-            }
+            self.results[0] = np.nan
+            self.results[1] = np.nan
+            self.results[2] = -1
+            return -1
+
+    def apply_series(self, closePrices, lowPrices, highPrices, config):
+
+        period = 100
+        closePrices = np.asarray(closePrices, dtype=float)
+        ema100 = kernels.ema_series(closePrices, period)
+        ema50 = kernels.ema_series(closePrices, 50)
+
+        # Decisions are only made once there are more than `period` closes.
+        ready = np.arange(len(closePrices)) >= period
+        with np.errstate(invalid='ignore'):
+            decisions = self._threshold_decisions(
+                closePrices,
+                ready & (ema50 >= ema100),
+                ready
+            )
+
+        return {
+            'results': {'EMA 50': ema50, 'EMA 100': ema100},
+            'decisions': decisions
+        }
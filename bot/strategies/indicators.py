@@ -0,0 +1,114 @@
+"""Computes the indicators required by a set of strategies once per candle."""
+
+from typing import Dict, Iterable, Tuple
+import numpy as np
+try:
+    from .rsi import StreamingRSI
+    from .bollinger import RollingBollinger
+    from .ema import StreamingEMA
+    from .atr import RollingATR
+    from .stochrsi import StreamingStochRSI
+except ImportError:
+    from rsi import StreamingRSI
+    from bollinger import RollingBollinger
+    from ema import StreamingEMA
+    from atr import RollingATR
+    from stochrsi import StreamingStochRSI
+
+
+class IndicatorRegistry:
+    """Holds a single streaming engine for every indicator required by a set
+    of strategies.
+
+    Strategies declare the indicators they need through
+    `Strategy.indicators`, each indicator being a key such as `('ema', 20)`,
+    `('atr', 20)`, `('rsi', 14)`, `('bollinger', 20)` or
+    `('stochrsi', 14, 3, 3)`. Indicators required by more than one strategy
+    are only calculated once per candle. The Stochastic RSI depends on the
+    RSI of the same period which is shared with the RSI strategy.
+
+    Once updated, the engine for a key can be fetched by indexing the
+    registry, i.e: `registry[('ema', 20)].value`.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[Tuple, object] = {}
+
+    def __getitem__(self, key: Tuple):
+        return self._nodes[key]
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._nodes
+
+    def require(self, key: Tuple) -> None:
+        """Registers an indicator, along with any indicators it depends on.
+
+        Args:
+            key - (tuple) Indicator name followed by its parameters.
+        """
+        if key in self._nodes:
+            return
+
+        kind, *params = key
+        if kind == 'rsi':
+            self._nodes[key] = StreamingRSI(*params)
+        elif kind == 'bollinger':
+            self._nodes[key] = RollingBollinger(*params)
+        elif kind == 'ema':
+            self._nodes[key] = StreamingEMA(*params)
+        elif kind == 'atr':
+            self._nodes[key] = RollingATR(*params)
+        elif kind == 'stochrsi':
+            # The RSI is registered first so that it is updated before the
+            # Stochastic RSI is.
+            self.require(('rsi', params[0]))
+            self._nodes[key] = StreamingStochRSI(*params)
+        else:
+            raise ValueError(f'Unknown indicator {kind}.')
+
+    def require_all(self, keys: Iterable[Tuple]) -> None:
+        """Registers a collection of indicators.
+
+        Args:
+            keys - (tuple[]) Indicator keys.
+        """
+        for key in keys:
+            self.require(key)
+
+    def seed(
+        self,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array
+    ) -> None:
+        """Resets every indicator and loads historical candles.
+
+        Args:
+            closePrices - (np.array) Collection of closing prices.
+            lowPrices - (np.array) Collection of low prices.
+            highPrices - (np.array) Collection of high prices.
+        """
+        for key, node in self._nodes.items():
+            if key[0] == 'atr':
+                node.seed(closePrices, lowPrices, highPrices)
+            else:
+                node.seed(closePrices)
+
+    def update(self, close: float, low: float, high: float) -> None:
+        """Adds the latest candle to every indicator.
+
+        Args:
+            close - (float) Closing price.
+            low - (float) Low price.
+            high - (float) High price.
+        """
+        for key, node in self._nodes.items():
+            kind = key[0]
+            if kind == 'atr':
+                node.update(close, low, high)
+            elif kind == 'stochrsi':
+                rsi = self._nodes[('rsi', key[1])]
+                if rsi.ready:
+                    node.push_rsi(rsi.value)
+            else:
+                node.update(close)
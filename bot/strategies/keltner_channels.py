@@ -2,29 +2,51 @@
 
 
 from collections import namedtuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 import numpy as np
 
 try:
     from .strategy_base import Strategy
     from .ema import EMA
     from .atr import ATR
+    from . import kernels
 except ImportError:
     from strategy_base import Strategy
     from ema import EMA
     from atr import ATR
+    import kernels
+
+if TYPE_CHECKING:
+    from .indicators import IndicatorRegistry
 
 
 class KeltnerChannels(Strategy):
     """Calculates the Keltner Channels."""
 
+    columns = (
+        'Keltner Channels Middle Line',
+        'Keltner Channels Lower Band',
+        'Keltner Channels Upper Band',
+        'Keltner Channels Decision'
+    )
+
+    @staticmethod
+    def indicators(config: dict) -> List[Tuple]:
+        return [('ema', config['ema_period']), ('atr', config['atr_period'])]
+
+    @staticmethod
+    def lookback(config: dict) -> int:
+        return max(config['ema_period'], config['atr_period'] + 1)
+
     def apply_indicator(
         self,
         closePrices: np.array,
         config: dict,
         coinsOwned: bool,
         lowPrices: np.array,
-        highPrices: np.array
-    ) -> dict:
+        highPrices: np.array,
+        indicators: Optional['IndicatorRegistry'] = None
+    ) -> int:
         """Calculates the Keltner Channels and makes a decision on whether to
         buy/sell.
 
@@ -34,32 +56,35 @@ class KeltnerChannels(Strategy):
             coinsOwned - (bool) Is the coin currently owned?
             lowPrices - (np.array) Collection of low prices.
             highPrices - (np.array) Collection of high prices.
+            indicators - (IndicatorRegistry) Pre-calculated indicators.
 
         Returns:
-            dict - Returns a `results` key containing printable results and a
-                `decision` key which decides whether or not to buy/sell.
+            int - Decision on whether or not to buy/sell.
         """
 
+        if indicators is not None:
+            ema = indicators[('ema', config['ema_period'])]
+            atr = indicators[('atr', config['atr_period'])]
+            ready = ema.ready and atr.ready
+        else:
+            ready = len(lowPrices) >= max([config['ema_period'],
+                                           config['atr_period']])
+
         # Edgecase - if there is insufficient data, then do not proceed.
-        if len(lowPrices) < max([config['ema_period'], config['atr_period']]):
-            return {
-                'results': {
-                    'Keltner Channels Middle Line': '',
-                    'Keltner Channels Lower Band': '',
-                    'Keltner Channels Upper Band': '',
-                    'Keltner Channels Decision': 0
-                },
-                'decision': 0
-            }
-
-        results = self.calculate(
-            closePrices,
-            lowPrices,
-            highPrices,
-            config['ema_period'],
-            config['atr_period'],
-            config['atr_multi']
-        )
+        if not ready:
+            return self._no_decision()
+
+        if indicators is not None:
+            results = self.channels(ema.value, atr.value, config['atr_multi'])
+        else:
+            results = self.calculate(
+                closePrices,
+                lowPrices,
+                highPrices,
+                config['ema_period'],
+                config['atr_period'],
+                config['atr_multi']
+            )
 
         if coinsOwned and closePrices[-1] >= results.upperBand:
             decision = -1
@@ -68,14 +93,37 @@ class KeltnerChannels(Strategy):
         else:
             decision = 0
 
+        self.results[:] = (results.middleLine, results.lowerBand,
+                           results.upperBand, decision)
+        return decision
+
+    def apply_series(
+        self,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array,
+        config: dict
+    ) -> dict:
+        closePrices = np.asarray(closePrices, dtype=float)
+        emas = kernels.ema_series(closePrices, config['ema_period'])
+        atrs = ATR.atr_series(config['atr_period'], closePrices, lowPrices,
+                              highPrices)
+        channels = self.channels(emas, atrs, config['atr_multi'])
+
+        with np.errstate(invalid='ignore'):
+            decisions = self._threshold_decisions(
+                closePrices,
+                closePrices <= channels.lowerBand,
+                closePrices >= channels.upperBand
+            )
+
         return {
             'results': {
-                'Keltner Channels Middle Line': results.middleLine,
-                'Keltner Channels Lower Band': results.lowerBand,
-                'Keltner Channels Upper Band': results.upperBand,
-                'Keltner Channels Decision': decision
+                'Keltner Channels Middle Line': channels.middleLine,
+                'Keltner Channels Lower Band': channels.lowerBand,
+                'Keltner Channels Upper Band': channels.upperBand
             },
-            'decision': decision
+            'decisions': decisions
         }
 
     @staticmethod
@@ -100,14 +148,27 @@ class KeltnerChannels(Strategy):
         Returns:
             namedtuple - Returns the lower amd middle bands and middle line.
         """
-        emas = EMA().calc_ema(closePrices, emaPeriod)
+        latestEMA = EMA.latest_ema(closePrices, emaPeriod)
         atr = ATR().avg_atr(atrPeriod, closePrices, lowPrices, highPrices)
 
-        latestEMA = emas.iloc[-1]
+        return KeltnerChannels.channels(latestEMA, atr, atrMulti)
+
+    @staticmethod
+    def channels(ema: float, atr: float, atrMulti: float) -> namedtuple:
+        """Builds the Keltner Channels from the EMA and ATR.
+
+        Args:
+            ema - (float) Latest EMA.
+            atr - (float) Latest ATR.
+            atrMulti - (float) Multiplier for the ATR value.
+
+        Returns:
+            namedtuple - Returns the lower amd middle bands and middle line.
+        """
         return namedtuple(
             'KeltnerChannels',
             ['middleLine', 'upperBand', 'lowerBand']
-        )(latestEMA, latestEMA + atrMulti*atr, latestEMA - atrMulti * atr)
+        )(ema, ema + atrMulti*atr, ema - atrMulti * atr)
 
 
 if __name__ == '__main__':
@@ -117,7 +178,8 @@ if __name__ == '__main__':
         "atr_multi": 2
     }
 
-    kc = KeltnerChannels().apply_indicator(
+    keltnerChannels = KeltnerChannels()
+    keltnerChannels.apply_indicator(
         np.array([100, 200, 300, 400, 500, 600, 700, 800, 900, 10, 11, 12, 13,
                   14, 15, 16]),
         config,
@@ -126,4 +188,4 @@ if __name__ == '__main__':
         np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]),
     )
 
-    print(kc)
+    print(dict(zip(keltnerChannels.columns, keltnerChannels.results.tolist())))
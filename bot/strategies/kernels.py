@@ -0,0 +1,217 @@
+"""Kernels for the recursive parts of the indicators.
+
+Wilder's smoothing, the EMA recursion and the Stochastic RSI smoothing cannot
+be vectorised efficiently with NumPy. When Numba is installed, these are
+compiled, otherwise pandas/NumPy implementations are used. The backend can be
+switched at runtime with `set_backend`.
+
+Every kernel takes a 2-D array where each row is a separate series, 1-D
+arrays are treated as a single row.
+"""
+
+from typing import Tuple
+import numpy as np
+import pandas as pd
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('numba', 'numpy')
+
+_backend = 'numba' if numba is not None else 'numpy'
+
+
+def set_backend(backend: str) -> None:
+    """Selects the backend used by the kernels.
+
+    Args:
+        backend - (str) `numba` or `numpy`.
+    """
+    global _backend
+
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown backend {backend}. Use one of {BACKENDS}.')
+    if backend == 'numba' and numba is None:
+        raise ImportError('Numba must be installed to use the numba backend.')
+
+    _backend = backend
+
+
+def get_backend() -> str:
+    """Returns the backend used by the kernels."""
+    return _backend
+
+
+def _as_rows(values: np.array) -> np.array:
+    """Returns `values` as a 2-D float array of rows."""
+    values = np.asarray(values, dtype=float)
+    return values.reshape(1, -1) if values.ndim == 1 else values
+
+
+def _shape_like(result: np.array, values: np.array) -> np.array:
+    """Returns `result` with a single row flattened if `values` was 1-D."""
+    return result[0] if np.ndim(values) == 1 else result
+
+
+# Pure Python versions of the kernels. These are what Numba compiles, they
+# are too slow to be used without it.
+
+def _ewm_loop(values, alpha):
+    # Follows `pd.DataFrame.ewm(alpha=alpha, adjust=False).mean()`, including
+    # its handling of NaNs: they are skipped, decaying the weight of the
+    # previous average, and a series that starts with NaNs starts from its
+    # first value.
+    rows, cols = values.shape
+    averages = np.empty((rows, cols))
+    for row in range(rows):
+        if cols == 0:
+            continue
+        average = values[row, 0]
+        oldWeight = 1.0
+        averages[row, 0] = average
+        for col in range(1, cols):
+            value = values[row, col]
+            if not np.isnan(average):
+                oldWeight *= 1 - alpha
+                if not np.isnan(value):
+                    if average != value:
+                        average = ((oldWeight * average + alpha * value)
+                                   / (oldWeight + alpha))
+                    oldWeight = 1.0
+            elif not np.isnan(value):
+                average = value
+            averages[row, col] = average
+    return averages
+
+
+def _rolling_mean_loop(values, window):
+    rows, cols = values.shape
+    means = np.full((rows, cols), np.nan)
+    for row in range(rows):
+        for col in range(window - 1, cols):
+            total = 0.0
+            for offset in range(window):
+                total += values[row, col - offset]
+            means[row, col] = total / window
+    return means
+
+
+def _stochrsi_loop(rsis, period, smoothK, smoothD):
+    rows, cols = rsis.shape
+    stochrsis = np.full((rows, cols), np.nan)
+    for row in range(rows):
+        for col in range(period - 1, cols):
+            lowest = np.inf
+            highest = -np.inf
+            hasNaN = False
+            for offset in range(period):
+                value = rsis[row, col - offset]
+                if np.isnan(value):
+                    hasNaN = True
+                    break
+                lowest = min(lowest, value)
+                highest = max(highest, value)
+            if not hasNaN and highest > lowest:
+                stochrsis[row, col] = ((rsis[row, col] - lowest)
+                                       / (highest - lowest) * 100)
+    stochrsiKs = _rolling_mean(stochrsis, smoothK)
+    return stochrsis, stochrsiKs, _rolling_mean(stochrsiKs, smoothD)
+
+
+if numba is not None:
+    _rolling_mean = numba.njit(cache=True)(_rolling_mean_loop)
+    _ewm_numba = numba.njit(cache=True)(_ewm_loop)
+    _stochrsi_numba = numba.njit(cache=True)(_stochrsi_loop)
+
+
+def _ewm(values: np.array, alpha: float) -> np.array:
+    """Exponentially weighted mean of each row, seeded with its first value.
+    """
+    if _backend == 'numba':
+        return _ewm_numba(values, alpha)
+
+    return pd.DataFrame(values.T).ewm(
+        alpha=alpha,
+        adjust=False
+    ).mean().to_numpy().T
+
+
+def _seeded(rows: np.array, period: int) -> np.array:
+    """Replaces the first `period` values of each row with their mean."""
+    return np.concatenate(
+        (rows[:, :period].mean(axis=1, keepdims=True), rows[:, period:]),
+        axis=1
+    )
+
+
+def wilder_average(values: np.array, period: int) -> np.array:
+    """Applies Wilder's smoothing to each row. The first average is the mean
+    of the first `period` values.
+
+    Args:
+        values - (np.array) Values to average.
+        period - (int) Period.
+
+    Returns:
+        np.array - Averages from the `period`th value onwards.
+    """
+    rows = _as_rows(values)
+    averages = _ewm(_seeded(rows, period), 1 / period)
+    return _shape_like(averages, values)
+
+
+def ema_series(values: np.array, period: int) -> np.array:
+    """Calculates the EMA of each row, using the SMA of the first `period`
+    values as the first EMA, as `EMA.calc_ema` does.
+
+    Args:
+        values - (np.array) Closing prices.
+        period - (int) Period.
+
+    Returns:
+        np.array - EMAs, NaN for the first `period - 1` values.
+    """
+    rows = _as_rows(values)
+
+    emas = np.full(rows.shape, np.nan)
+    if rows.shape[1] >= period:
+        emas[:, period - 1:] = _ewm(_seeded(rows, period), 2 / (period + 1))
+
+    return _shape_like(emas, values)
+
+
+def stochrsi_smoothing(
+    rsis: np.array,
+    period: int,
+    smoothK: int,
+    smoothD: int
+) -> Tuple[np.array, np.array, np.array]:
+    """Calculates the Stochastic RSI of each row of RSI values along with the
+    smoothK and smoothD means. Windows containing NaNs produce NaN, as
+    `pd.Series.rolling` does.
+
+    Args:
+        rsis - (np.array) RSI values.
+        period - (int) Period.
+        smoothK - (int) - Number of stochastic RSI values to average.
+        smoothD - (int) - Number of smoothK values to average.
+
+    Returns:
+        tuple - Stochastic RSI, smoothK and smoothD arrays.
+    """
+    rows = _as_rows(rsis)
+
+    if _backend == 'numba':
+        results = _stochrsi_numba(rows, period, smoothK, smoothD)
+    else:
+        frame = pd.DataFrame(rows.T)
+        lowest = frame.rolling(period).min()
+        stochrsis = (frame - lowest) / (frame.rolling(period).max()
+                                        - lowest) * 100
+        stochrsiKs = stochrsis.rolling(smoothK).mean()
+        stochrsiDs = stochrsiKs.rolling(smoothD).mean()
+        results = tuple(frame.to_numpy().T for frame
+                        in (stochrsis, stochrsiKs, stochrsiDs))
+
+    return tuple(_shape_like(result, rsis) for result in results)
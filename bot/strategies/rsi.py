@@ -1,31 +1,48 @@
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 import numpy as np
 from .strategy_base import Strategy
+from . import kernels
+
+if TYPE_CHECKING:
+    from .indicators import IndicatorRegistry
 
 
 class RSI(Strategy):
     """Applies the RSI strategy onto a collection of closing prices."""
 
+    columns = ('RSI Value', 'RSI Decision')
+
+    @staticmethod
+    def indicators(config: dict) -> List[Tuple]:
+        return [('rsi', config['period'])]
+
+    @staticmethod
+    def lookback(config: dict) -> int:
+        return config['period'] + 1
+
     def apply_indicator(
         self,
         npCloses: np.array,
         config: dict,
-        coinsOwned: bool
-    ) -> dict:
+        coinsOwned: bool,
+        indicators: Optional['IndicatorRegistry'] = None
+    ) -> int:
 
         # Parse the config and extract information that will be needed.
         period = config['period']
         overboughtLimit = config['overbought_limit']
         oversoldLimit = config['oversold_limit']
 
-        # Edgecase
-        if len(npCloses) <= period:
-            return {
-                'results': {'RSI Value': '', 'RSI Decision': 0},
-                'decision': 0
-            }
+        if indicators is not None:
+            rsiValue = indicators[('rsi', period)].value
+        elif len(npCloses) > period:
+            rsiValue = self.calc_rsi(npCloses, period)
+        else:
+            rsiValue = None
 
-        rsiValue = self.calc_rsi(npCloses, period)
+        # Edgecase
+        if rsiValue is None:
+            return self._no_decision()
 
         self.log(f'RSI: {rsiValue}')
 
@@ -38,10 +55,72 @@ class RSI(Strategy):
         else:
             decision = 0
 
-        return {
-            'results': {'RSI Value': rsiValue, 'RSI Decision': decision},
-            'decision': decision
-        }
+        results = self.results
+        results[0] = rsiValue
+        results[1] = decision
+        return decision
+
+    def apply_series(
+        self,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array,
+        config: dict
+    ) -> dict:
+        rsis = self.rsi_series(closePrices, config['period'])
+
+        with np.errstate(invalid='ignore'):
+            decisions = self._threshold_decisions(
+                rsis,
+                rsis <= config['oversold_limit'],
+                rsis >= config['overbought_limit']
+            )
+
+        return {'results': {'RSI Value': rsis}, 'decisions': decisions}
+
+    @staticmethod
+    def rsi_series(npCloses: np.array, period: int) -> np.array:
+        """Calculates the RSI for every candle using Wilder's smoothing, as
+        `StreamingRSI` does.
+
+        Args:
+            npCloses - (np.array) Collection of closing prices.
+            period - (int) Period.
+
+        Returns:
+            np.array - RSI for each candle. The first `period` candles are
+                NaN.
+        """
+        npCloses = np.asarray(npCloses, dtype=float)
+        rsis = np.full(len(npCloses), np.nan)
+        if len(npCloses) < period + 1:
+            return rsis
+
+        deltas = np.diff(npCloses)
+        avgGains, avgLosses = RSI.wilder_average(
+            np.vstack((np.where(deltas > 0, deltas, 0.0),
+                       np.where(deltas < 0, -deltas, 0.0))),
+            period
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsis[period:] = 100 - (100 / (avgGains / avgLosses + 1))
+
+        return rsis
+
+    @staticmethod
+    def wilder_average(values: np.array, period: int) -> np.array:
+        """Applies Wilder's smoothing to a series, or to each row of a 2-D
+        array. The first average is the mean of the first `period` values.
+
+        Args:
+            values - (np.array) Values to average.
+            period - (int) Period.
+
+        Returns:
+            np.array - Averages from the `period`th value onwards.
+        """
+        return kernels.wilder_average(values, period)
 
     @staticmethod
     def calc_rsi(npCloses: np.array, period: int) -> float:
@@ -51,7 +130,7 @@ class RSI(Strategy):
         avgLosses = []
         relativeStrength = []
         relativeStrengthIndex = []
-        
+
         # Edgecase
         if len(npCloses) < period + 1:
             raise Exception("Period too small")
@@ -84,5 +163,115 @@ class RSI(Strategy):
         return relativeStrengthIndex[-1]
 
 
+class StreamingRSI:
+    """Keeps Wilder's average gain/loss so that the RSI can be updated in
+    constant time each time a candle closes.
+
+    The first `period` price changes are averaged (as `RSI.calc_rsi` does).
+    Every change after that is folded into the averages using Wilder's
+    smoothing, so immediately after seeding on `period + 1` closes, `value`
+    is equal to `RSI.calc_rsi` for the same closes.
+    """
+
+    def __init__(self, period: int) -> None:
+        """Sets up an empty RSI engine.
+
+        Args:
+            period - (int) RSI period.
+        """
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the state of the engine."""
+        self._prevClose = None
+        self._changes = 0
+        self._gainSum = 0.0
+        self._lossSum = 0.0
+        self.avgGain = None
+        self.avgLoss = None
+        self.value = None
+
+    @property
+    def ready(self) -> bool:
+        """Has enough data been provided to produce an RSI value?"""
+        return self.avgGain is not None
+
+    def seed(self, npCloses: Iterable[float]) -> Optional[float]:
+        """Resets the engine and loads a collection of historical closing
+        prices.
+
+        Args:
+            npCloses - (np.array) Collection of closing prices.
+
+        Returns:
+            float|None - Latest RSI value or `None` if there are not enough
+                closing prices to produce one.
+        """
+        self.reset()
+        npCloses = np.asarray(npCloses, dtype=float)
+        if len(npCloses) < self.period + 1:
+            for close in npCloses:
+                self.update(close)
+            return self.value
+
+        # The first `period` changes are averaged and the remaining changes
+        # are carried forward by the smoothing kernel, the gains and losses
+        # being smoothed together as two rows.
+        deltas = np.diff(npCloses)
+        self._changes = len(deltas)
+        self.avgGain, self.avgLoss = kernels.wilder_average(
+            np.vstack((np.where(deltas > 0, deltas, 0.0),
+                       np.where(deltas < 0, -deltas, 0.0))),
+            self.period
+        )[:, -1].tolist()
+        self._prevClose = float(npCloses[-1])
+        self.value = self._calc_value()
+
+        return self.value
+
+    def update(self, close: float) -> Optional[float]:
+        """Adds the latest closing price to the RSI.
+
+        Args:
+            close - (float) Latest closing price.
+
+        Returns:
+            float|None - Latest RSI value or `None` if there are not enough
+                closing prices to produce one.
+        """
+        close = float(close)
+        if self._prevClose is None:
+            self._prevClose = close
+            return None
+
+        delta = close - self._prevClose
+        self._prevClose = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.avgGain is None:
+            self._gainSum += gain
+            self._lossSum += loss
+            self._changes += 1
+            if self._changes < self.period:
+                return None
+
+            self.avgGain = self._gainSum / self.period
+            self.avgLoss = self._lossSum / self.period
+
+        else:
+            self.avgGain = (self.avgGain * (self.period - 1) + gain) \
+                / self.period
+            self.avgLoss = (self.avgLoss * (self.period - 1) + loss) \
+                / self.period
+
+        self.value = self._calc_value()
+        return self.value
 
- 
\ No newline at end of file
+    def _calc_value(self) -> float:
+        """Calculates the RSI value from the average gain/loss."""
+        if not self.avgLoss:
+            # Mirrors the behaviour of dividing by zero with numpy floats.
+            return 100.0 if self.avgGain else float('nan')
+        return 100 - (100 / (self.avgGain / self.avgLoss + 1))
@@ -1,23 +1,43 @@
 """Applies the Stochastic RSI strategy on a collection of closing prices."""
 
-from collections import namedtuple
+from collections import deque, namedtuple
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+import math
 import numpy as np
 import pandas as pd
 try:
     from .strategy_base import Strategy
+    from .rsi import RSI, StreamingRSI
+    from . import kernels
 except ImportError:
     from strategy_base import Strategy
+    from rsi import RSI, StreamingRSI
+    import kernels
+
+if TYPE_CHECKING:
+    from .indicators import IndicatorRegistry
 
 
 class StochRSI(Strategy):
     """Applies Stochastic RSI on a collection of closing prices."""
 
+    columns = ('RSI Value', 'RSI Decision')
+
+    @staticmethod
+    def indicators(config: dict) -> List[Tuple]:
+        return [('stochrsi', config['period'], 3, 3)]
+
+    @staticmethod
+    def lookback(config: dict) -> int:
+        return config['period'] * 2
+
     def apply_indicator(
         self,
         closePrices: np.array,
         config: dict,
-        coinsOwned: bool
-    ) -> dict:
+        coinsOwned: bool,
+        indicators: Optional['IndicatorRegistry'] = None
+    ) -> int:
         """Calculates the Stochastic RSI and makes a decision on whether to
         buy/sell.
 
@@ -25,10 +45,10 @@ class StochRSI(Strategy):
             closePrices - (np.array) Collection of closing prices.
             config - (dict) Configurations.
             coinsOwned - (bool) Is the coin currently owned?
+            indicators - (IndicatorRegistry) Pre-calculated indicators.
 
         Returns:
-            dict - Returns a `results` key containing printable results and a
-                `decision` key which decides whether or not to buy/sell.
+            int - Decision on whether or not to buy/sell.
         """
 
         # Parse the config and extract information that will be needed.
@@ -39,15 +59,16 @@ class StochRSI(Strategy):
         # Edgecase to prevent inaccuracy of results and preventing the usage
         # of Simple Moving Average over Exponential Moving Average.
         if len(closePrices) < period*2:
-            return {
-                'results': {'RSI Value': '', 'RSI Decision': 0},
-                'decision': 0
-            }
+            stochRSIValue = float('nan')
+        elif indicators is not None:
+            stochRSIValue = indicators[('stochrsi', period, 3, 3)].value
+        else:
+            stochRSIValue = StreamingStochRSI(
+                period, smoothK=3, smoothD=3).seed(closePrices[-period*2:])
 
-        closePrices = closePrices[-period*2:]
+        if math.isnan(stochRSIValue):
+            return self._no_decision()
 
-        stochRSIValue = self.calc_rsi(
-            closePrices, period, smoothK=3, smoothD=3).stochrsi.iloc[-1]
         self.log(f'RSI: {stochRSIValue}')
 
         if stochRSIValue >= overboughtLimit and coinsOwned:
@@ -59,10 +80,59 @@ class StochRSI(Strategy):
         else:
             decision = 0
 
-        return {
-            'results': {'RSI Value': stochRSIValue, 'RSI Decision': decision},
-            'decision': decision
-        }
+        results = self.results
+        results[0] = stochRSIValue
+        results[1] = decision
+        return decision
+
+    def apply_series(
+        self,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array,
+        config: dict
+    ) -> dict:
+        period = config['period']
+        stochRSIs = self.stochrsi_series(closePrices, period, 3, 3).stochrsi
+
+        with np.errstate(invalid='ignore'):
+            decisions = self._threshold_decisions(
+                stochRSIs,
+                stochRSIs <= config['oversold_limit'],
+                stochRSIs >= config['overbought_limit']
+            )
+
+        return {'results': {'RSI Value': stochRSIs}, 'decisions': decisions}
+
+    @staticmethod
+    def stochrsi_series(
+        closePrices: np.array,
+        period: int,
+        smoothK: int,
+        smoothD: int
+    ) -> namedtuple:
+        """Calculates the Stochastic RSI for every candle, as
+        `StreamingStochRSI` does.
+
+        Args:
+            closePrices - (np.array) Collection of closing prices.
+            period - (int) Period.
+            smoothK - (int) - Number of stochastic RSI values to average.
+            smoothD - (int) - Number of smoothK values to average.
+
+        Returns:
+            namedtuple - Stochastic RSI, smoothK and smoothD arrays, each the
+                length of `closePrices`.
+        """
+        return namedtuple(
+            'stochRSI',
+            ['stochrsi', 'stochrsiK', 'stochrsiD']
+        )(*kernels.stochrsi_smoothing(
+            RSI.rsi_series(closePrices, period),
+            period,
+            smoothK,
+            smoothD
+        ))
 
     @staticmethod
     def calc_rsi(
@@ -119,3 +189,131 @@ class StochRSI(Strategy):
             'stochRSI',
             ['stochrsi', 'stochrsiK', 'stochrsiD']
         )(stochrsi, stochrsiK, stochrsiD)
+
+
+class StreamingStochRSI:
+    """Maintains the Stochastic RSI so that it can be updated in constant
+    (amortised) time each time a candle closes.
+
+    The RSI is kept by a `StreamingRSI`, the rolling minimum and maximum of
+    the RSI are kept using monotonic deques and the smoothK/smoothD means are
+    kept in small ring buffers. Fed the same closing prices, `stochrsi`,
+    `stochrsiK` and `stochrsiD` match the last values of
+    `StochRSI.calc_rsi`.
+    """
+
+    def __init__(self, period: int, smoothK: int = 3, smoothD: int = 3):
+        """Sets up an empty Stochastic RSI.
+
+        Args:
+            period - (int) Period.
+            smoothK - (int) - Number of stochastic RSI values to average.
+            smoothD - (int) - Number of smoothK values to average.
+        """
+        self.period = period
+        self.smoothK = smoothK
+        self.smoothD = smoothD
+        self.rsi = StreamingRSI(period)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the state of the Stochastic RSI."""
+        self.rsi.reset()
+
+        # Each deque holds `(index, rsi)` pairs, `_mins` with increasing RSI
+        # values and `_maxs` with decreasing RSI values.
+        self._idx = -1
+        self._lastNaN = -self.period
+        self._mins = deque()
+        self._maxs = deque()
+        self._stochs = deque(maxlen=self.smoothK)
+        self._ks = deque(maxlen=self.smoothD)
+
+        self.stochrsi = float('nan')
+        self.stochrsiK = float('nan')
+        self.stochrsiD = float('nan')
+
+    @property
+    def value(self) -> float:
+        """Latest Stochastic RSI value."""
+        return self.stochrsi
+
+    def seed(self, closePrices: Iterable[float]) -> float:
+        """Resets the Stochastic RSI and loads historical closing prices.
+
+        Args:
+            closePrices - (np.array) Collection of closing prices.
+
+        Returns:
+            float - Latest Stochastic RSI value.
+        """
+        self.reset()
+        for close in closePrices:
+            self.update(close)
+        return self.stochrsi
+
+    def update(self, close: float) -> float:
+        """Adds the latest closing price to the Stochastic RSI.
+
+        Args:
+            close - (float) Latest closing price.
+
+        Returns:
+            float - Latest Stochastic RSI value.
+        """
+        rsiValue = self.rsi.update(close)
+        if rsiValue is None:
+            return self.stochrsi
+        return self.push_rsi(rsiValue)
+
+    def push_rsi(self, rsiValue: float) -> float:
+        """Adds the latest RSI value to the Stochastic RSI. Used directly when
+        the RSI is maintained elsewhere.
+
+        Args:
+            rsiValue - (float) Latest RSI value.
+
+        Returns:
+            float - Latest Stochastic RSI value.
+        """
+        self._idx += 1
+        expired = self._idx - self.period
+
+        if math.isnan(rsiValue):
+            self._lastNaN = self._idx
+        else:
+            while self._mins and self._mins[-1][1] >= rsiValue:
+                self._mins.pop()
+            self._mins.append((self._idx, rsiValue))
+            while self._maxs and self._maxs[-1][1] <= rsiValue:
+                self._maxs.pop()
+            self._maxs.append((self._idx, rsiValue))
+
+        while self._mins and self._mins[0][0] <= expired:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0][0] <= expired:
+            self._maxs.popleft()
+
+        # Like `pd.Series.rolling`, a full window without NaNs is required.
+        if self._idx < self.period - 1 or self._lastNaN > expired:
+            stochrsi = float('nan')
+        else:
+            lowest = self._mins[0][1]
+            spread = self._maxs[0][1] - lowest
+            stochrsi = ((rsiValue - lowest) / spread * 100 if spread
+                        else float('nan'))
+
+        self.stochrsi = stochrsi
+        self._stochs.append(stochrsi)
+        self.stochrsiK = self._mean(self._stochs, self.smoothK)
+        self._ks.append(self.stochrsiK)
+        self.stochrsiD = self._mean(self._ks, self.smoothD)
+
+        return self.stochrsi
+
+    @staticmethod
+    def _mean(values: deque, size: int) -> float:
+        """Mean of a ring buffer, NaN until the buffer is full."""
+        if len(values) < size:
+            return float('nan')
+        return sum(values) / size
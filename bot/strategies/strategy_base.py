@@ -1,21 +1,38 @@
 """Interface declares operations common to all strategies."""
 
-from typing import Optional, Callable, Union
+from typing import TYPE_CHECKING, List, Optional, Callable, Tuple, Union
 from abc import ABC, abstractmethod
 import numpy as np
 
+if TYPE_CHECKING:
+    from .indicators import IndicatorRegistry
+
 
 class Strategy(ABC):
     """Interface declares operations common to all strategies."""
 
-    def __init__(self, logFn: Optional[Callable] = None):
+    # Names of the values written to `results` by `apply_indicator`. The
+    # decision is always the last column.
+    columns: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        logFn: Optional[Callable] = None,
+        results: Optional[np.array] = None
+    ):
         """Sets up the log function, otherwise falls back to the default
         logging behaviour - to print to stdout.
 
         Args:
             logFn - (Callable) Logging function.
+            results - (np.array) float64 buffer of `len(columns)` that
+                `apply_indicator` writes its results to, i.e: a view of a
+                larger row shared by several strategies. A new buffer is
+                created if one is not provided.
         """
         self._log = self._set_log(logFn)
+        self.results = (np.full(len(self.columns), np.nan) if results is None
+                        else results)
 
     def log(self, msg: str) -> None:
         """Logs a message.
@@ -39,22 +56,113 @@ class Strategy(ABC):
         else:
             return logFn
 
+    @staticmethod
+    def indicators(config: dict) -> List[Tuple]:
+        """Indicators the strategy would like calculated for it by an
+        `IndicatorRegistry`.
+
+        Args:
+            config: - (dict) Configurations for the strategy.
+
+        Returns:
+            tuple[] - Indicator keys, i.e: `('ema', 20)`.
+        """
+        return []
+
+    @staticmethod
+    def lookback(config: dict) -> int:
+        """Number of candles the strategy needs before it can make a
+        decision.
+
+        Args:
+            config: - (dict) Configurations for the strategy.
+
+        Returns:
+            int - Number of candles.
+        """
+        return 0
+
     @abstractmethod
     def apply_indicator(
         self,
         closePrices: np.array,
         config: dict,
         coinsOwned: bool,
-    ) -> dict:
+        indicators: Optional['IndicatorRegistry'] = None
+    ) -> int:
         """Abstract method where the indicator/strategy would be implemented.
 
         Args:
             closePrices - (np.array) Collection of closing prices.
             config: - (dict) Configurations for the strategy.
             coinsOwned - (bool) Is the coined/currency owned?
+            indicators - (IndicatorRegistry) Indicators declared by
+                `indicators` which have already been calculated for the
+                latest candle. When not provided, the strategy calculates
+                them from `closePrices`.
+
+        Returns:
+            int - Decision, 1 = buy, 0 = do nothing, -1 = sell. The results
+                are written to `results` in the order of `columns`.
+        """
+
+    def _no_decision(self) -> int:
+        """Blanks the results when there is not enough data to make a
+        decision.
+
+        Returns:
+            int - Decision to do nothing.
+        """
+        self.results.fill(np.nan)
+        self.results[-1] = 0
+        return 0
+
+    @abstractmethod
+    def apply_series(
+        self,
+        closePrices: np.array,
+        lowPrices: np.array,
+        highPrices: np.array,
+        config: dict
+    ) -> dict:
+        """Abstract method where the indicator/strategy would be applied to a
+        whole series of candles at once, i.e: for backtesting.
+
+        The indicators follow the streaming indicators used by
+        `apply_indicator` when it is given an `IndicatorRegistry`.
+
+        Args:
+            closePrices - (np.array) Collection of closing prices.
+            lowPrices - (np.array) Collection of low prices.
+            highPrices - (np.array) Collection of high prices.
+            config: - (dict) Configurations for the strategy.
+
+        Returns:
+            A dictionary containing a `results` and `decisions` key.
+            `results` - (dict) Key = result name, value = result for each
+                candle.
+            `decisions` - (np.array) 2 x len(closePrices) array of decisions
+                for each candle. Row 0 is used when coins are not owned and
+                row 1 when coins are owned.
+        """
+
+    @staticmethod
+    def _threshold_decisions(
+        values: np.array,
+        buyMask: np.array,
+        sellMask: np.array
+    ) -> np.array:
+        """Builds the decisions array used by `apply_series`.
+
+        Args:
+            values - (np.array) Indicator values, only used for its length.
+            buyMask - (np.array) Candles to buy on when coins are not owned.
+            sellMask - (np.array) Candles to sell on when coins are owned.
 
         Returns:
-            A dictionary containing a `results` and `decision` key.
-            `results` - (dict) Key = result name, value = result value.
-            `decision` - 1 = buy, 0 = do nothing, 0 = sell.
+            np.array - 2 x len(values) array of decisions.
         """
+        decisions = np.zeros((2, len(values)), dtype=np.int8)
+        decisions[0, buyMask] = 1
+        decisions[1, sellMask] = -1
+        return decisions
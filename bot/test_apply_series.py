@@ -0,0 +1,79 @@
+"""Unittests checking `Strategy.apply_series` against the decisions made
+candle by candle from the indicator registry.
+"""
+
+import json
+import os
+import unittest
+import numpy as np
+from strategies import (RSI, Bollinger, KeltnerChannels, StochRSI, EMABuy100,
+                        EMABuy50And100, IndicatorRegistry)
+from test_indicators import CLOSES, LOWS, HIGHS
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(BOT_DIR, 'config.json')) as configFile:
+    CONFIG = json.load(configFile)
+
+
+class TestApplySeries(unittest.TestCase):
+    """Each strategy's `apply_series` makes, for every candle and whether or
+    not coins are owned, the decision `apply_indicator` makes on that candle.
+    """
+
+    def check(self, strat: type):
+        config = CONFIG['strategies'][strat.__name__.lower()]
+        series = strat(None).apply_series(CLOSES, LOWS, HIGHS, config)
+        decisions = series['decisions']
+        self.assertEqual(decisions.shape, (2, len(CLOSES)))
+
+        registry = IndicatorRegistry()
+        registry.require_all(strat.indicators(config))
+        strategy = strat(None)
+        additionalArgs = 'additional_args' in config
+
+        decided = set()
+        for idx in range(len(CLOSES)):
+            registry.update(CLOSES[idx], LOWS[idx], HIGHS[idx])
+            end = idx + 1
+            args = [LOWS[:end], HIGHS[:end]] if additionalArgs else []
+
+            for owned in (False, True):
+                decision = strategy.apply_indicator(
+                    CLOSES[:end], config, owned, *args, indicators=registry
+                )
+                msg = f'{strat.__name__} candle {idx} owned {owned}'
+                self.assertEqual(decisions[int(owned), idx], decision,
+                                 msg=msg)
+                decided.add(decision)
+
+                # The values behind a decision are those of the series.
+                for column, value in zip(strat.columns, strategy.results):
+                    if column in series['results'] and not np.isnan(value):
+                        self.assertAlmostEqual(
+                            series['results'][column][idx], value, msg=msg
+                        )
+
+        self.assertEqual(decided, {-1, 0, 1})
+
+    def test_rsi(self):
+        self.check(RSI)
+
+    def test_bollinger(self):
+        self.check(Bollinger)
+
+    def test_keltner_channels(self):
+        self.check(KeltnerChannels)
+
+    def test_stochrsi(self):
+        self.check(StochRSI)
+
+    def test_ema_buy_100(self):
+        self.check(EMABuy100)
+
+    def test_ema_buy_50_100(self):
+        self.check(EMABuy50And100)
+
+
+if __name__ == '__main__':
+    unittest.main()
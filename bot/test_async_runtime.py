@@ -0,0 +1,94 @@
+"""Unittests for the `AsyncRuntime` class."""
+
+import asyncio
+import threading
+import unittest
+from async_runtime import AsyncRuntime
+from warmup import HISTORY_WEIGHT
+
+CONFIG = {'defaults': {'interval': '1m'}}
+
+
+class FakeTrader:
+    """Records the calls made by the runtime."""
+
+    def __init__(self, historyLoaded: bool):
+        self.historyLoaded = historyLoaded
+        self.candles = []
+        self.threads = set()
+        self.opened = False
+
+    def on_candle(self, candle):
+        self.candles.append(candle)
+        self.threads.add(threading.get_ident())
+
+    def on_open(self, ws):
+        self.opened = True
+
+    def log_error(self, msg):
+        raise AssertionError(msg)
+
+
+class RecordingBatch:
+    """Trades the candles of each batch one by one."""
+
+    def on_candles(self, candles):
+        for trader, candle in candles:
+            trader.on_candle(candle)
+
+
+class RecordingBudget:
+    """Budget that records the weight acquired without waiting."""
+
+    def __init__(self):
+        self.acquired = []
+
+    def acquire(self, weight):
+        self.acquired.append(weight)
+
+
+class TestAsyncRuntime(unittest.TestCase):
+    """Unittests for the `AsyncRuntime` class."""
+
+    def test_candles_traded_off_the_loop_in_order(self):
+        """Candles are traded in the order received, off the loop thread."""
+        trader = FakeTrader(True)
+        runtime = AsyncRuntime(CONFIG, {'ETHGBP': trader}, 1200)
+        runtime._batch = RecordingBatch()
+
+        async def consume():
+            queue = asyncio.Queue()
+            for candle in range(20):
+                queue.put_nowait((trader, candle))
+            consumer = asyncio.ensure_future(runtime._consume(queue))
+            await asyncio.wait_for(queue.join(), 5)
+            consumer.cancel()
+
+        asyncio.run(asyncio.wait_for(consume(), 5))
+        runtime._candleExecutor.shutdown()
+
+        self.assertEqual(trader.candles, list(range(20)))
+        self.assertNotIn(threading.get_ident(), trader.threads)
+
+    def test_warm_up_charged_on_reconnect(self):
+        """Catching up after a reconnect is charged to the budget as well as
+        loading the history.
+        """
+        traders = {'ETHGBP': FakeTrader(False), 'BTCGBP': FakeTrader(True)}
+        runtime = AsyncRuntime(CONFIG, traders, 1200)
+        runtime._budget = RecordingBudget()
+
+        async def warm_up():
+            semaphore = asyncio.Semaphore(2)
+            for trader in traders.values():
+                await runtime._warm_up(trader, semaphore)
+
+        asyncio.run(warm_up())
+        runtime._candleExecutor.shutdown()
+
+        self.assertEqual(runtime._budget.acquired, [HISTORY_WEIGHT] * 2)
+        self.assertTrue(all(trader.opened for trader in traders.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Unittests for the `Backoff` class and `run_reconnecting`."""
+
+import unittest
+from unittest import mock
+import backoff
+from backoff import Backoff, run_reconnecting
+
+
+class FakeApp:
+    """Stands in for a `websocket.WebSocketApp`, ending as scripted."""
+
+    def __init__(self, onError, outcome):
+        self._onError = onError
+        self._outcome = outcome
+
+    def run_forever(self):
+        if self._outcome == 'interrupt':
+            # As websocket-client reports an interrupt it caught.
+            self._onError(self, KeyboardInterrupt())
+            return True
+        return self._outcome == 'error'
+
+
+class TestBackoff(unittest.TestCase):
+    """Unittests for the `Backoff` class."""
+
+    def test_delays(self):
+        """The delay doubles up to the maximum and resets."""
+        delays = Backoff(1, 5)
+        self.assertEqual([delays.next_delay() for _ in range(5)],
+                         [1, 2, 4, 5, 5])
+        delays.reset()
+        self.assertEqual(delays.next_delay(), 1)
+
+
+class TestRunReconnecting(unittest.TestCase):
+    """Unittests for `run_reconnecting`."""
+
+    def run_outcomes(self, outcomes):
+        outcomes = iter(outcomes)
+        with mock.patch.object(backoff.time, 'sleep') as sleep, \
+                mock.patch('builtins.print'):
+            run_reconnecting(
+                lambda onError: FakeApp(onError, next(outcomes)),
+                Backoff(1, 60),
+                'ETHGBP'
+            )
+        return [call.args[0] for call in sleep.call_args_list]
+
+    def test_interrupt(self):
+        """An interrupt caught by the connection ends the loop."""
+        self.assertEqual(self.run_outcomes(['interrupt']), [])
+
+    def test_errors_backed_off(self):
+        """Only connections torn down by errors are backed off."""
+        self.assertEqual(
+            self.run_outcomes(['error', 'error', 'closed', 'interrupt']),
+            [1, 2]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
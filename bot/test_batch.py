@@ -0,0 +1,137 @@
+"""Unittests for the `BatchEvaluator` class."""
+
+import json
+import os
+import unittest
+import numpy as np
+from strategies import (RSI, Bollinger, KeltnerChannels, StochRSI, EMABuy100,
+                        EMABuy50And100, BatchEvaluator, IndicatorRegistry)
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CLOSES = np.genfromtxt(os.path.join(
+    BOT_DIR,
+    'strategies',
+    'test_data',
+    'closing_prices.csv'
+))
+
+with open(os.path.join(BOT_DIR, 'config.json')) as configFile:
+    CONFIG = json.load(configFile)
+
+STRATEGY_SETS = (
+    (RSI, Bollinger),
+    (KeltnerChannels, StochRSI),
+    (EMABuy100,),
+    (EMABuy50And100,),
+)
+
+# Number of candles loaded before the candles are streamed, fewer than
+# every strategy needs to make a decision.
+SEED_SIZE = 10
+
+
+def symbols():
+    """Builds the closing, low and high prices of a few symbols."""
+    rng = np.random.default_rng(0)
+    prices = []
+    for offset, scale in ((0, 1), (50, 3.5), (120, 0.02), (200, 1)):
+        closes = CLOSES[offset:offset + 300] * scale
+        spread = closes * rng.uniform(0, 0.01, len(closes))
+        prices.append((closes, closes - spread, closes + spread))
+    return prices
+
+
+class TestBatchEvaluator(unittest.TestCase):
+    """Checks the batch decisions against each trader's own decisions."""
+
+    def check(self, strategies):
+        """Streams the candles of every symbol through their registries and
+        compares the batch results against `apply_indicator` and the
+        decisions against `apply_series`.
+        """
+        prices = symbols()
+        evaluator = BatchEvaluator(strategies, CONFIG)
+        configs = [CONFIG['strategies'][strat.__name__.lower()]
+                   for strat in strategies]
+
+        registries = []
+        for closes, lows, highs in prices:
+            registry = IndicatorRegistry()
+            for strat, config in zip(strategies, configs):
+                registry.require_all(strat.indicators(config))
+            registry.seed(closes[:SEED_SIZE], lows[:SEED_SIZE],
+                          highs[:SEED_SIZE])
+            registries.append(registry)
+
+        row = np.full(len(evaluator.columns), np.nan)
+        instances = []
+        start = 0
+        for strat in strategies:
+            end = start + len(strat.columns)
+            instances.append(strat(None, row[start:end]))
+            start = end
+
+        series = [
+            [strategy.apply_series(closes, lows, highs, config)['decisions']
+             for strategy, config in zip(instances, configs)]
+            for closes, lows, highs in prices
+        ]
+
+        rng = np.random.default_rng(1)
+        decided = set()
+        for idx in range(SEED_SIZE, len(prices[0][0])):
+            for registry, (closes, lows, highs) in zip(registries, prices):
+                registry.update(closes[idx], lows[idx], highs[idx])
+
+            coinsOwned = rng.random(len(prices)) < 0.5
+            decisions, results = evaluator.evaluate(
+                np.array([closes[idx] for closes, _, _ in prices]),
+                np.full(len(prices), idx + 1),
+                registries,
+                coinsOwned
+            )
+
+            for sym, (closes, lows, highs) in enumerate(prices):
+                owned = bool(coinsOwned[sym])
+                expected = [
+                    strategy.apply_indicator(
+                        closes[:idx + 1],
+                        config,
+                        owned,
+                        *([lows[:idx + 1], highs[:idx + 1]]
+                          if 'additional_args' in config else []),
+                        indicators=registries[sym]
+                    )
+                    for strategy, config in zip(instances, configs)
+                ]
+                msg = f'{strategies} symbol {sym} candle {idx}'
+
+                self.assertEqual(decisions[sym].tolist(), expected, msg=msg)
+                np.testing.assert_allclose(results[sym], row, err_msg=msg)
+                self.assertEqual(
+                    decisions[sym].tolist(),
+                    [int(strat[int(owned), idx]) for strat in series[sym]],
+                    msg=msg
+                )
+                decided.update(expected)
+
+        # Buys, sells and holds were all compared.
+        return decided
+
+    def test_rsi_bollinger(self):
+        """The RSI and Bollinger strategies match."""
+        self.assertEqual(self.check(STRATEGY_SETS[0]), {-1, 0, 1})
+
+    def test_keltner_stochrsi(self):
+        """The Keltner Channels and Stochastic RSI strategies match."""
+        self.assertEqual(self.check(STRATEGY_SETS[1]), {-1, 0, 1})
+
+    def test_ema_buy(self):
+        """The EMA buy strategies match."""
+        for strategies in STRATEGY_SETS[2:]:
+            self.assertEqual(self.check(strategies), {-1, 0, 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unittests for the `BatchTrader` class."""
+
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+from test_trader import BOT_DIR, history, candle
+
+SYMBOLS = (('ETHGBP', 0), ('BTCGBP', 0), ('LTCGBP', 1), ('XRPGBP', 1))
+
+
+class TestBatchTrader(unittest.TestCase):
+    """Checks that trading candles together makes the decisions each trader
+    makes on its own.
+    """
+
+    def setUp(self):
+        # The traders write their logs and cache relative to the bot
+        # directory.
+        self.cwd = os.getcwd()
+        os.chdir(BOT_DIR)
+
+        from controller import load_config
+        self.config = load_config(SimpleNamespace(
+            buy_mode=None,
+            balance_percent=None,
+            flat_amount=None,
+            test_mode=True,
+            rest_gateway=False
+        ))
+        self.traders = []
+
+    def tearDown(self):
+        for trader in self.traders:
+            trader._orderExecutor.stop(5)
+        os.chdir(self.cwd)
+
+    def trader(self, tradeSymbol: str, seed: int, decisions: list):
+        """Creates a trader recording its decisions and results rather than
+        acting on them.
+        """
+        from trader import Trader
+
+        trader = Trader(self.config, tradeSymbol, seed)
+        trader.log = lambda msg: None
+        trader.save_state_throttled = lambda: None
+        trader._klineCache = mock.Mock()
+        trader.stop_loss = lambda close: None
+        trader.action_decision = (
+            lambda close, decided: decisions.append(
+                (tradeSymbol, [int(decision) for decision in decided])
+            )
+        )
+        trader.update_dataset = (
+            lambda close: decisions.append(trader._resultsRow.tolist())
+        )
+        self.traders.append(trader)
+        return trader
+
+    def test_matches_traders(self):
+        """The decisions and results match those of `Trader.on_candle`."""
+        from batch_trader import BatchTrader
+
+        historicalData = history(300)
+        loaded = history(60)
+
+        batchDecisions, ownDecisions = [], []
+        batchTraders, ownTraders = [], []
+        for tradeSymbol, seed in SYMBOLS:
+            batchTraders.append(self.trader(tradeSymbol, seed,
+                                            batchDecisions))
+            ownTraders.append(self.trader(tradeSymbol, seed, ownDecisions))
+        for trader in self.traders:
+            trader.load_historical_data(loaded)
+
+        batch = BatchTrader(self.config)
+        with mock.patch('builtins.print'):
+            for idx in range(60, 300):
+                # Some traders own coins to exercise the sell decisions.
+                for pos in range(len(SYMBOLS)):
+                    owned = (idx // 7 + pos) % 2 == 0
+                    batchTraders[pos]._ownCoins = owned
+                    ownTraders[pos]._ownCoins = owned
+
+                newCandle = candle(historicalData, idx)
+                batch.on_candles([(trader, newCandle)
+                                  for trader in batchTraders])
+                for trader in ownTraders:
+                    trader.on_candle(newCandle)
+
+        self.assertEqual(len(batchDecisions), 2 * len(SYMBOLS) * 240)
+        np.testing.assert_equal(batchDecisions, ownDecisions)
+
+    def test_many_candles_per_trader(self):
+        """A trader given many candles trades on each of them in turn."""
+        from batch_trader import BatchTrader
+
+        historicalData = history(70)
+        decisions = []
+        trader = self.trader('ETHGBP', 0, decisions)
+        trader.load_historical_data(history(60))
+
+        with mock.patch('builtins.print'):
+            BatchTrader(self.config).on_candles(
+                [(trader, candle(historicalData, idx))
+                 for idx in range(60, 70)]
+            )
+
+        self.assertEqual(len(decisions), 20)
+        self.assertEqual(trader.candles.openTimes[-1],
+                         historicalData.openTimes[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unittests for the `CandleStore` class."""
+
+import unittest
+import numpy as np
+from candle_store import CandleStore
+
+
+def candle(idx: int) -> tuple:
+    """Builds a candle whose fields can be told apart by their value."""
+    return (idx + 0.1, idx + 0.2, idx + 0.3, idx + 0.4, idx + 0.5, idx * 60000)
+
+
+class TestCandleStore(unittest.TestCase):
+    """Unittests for the `CandleStore` class."""
+
+    def test_empty(self):
+        """An empty store returns empty views."""
+        store = CandleStore(5)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(len(store.closes), 0)
+
+    def test_partially_filled(self):
+        """Candles are returned oldest first before the store is full."""
+        store = CandleStore(5)
+        for idx in range(3):
+            store.append(*candle(idx))
+
+        self.assertEqual(len(store), 3)
+        np.testing.assert_array_equal(store.closes, [0.4, 1.4, 2.4])
+        np.testing.assert_array_equal(store.openTimes, [0, 60000, 120000])
+
+    def test_wrap_around(self):
+        """Once full, the oldest candles are dropped and every field keeps
+        the latest candles in order, whichever slot the buffer wrapped at.
+        """
+        capacity = 5
+        store = CandleStore(capacity)
+        for count in range(1, 3 * capacity + 2):
+            store.append(*candle(count - 1))
+
+            latest = np.arange(max(count - capacity, 0), count)
+            self.assertEqual(len(store), min(count, capacity))
+            np.testing.assert_allclose(store.opens, latest + 0.1)
+            np.testing.assert_allclose(store.highs, latest + 0.2)
+            np.testing.assert_allclose(store.lows, latest + 0.3)
+            np.testing.assert_allclose(store.closes, latest + 0.4)
+            np.testing.assert_allclose(store.volumes, latest + 0.5)
+            np.testing.assert_array_equal(store.openTimes, latest * 60000)
+
+    def test_views_are_contiguous_and_not_copied(self):
+        """Fields are contiguous views of the store's buffer."""
+        store = CandleStore(4)
+        for idx in range(7):
+            store.append(*candle(idx))
+
+        closes = store.closes
+        self.assertTrue(closes.flags['C_CONTIGUOUS'])
+        self.assertTrue(np.shares_memory(closes, store._data))
+
+    def test_extend_keeps_latest(self):
+        """Extending with more candles than fit keeps the latest ones."""
+        store = CandleStore(3)
+        candles = np.array([candle(idx) for idx in range(10)]).T
+        store.extend(*candles)
+
+        np.testing.assert_allclose(store.closes, [7.4, 8.4, 9.4])
+
+    def test_clear(self):
+        """Clearing removes every candle."""
+        store = CandleStore(3)
+        store.append(*candle(0))
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+        store.append(*candle(1))
+        np.testing.assert_allclose(store.closes, [1.4])
+
+    def test_external_buffer(self):
+        """Candles are written to a buffer provided by the caller."""
+        buffer = np.zeros((len(CandleStore.FIELDS), 6))
+        store = CandleStore(3, buffer)
+        store.append(*candle(2))
+        self.assertTrue(np.shares_memory(store.closes, buffer))
+        self.assertIn(2.4, buffer[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,7 +15,7 @@ class SignalDispatcherOveride:
         return 100
 
     @staticmethod
-    def apply_filters(_, quantity: float):
+    def apply_filters(_, quantity: float, price: float):
         return round(quantity, 6)
 
     @staticmethod
@@ -0,0 +1,96 @@
+"""Unittests for the exchange information cache and the order filters."""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from exchange_info import ExchangeInfo, SymbolFilters
+from send_order_signal import SendOrderSignal
+
+EXCHANGE_INFO = {
+    'symbols': [{
+        'symbol': 'ETHGBP',
+        'quotePrecision': 8,
+        'baseAssetPrecision': 8,
+        'filters': [
+            {'filterType': 'LOT_SIZE', 'stepSize': '0.001',
+             'minQty': '0.001'},
+            {'filterType': 'MIN_NOTIONAL', 'minNotional': '10.0'},
+        ],
+    }]
+}
+
+
+class TestExchangeInfo(unittest.TestCase):
+    """Unittests for the `ExchangeInfo` class."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'cache', 'exchange_info.json')
+        self.fetches = 0
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def fetch(self):
+        self.fetches += 1
+        return EXCHANGE_INFO
+
+    def cache(self):
+        return ExchangeInfo(self.fetch, 100, self.path)
+
+    def test_load(self):
+        """The exchange information is only requested when the shared file
+        is missing or has expired.
+        """
+        self.cache().load()
+        self.cache().load()
+        self.assertEqual(self.fetches, 1)
+
+        with mock.patch('exchange_info.time.time', return_value=1e12):
+            self.cache().load()
+        self.assertEqual(self.fetches, 2)
+
+    def test_symbol_never_requests(self):
+        """Expired tables are read again from the shared file, keeping the
+        table held until the file is refreshed.
+        """
+        writer = self.cache()
+        writer.load()
+        reader = self.cache()
+        reader.load()
+
+        with mock.patch('exchange_info.time.time', return_value=1e12):
+            self.assertEqual(reader.symbol('ETHGBP').minNotional, 10.0)
+            self.assertEqual(self.fetches, 1)
+
+            writer.refresh()
+            reader.symbol('ETHGBP')
+            self.assertEqual(reader._loadedAt, 1e12)
+
+        self.assertEqual(self.fetches, 2)
+
+
+class TestApplyFilters(unittest.TestCase):
+    """Unittests for `SendOrderSignal.apply_filters`."""
+
+    def apply_filters(self, quantity, price):
+        signal = SimpleNamespace(
+            symbol_filters=lambda _: SymbolFilters(0.001, 0.001, 8, 8, 10.0)
+        )
+        return SendOrderSignal.apply_filters(signal, 'ETHGBP', quantity,
+                                             price)
+
+    def test_step_size(self):
+        """The quantity is rounded down to the step size."""
+        self.assertEqual(self.apply_filters(0.0159, 1000), '0.01500000')
+
+    def test_min_notional(self):
+        """Orders worth less than the minimum notional are not placed."""
+        self.assertIsNone(self.apply_filters(0.0099, 1000))
+        self.assertEqual(self.apply_filters(0.011, 1000), '0.01100000')
+
+
+if __name__ == '__main__':
+    unittest.main()
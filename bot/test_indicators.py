@@ -0,0 +1,391 @@
+"""Unittests checking the streaming indicator engines against the reference
+calculations of the strategies.
+"""
+
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from strategies import (RSI, StreamingRSI, Bollinger, RollingBollinger, EMA,
+                        StreamingEMA, ATR, RollingATR, StochRSI,
+                        StreamingStochRSI, KeltnerChannels, EMABuy50And100,
+                        IndicatorRegistry)
+
+CLOSES = np.genfromtxt(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'strategies',
+    'test_data',
+    'closing_prices.csv'
+))
+
+# Lows and highs around the closing prices, sometimes gapping past the
+# previous close.
+_RNG = np.random.default_rng(0)
+LOWS = CLOSES * (1 - _RNG.uniform(0, 0.01, len(CLOSES)))
+HIGHS = CLOSES * (1 + _RNG.uniform(0, 0.01, len(CLOSES)))
+
+
+def wilder_rsis(closes: np.array, period: int) -> list:
+    """Reference RSI of every candle from `period` onwards, carrying the
+    averages of `RSI.calc_rsi` forward with Wilder's smoothing.
+    """
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    avgGain = gains[:period].mean()
+    avgLoss = losses[:period].mean()
+    rsis = [100 - 100 / (avgGain / avgLoss + 1)]
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avgGain = (avgGain * (period - 1) + gain) / period
+        avgLoss = (avgLoss * (period - 1) + loss) / period
+        rsis.append(100 - 100 / (avgGain / avgLoss + 1))
+    return rsis
+
+
+class TestStreamingRSI(unittest.TestCase):
+    """Unittests for the `StreamingRSI` class."""
+
+    period = 14
+
+    def test_seed_matches_calc_rsi(self):
+        """Seeded on `period + 1` closes, the RSI is `RSI.calc_rsi`."""
+        period = self.period
+        for end in range(period + 1, len(CLOSES), 13):
+            window = CLOSES[end - period - 1:end]
+            self.assertAlmostEqual(StreamingRSI(period).seed(window),
+                                   RSI.calc_rsi(window, period))
+
+    def test_first_update_matches_calc_rsi(self):
+        """The first RSI produced by updates is `RSI.calc_rsi`."""
+        period = self.period
+        rsi = StreamingRSI(period)
+        values = [rsi.update(close) for close in CLOSES[:period + 1]]
+
+        self.assertEqual(values[:period], [None] * period)
+        self.assertAlmostEqual(values[-1],
+                               RSI.calc_rsi(CLOSES[:period + 1], period))
+
+    def test_updates_match_wilder(self):
+        """Each update carries the averages forward with Wilder's smoothing,
+        as seeding on the same closes does.
+        """
+        period = self.period
+        expected = wilder_rsis(CLOSES, period)
+
+        rsi = StreamingRSI(period)
+        values = [rsi.update(close) for close in CLOSES][period:]
+        np.testing.assert_allclose(values, expected)
+
+        for end in range(period + 1, len(CLOSES), 29):
+            self.assertAlmostEqual(
+                StreamingRSI(period).seed(CLOSES[:end]),
+                expected[end - period - 1]
+            )
+
+    def test_seed_then_update(self):
+        """Updating after seeding matches updating from the start."""
+        period = self.period
+        streamed = StreamingRSI(period)
+        for close in CLOSES[:200]:
+            streamed.update(close)
+
+        for seedSize in (5, period, period + 1, 100):
+            rsi = StreamingRSI(period)
+            rsi.seed(CLOSES[:seedSize])
+            for close in CLOSES[seedSize:200]:
+                rsi.update(close)
+            self.assertAlmostEqual(rsi.value, streamed.value,
+                                   msg=seedSize)
+
+    def test_flat_prices(self):
+        """Without losses the RSI is 100, without any change it is NaN."""
+        period = self.period
+        self.assertEqual(
+            StreamingRSI(period).seed(np.arange(period + 1.0)), 100.0
+        )
+        self.assertTrue(np.isnan(
+            StreamingRSI(period).seed(np.ones(period + 1))
+        ))
+
+
+class TestRollingBollinger(unittest.TestCase):
+    """Unittests for the `RollingBollinger` class."""
+
+    def check(self, closes: np.array, period: int, seedSize: int):
+        """Compares the bands after every update against the pandas rolling
+        mean and sample standard deviation, allowing for the rounding of
+        either when the prices barely move.
+        """
+        rolling = pd.Series(closes).rolling(period)
+        means = rolling.mean().to_numpy()
+        stds = rolling.std().to_numpy()
+
+        bands = RollingBollinger(period).seed(closes[:seedSize])
+        for idx in range(seedSize, len(closes)):
+            bands.update(closes[idx])
+            msg = f'period {period} candle {idx}'
+
+            self.assertEqual(bands.ready, idx >= period - 1, msg=msg)
+            if not bands.ready:
+                self.assertTrue(np.isnan(bands.upper), msg=msg)
+                continue
+
+            self.assertAlmostEqual(bands.mean, means[idx], msg=msg)
+            np.testing.assert_allclose(
+                (bands.lower, bands.upper),
+                (means[idx] - 2 * stds[idx], means[idx] + 2 * stds[idx]),
+                rtol=1e-9,
+                atol=1e-8 * means[idx],
+                err_msg=msg
+            )
+
+    def test_matches_pandas(self):
+        """The bands match pandas, whether seeded on an empty, partial or
+        full window.
+        """
+        for period in (2, 20):
+            for seedSize in (0, period // 2, period, 100):
+                self.check(CLOSES, period, seedSize)
+
+    def test_large_prices(self):
+        """Small changes in large prices do not lose precision."""
+        closes = 1e6 + CLOSES / 100
+        self.check(closes, 20, 20)
+
+    def test_seed_keeps_latest_window(self):
+        """Seeding on more closes than the period keeps the latest ones."""
+        bands = RollingBollinger(20).seed(CLOSES[:100])
+        self.assertAlmostEqual(bands.mean, CLOSES[80:100].mean())
+        self.assertAlmostEqual(bands.std, CLOSES[80:100].std(ddof=1))
+
+
+class TestStreamingEMA(unittest.TestCase):
+    """Unittests for the `StreamingEMA` class."""
+
+    def test_updates_match_calc_ema(self):
+        """Each update matches `EMA.calc_ema`, with no value until there
+        are `period` closes.
+        """
+        for period in (2, 20, 50, 100):
+            expected = EMA.calc_ema(CLOSES, period).to_numpy()
+            ema = StreamingEMA(period)
+            values = [ema.update(close) for close in CLOSES]
+
+            self.assertEqual(values[:period - 1], [None] * (period - 1))
+            np.testing.assert_allclose(values[period - 1:],
+                                       expected[period - 1:],
+                                       err_msg=str(period))
+
+    def test_seed_matches_calc_ema(self):
+        """Seeding matches `EMA.calc_ema` and updating carries on from it."""
+        period = 20
+        expected = EMA.calc_ema(CLOSES, period).to_numpy()
+        for seedSize in (5, period - 1, period, 300):
+            ema = StreamingEMA(period)
+            ema.seed(CLOSES[:seedSize])
+            if seedSize >= period:
+                self.assertAlmostEqual(ema.value, expected[seedSize - 1])
+            else:
+                self.assertFalse(ema.ready)
+
+            for close in CLOSES[seedSize:]:
+                ema.update(close)
+            self.assertAlmostEqual(ema.value, expected[-1], msg=seedSize)
+
+    def test_latest_ema(self):
+        """`EMA.latest_ema` is the last value of `EMA.calc_ema`."""
+        for end in range(100, len(CLOSES), 50):
+            self.assertAlmostEqual(
+                EMA.latest_ema(CLOSES[:end], 100),
+                EMA.calc_ema(CLOSES[:end], 100).iloc[-1]
+            )
+
+
+class TestRollingATR(unittest.TestCase):
+    """Unittests for the `ATR` and `RollingATR` classes."""
+
+    period = 20
+
+    def test_true_ranges(self):
+        """The vectorised true ranges match `ATR.true_range`."""
+        expected = [
+            ATR.true_range(HIGHS[idx], LOWS[idx], CLOSES[idx - 1])
+            for idx in range(1, len(CLOSES))
+        ]
+        np.testing.assert_allclose(ATR.true_ranges(CLOSES, LOWS, HIGHS),
+                                   expected)
+
+    def test_updates_match_avg_atr(self):
+        """Each update matches `ATR.avg_atr` and `ATR.atr_series`."""
+        period = self.period
+        series = ATR.atr_series(period, CLOSES, LOWS, HIGHS)
+        self.assertTrue(np.isnan(series[:period]).all())
+
+        atr = RollingATR(period)
+        for idx in range(len(CLOSES)):
+            value = atr.update(CLOSES[idx], LOWS[idx], HIGHS[idx])
+            if idx < period:
+                self.assertIsNone(value)
+                continue
+
+            end = idx + 1
+            expected = ATR().avg_atr(period, CLOSES[:end], LOWS[:end],
+                                     HIGHS[:end])
+            self.assertAlmostEqual(value, expected, msg=idx)
+            self.assertAlmostEqual(series[idx], expected, msg=idx)
+
+    def test_seed_then_update(self):
+        """Updating after seeding matches `ATR.avg_atr`."""
+        period = self.period
+        for seedSize in (1, period, period + 1, 200):
+            atr = RollingATR(period)
+            atr.seed(CLOSES[:seedSize], LOWS[:seedSize], HIGHS[:seedSize])
+            self.assertEqual(atr.ready, seedSize > period)
+
+            for idx in range(seedSize, 300):
+                atr.update(CLOSES[idx], LOWS[idx], HIGHS[idx])
+            self.assertAlmostEqual(
+                atr.value,
+                ATR().avg_atr(period, CLOSES[:300], LOWS[:300], HIGHS[:300]),
+                msg=seedSize
+            )
+
+
+class TestStreamingStochRSI(unittest.TestCase):
+    """Unittests for the `StreamingStochRSI` class."""
+
+    def expected(self, closes: np.array, period: int) -> list:
+        """Values of `StochRSI.calc_rsi` aligned with the closing prices."""
+        reference = StochRSI.calc_rsi(closes, period, 3, 3)
+        return [series.reindex(range(len(closes))).to_numpy()
+                for series in reference]
+
+    def check(self, closes: np.array, period: int, seedSize: int):
+        expected = self.expected(closes, period)
+
+        stochRSI = StreamingStochRSI(period)
+        stochRSI.seed(closes[:seedSize])
+        for idx in range(seedSize, len(closes)):
+            stochRSI.update(closes[idx])
+            np.testing.assert_allclose(
+                (stochRSI.stochrsi, stochRSI.stochrsiK, stochRSI.stochrsiD),
+                [values[idx] for values in expected],
+                err_msg=f'period {period} candle {idx}'
+            )
+
+    def test_updates_match_calc_rsi(self):
+        """Each update matches `StochRSI.calc_rsi`, NaNs included."""
+        for period in (3, 14):
+            self.check(CLOSES, period, 0)
+
+    def test_seed_matches_calc_rsi(self):
+        """Updating after seeding matches `StochRSI.calc_rsi`."""
+        for seedSize in (10, 28, 200):
+            self.check(CLOSES, 14, seedSize)
+
+    def test_nan_rsi(self):
+        """While the RSI is NaN, as it is when prices have not moved, the
+        Stochastic RSI is NaN, as with `StochRSI.calc_rsi`, and values
+        resume once the NaNs leave the window.
+        """
+        closes = np.concatenate((np.full(30, CLOSES[0]), CLOSES[:120]))
+        self.check(closes, 14, 0)
+
+        stochRSI = StreamingStochRSI(14)
+        stochRSI.seed(closes[:40])
+        self.assertTrue(np.isnan(stochRSI.value))
+        stochRSI.seed(closes)
+        self.assertFalse(np.isnan(stochRSI.value))
+
+    def test_series(self):
+        """`StochRSI.stochrsi_series` matches `StochRSI.calc_rsi`."""
+        np.testing.assert_allclose(
+            StochRSI.stochrsi_series(CLOSES, 14, 3, 3),
+            self.expected(CLOSES, 14)
+        )
+
+
+class TestIndicatorRegistry(unittest.TestCase):
+    """Unittests for the `IndicatorRegistry` class."""
+
+    configs = {
+        RSI: {'period': 14},
+        StochRSI: {'period': 14},
+        Bollinger: {'period': 20},
+        KeltnerChannels: {'ema_period': 20, 'atr_period': 20},
+        EMABuy50And100: {},
+    }
+
+    def registry(self) -> IndicatorRegistry:
+        """Registry of the indicators of every strategy."""
+        registry = IndicatorRegistry()
+        for strat, config in self.configs.items():
+            registry.require_all(strat.indicators(config))
+        return registry
+
+    def test_shared(self):
+        """Indicators required by many strategies are only created once."""
+        registry = self.registry()
+        rsi = registry[('rsi', 14)]
+        ema = registry[('ema', 20)]
+        registry.require_all(RSI.indicators({'period': 14})
+                             + [('ema', 20), ('stochrsi', 14, 3, 3)])
+
+        self.assertIs(registry[('rsi', 14)], rsi)
+        self.assertIs(registry[('ema', 20)], ema)
+        self.assertEqual(len(registry._nodes), 7)
+
+    def test_stochrsi_requires_rsi(self):
+        """The Stochastic RSI registers the RSI it is fed from."""
+        registry = IndicatorRegistry()
+        registry.require(('stochrsi', 5, 3, 3))
+        self.assertIn(('rsi', 5), registry)
+
+    def test_unknown(self):
+        """Unknown indicators are rejected."""
+        with self.assertRaises(ValueError):
+            IndicatorRegistry().require(('macd', 12))
+
+    def test_matches_engines(self):
+        """Seeded and updated candle by candle, every indicator matches an
+        engine of its own fed the same candles.
+        """
+        for seedSize in (0, 10, 150):
+            registry = self.registry()
+            registry.seed(CLOSES[:seedSize], LOWS[:seedSize],
+                          HIGHS[:seedSize])
+
+            engines = {
+                ('rsi', 14): StreamingRSI(14),
+                ('stochrsi', 14, 3, 3): StreamingStochRSI(14),
+                ('bollinger', 20): RollingBollinger(20),
+                ('ema', 20): StreamingEMA(20),
+                ('ema', 50): StreamingEMA(50),
+                ('ema', 100): StreamingEMA(100),
+                ('atr', 20): RollingATR(20),
+            }
+            self.assertEqual(set(registry._nodes), set(engines))
+
+            for idx in range(len(CLOSES)):
+                if idx >= seedSize:
+                    registry.update(CLOSES[idx], LOWS[idx], HIGHS[idx])
+                for key, engine in engines.items():
+                    if key[0] == 'atr':
+                        engine.update(CLOSES[idx], LOWS[idx], HIGHS[idx])
+                    else:
+                        engine.update(CLOSES[idx])
+
+                if idx < seedSize - 1:
+                    continue
+                for key, engine in engines.items():
+                    attr = 'mean' if key[0] == 'bollinger' else 'value'
+                    np.testing.assert_allclose(
+                        np.array(getattr(registry[key], attr), dtype=float),
+                        np.array(getattr(engine, attr), dtype=float),
+                        err_msg=f'{key} seed {seedSize} candle {idx}'
+                    )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Unittests for the indicator kernels."""
+
+import os
+import unittest
+from unittest import mock
+import numpy as np
+from strategies import kernels, RSI, EMA
+
+CLOSES = np.genfromtxt(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'strategies',
+    'test_data',
+    'closing_prices.csv'
+))
+
+
+class TestKernels(unittest.TestCase):
+    """Checks that every backend produces the same values as the reference
+    implementations.
+    """
+
+    def setUp(self):
+        self.backend = kernels.get_backend()
+
+    def tearDown(self):
+        kernels.set_backend(self.backend)
+
+    def backends(self):
+        """Yields each backend once selected. When Numba is not installed,
+        the loops it would compile are run as plain Python instead.
+        """
+        kernels.set_backend('numpy')
+        yield 'numpy'
+
+        if kernels.numba is not None:
+            kernels.set_backend('numba')
+            yield 'numba'
+        else:
+            with mock.patch.object(kernels, '_backend', 'numba'), \
+                    mock.patch.object(kernels, '_ewm_numba',
+                                      kernels._ewm_loop, create=True):
+                yield 'numba (uncompiled)'
+
+    def test_rsi_matches_calc_rsi(self):
+        """Each RSI matches `RSI.calc_rsi` on the same closes."""
+        period = 14
+        for backend in self.backends():
+            for end in range(period + 1, 200, 17):
+                window = CLOSES[end - period - 1:end]
+                self.assertAlmostEqual(
+                    RSI.rsi_series(window, period)[-1],
+                    RSI.calc_rsi(window, period),
+                    msg=backend
+                )
+
+    def test_ema_matches_calc_ema(self):
+        """Each EMA matches `EMA.calc_ema`."""
+        for backend in self.backends():
+            for period in (2, 20, 100):
+                np.testing.assert_allclose(
+                    kernels.ema_series(CLOSES, period)[period - 1:],
+                    EMA.calc_ema(CLOSES, period).to_numpy()[period - 1:],
+                    err_msg=backend
+                )
+
+    def test_nans_match_across_backends(self):
+        """NaNs are handled the same way by every backend."""
+        values = CLOSES[:120].copy()
+        values[:5] = np.nan
+        values[40] = values[41] = np.nan
+
+        expected = None
+        for backend in self.backends():
+            results = (kernels.wilder_average(values, 14),
+                       kernels.ema_series(values, 20),
+                       kernels.wilder_average(np.vstack((values,
+                                                         CLOSES[:120])), 14))
+
+            # The series recovers from the NaNs.
+            self.assertFalse(np.isnan(results[0][-1]), msg=backend)
+            self.assertFalse(np.isnan(results[1][-1]), msg=backend)
+
+            if expected is None:
+                expected = results
+                continue
+            for result, expectedResult in zip(results, expected):
+                np.testing.assert_allclose(result, expectedResult,
+                                           err_msg=backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
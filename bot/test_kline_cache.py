@@ -0,0 +1,138 @@
+"""Unittests for the `KlineCache` class."""
+
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from kline_cache import KlineCache
+from send_order_signal import HistoricalData
+
+INTERVAL_MS = 60000
+LOOKBACK = 10
+
+
+def candles(start: int, end: int) -> HistoricalData:
+    """Candles `start` to `end` (exclusive), the close of candle `idx` being
+    `idx`.
+    """
+    idxs = np.arange(start, end, dtype=float)
+    return HistoricalData(idxs, idxs - 1, idxs + 1, idxs - 0.5,
+                          np.ones(len(idxs)), idxs * INTERVAL_MS)
+
+
+class Exchange:
+    """Serves the closed candles up to `now` from the time requested, along
+    with `overlap` candles before it.
+    """
+
+    def __init__(self, now: int, overlap: int = 0):
+        self.now = now
+        self.overlap = overlap
+        self.requests = []
+
+    def fetch(self, startTime: int) -> HistoricalData:
+        self.requests.append(startTime)
+        return candles(-(-startTime // INTERVAL_MS) - self.overlap, self.now)
+
+
+class TestKlineCache(unittest.TestCase):
+    """Unittests for the `KlineCache` class."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def cache(self) -> KlineCache:
+        return KlineCache('ETHGBP', '1m', LOOKBACK, self.dir.name)
+
+    def sync(self, now: int, overlap: int = 0) -> tuple:
+        """Syncs the cache with the candles closed before candle `now`,
+        the exchange also returning `overlap` candles already cached.
+        """
+        exchange = Exchange(now, overlap)
+        with mock.patch('kline_cache.time.time',
+                        return_value=now * INTERVAL_MS / 1000):
+            return self.cache().sync(exchange.fetch), exchange.requests
+
+    def stored(self) -> HistoricalData:
+        """Every candle in the cache file."""
+        rows = self.cache()._read()
+        return HistoricalData(rows[:, 3], rows[:, 2], rows[:, 1], rows[:, 0],
+                              rows[:, 4], rows[:, 5])
+
+    def assertCandles(self, historicalData, start, end):
+        for field, expected in zip(historicalData, candles(start, end)):
+            np.testing.assert_array_equal(field, expected)
+
+    def test_cold_sync(self):
+        """An empty cache fetches the lookback and stores it."""
+        historicalData, requests = self.sync(100)
+
+        self.assertEqual(requests, [(100 - LOOKBACK) * INTERVAL_MS])
+        self.assertCandles(historicalData, 90, 100)
+        self.assertCandles(self.cache().load(), 90, 100)
+
+    def test_incremental_sync(self):
+        """Only the candles after the latest cached candle are fetched."""
+        self.sync(100)
+        historicalData, requests = self.sync(104)
+
+        self.assertEqual(requests, [100 * INTERVAL_MS])
+        self.assertCandles(historicalData, 94, 104)
+        self.assertCandles(self.cache().load(), 94, 104)
+
+    def test_overlapping_rows_skipped(self):
+        """Fetched candles that are already cached are not added again."""
+        self.sync(100)
+        historicalData, _ = self.sync(104, overlap=3)
+
+        self.assertCandles(historicalData, 94, 104)
+        self.assertCandles(self.stored(), 90, 104)
+
+    def test_appended_candles(self):
+        """Candles appended as they close are loaded and not fetched."""
+        self.sync(100)
+        cache = self.cache()
+        for idx in range(100, 103):
+            candle = candles(idx, idx + 1)
+            cache.append(candle.opens[0], candle.highs[0], candle.lows[0],
+                         candle.closes[0], candle.volumes[0],
+                         candle.openTimes[0])
+
+        historicalData, requests = self.sync(103)
+        self.assertEqual(requests, [103 * INTERVAL_MS])
+        self.assertCandles(historicalData, 93, 103)
+
+    def test_trimmed_at_limit(self):
+        """Once the file holds more than twice the lookback, it is trimmed
+        down to the lookback.
+        """
+        for now in (100, 105, 110, 111):
+            self.sync(now)
+        self.assertCandles(self.stored(), 90, 111)
+
+        self.assertCandles(self.cache().load(), 101, 111)
+        self.assertCandles(self.stored(), 101, 111)
+
+    def test_stale_cache_replaced(self):
+        """A cache older than the lookback is replaced."""
+        self.sync(100)
+        historicalData, requests = self.sync(200)
+
+        self.assertEqual(requests, [190 * INTERVAL_MS])
+        self.assertCandles(historicalData, 190, 200)
+        self.assertCandles(self.stored(), 190, 200)
+
+    def test_partial_row_dropped(self):
+        """A partially written candle is ignored."""
+        self.sync(100)
+        with open(self.cache()._path, 'ab') as f:
+            f.write(b'\0' * 20)
+
+        self.assertCandles(self.cache().load(), 90, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
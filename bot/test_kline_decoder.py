@@ -0,0 +1,83 @@
+"""Unittests for the kline decoders."""
+
+import json
+import unittest
+from kline_decoder import Candle, decode_closed_kline, \
+    decode_closed_stream_kline
+
+
+def kline(closed: bool) -> dict:
+    """Builds a kline message in the format sent by Binance."""
+    return {
+        'e': 'kline',
+        's': 'ETHGBP',
+        'k': {
+            't': 1620000000000,
+            'T': 1620000059999,
+            's': 'ETHGBP',
+            'i': '1m',
+            'o': '2500.10',
+            'h': '2510.00',
+            'l': '2490.50',
+            'c': '2505.25',
+            'v': '12.5',
+            'x': closed,
+        }
+    }
+
+
+EXPECTED = Candle(2500.10, 2510.00, 2490.50, 2505.25, 12.5, 1620000000000)
+
+
+class TestDecodeClosedKline(unittest.TestCase):
+    """Unittests for `decode_closed_kline`."""
+
+    def test_closed(self):
+        """A closed candle is decoded."""
+        self.assertEqual(decode_closed_kline(json.dumps(kline(True))),
+                         EXPECTED)
+
+    def test_open(self):
+        """A candle that has not closed is discarded."""
+        self.assertIsNone(decode_closed_kline(json.dumps(kline(False))))
+
+    def test_open_with_spaces(self):
+        """The flag is still read when the message is not compact."""
+        message = json.dumps(kline(False), separators=(', ', ': '))
+        self.assertIsNone(decode_closed_kline(message))
+
+    def test_bytes(self):
+        """Messages can be received as bytes."""
+        self.assertEqual(
+            decode_closed_kline(json.dumps(kline(True)).encode()),
+            EXPECTED
+        )
+
+
+class TestDecodeClosedStreamKline(unittest.TestCase):
+    """Unittests for `decode_closed_stream_kline`."""
+
+    @staticmethod
+    def message(closed: bool) -> str:
+        return json.dumps({'stream': 'ethgbp@kline_1m',
+                           'data': kline(closed)})
+
+    def test_closed(self):
+        """The stream and the closed candle are returned."""
+        self.assertEqual(decode_closed_stream_kline(self.message(True)),
+                         ('ethgbp@kline_1m', EXPECTED))
+
+    def test_open(self):
+        """A candle that has not closed is discarded."""
+        self.assertIsNone(decode_closed_stream_kline(self.message(False)))
+
+    def test_bytes(self):
+        """Messages can be received as bytes."""
+        self.assertEqual(
+            decode_closed_stream_kline(self.message(True).encode()),
+            ('ethgbp@kline_1m', EXPECTED)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Unittests for the `Ledger` class."""
+
+import unittest
+from unittest import mock
+from binance.enums import SIDE_BUY, SIDE_SELL
+from ledger import Ledger
+
+BALANCES = [
+    {'asset': 'ETH', 'free': '1.5', 'locked': '0.0'},
+    {'asset': 'GBP', 'free': '1000.0', 'locked': '0.0'},
+    {'asset': 'BNB', 'free': '2.0', 'locked': '0.0'},
+]
+
+
+def order(executedQty: str, quoteQty: str, fills: list) -> dict:
+    """Builds a filled order response."""
+    return {
+        'clientOrderId': 'order',
+        'executedQty': executedQty,
+        'cummulativeQuoteQty': quoteQty,
+        'fills': [
+            {'price': price, 'qty': qty, 'commission': commission,
+             'commissionAsset': commissionAsset}
+            for price, qty, commission, commissionAsset in fills
+        ],
+    }
+
+
+class TestLedger(unittest.TestCase):
+    """Unittests for the `Ledger` class."""
+
+    def setUp(self):
+        self.ledger = Ledger(60)
+        self.ledger.load(BALANCES)
+
+    def balances(self) -> list:
+        return [self.ledger.balance(asset) for asset in ('ETH', 'GBP', 'BNB')]
+
+    def test_load(self):
+        """Balances are loaded from the snapshot, others are 0."""
+        self.assertEqual(self.balances(), [1.5, 1000.0, 2.0])
+        self.assertEqual(self.ledger.balance('BTC'), 0.0)
+
+    def test_buy_fill(self):
+        """A buy adds the quantity bought, spends the quote quantity and
+        charges the commission in the asset bought.
+        """
+        self.ledger.apply_order(SIDE_BUY, 'ETH', 'GBP', order(
+            '0.5', '600.0',
+            [('1100.0', '0.2', '0.0002', 'ETH'),
+             ('1233.33', '0.3', '0.0003', 'ETH')]
+        ))
+        for balance, expected in zip(self.balances(),
+                                     [1.9995, 400.0, 2.0]):
+            self.assertAlmostEqual(balance, expected)
+
+    def test_sell_fill(self):
+        """A sell removes the quantity sold, adds the quote quantity and
+        charges the commission in the quote asset.
+        """
+        self.ledger.apply_order(SIDE_SELL, 'ETH', 'GBP', order(
+            '1.5', '1800.0', [('1200.0', '1.5', '1.8', 'GBP')]
+        ))
+        for balance, expected in zip(self.balances(), [0.0, 2798.2, 2.0]):
+            self.assertAlmostEqual(balance, expected)
+
+    def test_commission_in_other_asset(self):
+        """Commission paid in another asset, i.e: BNB, is taken from it."""
+        self.ledger.apply_order(SIDE_BUY, 'ETH', 'GBP', order(
+            '1.0', '1200.0', [('1200.0', '1.0', '0.01', 'BNB')]
+        ))
+        for balance, expected in zip(self.balances(), [2.5, -200.0, 1.99]):
+            self.assertAlmostEqual(balance, expected)
+
+    def test_test_order(self):
+        """Test orders return an empty response and change nothing."""
+        self.ledger.apply_order(SIDE_BUY, 'ETH', 'GBP', {})
+        self.assertEqual(self.balances(), [1.5, 1000.0, 2.0])
+
+    def test_stale(self):
+        """The ledger is stale until loaded, once the reconcile period has
+        passed and once invalidated.
+        """
+        self.assertTrue(Ledger(60).stale)
+        self.assertFalse(self.ledger.stale)
+
+        with mock.patch('ledger.time.monotonic',
+                        return_value=self.ledger._loadedAt + 60):
+            self.assertTrue(self.ledger.stale)
+
+        self.ledger.invalidate()
+        self.assertTrue(self.ledger.stale)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""Unittests for the market data bus, its publishers and its subscribers."""
+
+import os
+import unittest
+from multiprocessing import Pipe
+from candle_store import CandleStore
+from kline_decoder import Candle
+from market_data_bus import BusPublisher, BusSubscriber, MarketDataBus
+
+CONFIG = {'defaults': {'interval': '1m'}}
+SYMBOLS = ['ETHGBP', 'BTCGBP']
+
+
+def candle(idx: int) -> Candle:
+    """Builds the candle that opened `idx` minutes after the first one."""
+    return Candle(idx + 0.1, idx + 0.2, idx + 0.3, idx + 0.4, idx + 0.5,
+                  idx * 60000)
+
+
+class FakeTrader:
+    """Records the candles traded on and the catch ups."""
+
+    def __init__(self):
+        self.candles = CandleStore(10)
+        self.caughtUp = 0
+
+    def on_candle(self, candle):
+        self.candles.append(*candle)
+
+    def catch_up(self):
+        self.caughtUp += 1
+
+    def log_error(self, msg):
+        raise AssertionError(msg)
+
+
+class RecordingBatch:
+    """Records each round of candles and trades them one by one."""
+
+    def __init__(self):
+        self.rounds = []
+
+    def on_candles(self, candles):
+        self.rounds.append([candle.openTime for _, candle in candles])
+        for trader, candle in candles:
+            trader.on_candle(candle)
+
+
+class TestMarketDataBus(unittest.TestCase):
+    """Unittests for the `MarketDataBus` class."""
+
+    def setUp(self):
+        self.bus = MarketDataBus(SYMBOLS, capacity=4)
+
+    def tearDown(self):
+        self.bus.close()
+
+    def test_publish_and_read(self):
+        """Candles are read back by sequence number per symbol."""
+        idx = self.bus.index('BTCGBP')
+        for seq in range(3):
+            self.bus.publish(idx, candle(seq))
+
+        self.assertEqual(self.bus.seq(idx), 3)
+        self.assertEqual(self.bus.seq(self.bus.index('ETHGBP')), 0)
+        self.assertEqual([self.bus.read(idx, seq) for seq in range(3)],
+                         [candle(0), candle(1), candle(2)])
+
+    def test_overwritten(self):
+        """Candles that have been overwritten, or whose slot is the next to
+        be written, are not returned.
+        """
+        idx = self.bus.index('ETHGBP')
+        for seq in range(6):
+            self.bus.publish(idx, candle(seq))
+
+        self.assertIsNone(self.bus.read(idx, 1))
+        self.assertIsNone(self.bus.read(idx, 2))
+        self.assertEqual(self.bus.read(idx, 3), candle(3))
+        self.assertEqual(self.bus.read(idx, 5), candle(5))
+
+    def test_attach(self):
+        """A bus attached by name shares the candles."""
+        self.bus.publish(0, candle(1))
+        attached = MarketDataBus(SYMBOLS, 4, self.bus.name)
+        try:
+            self.assertEqual(attached.read(0, 0), candle(1))
+        finally:
+            attached.close()
+
+
+class TestBusPublisher(unittest.TestCase):
+    """Unittests for the `BusPublisher` class."""
+
+    def setUp(self):
+        self.bus = MarketDataBus(SYMBOLS, capacity=4)
+        self.reader, self.writer = Pipe(duplex=False)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.bus.close()
+
+    def test_publish_notifies(self):
+        """A candle is written to the bus and the worker is woken."""
+        publisher = BusPublisher(self.bus, 'BTCGBP', self.writer)
+        publisher.on_candle(candle(1))
+
+        self.assertEqual(self.bus.read(self.bus.index('BTCGBP'), 0),
+                         candle(1))
+        self.assertTrue(self.reader.poll(1))
+        self.assertEqual(os.read(self.reader.fileno(), 4096), b'\0')
+
+    def test_full_pipe_does_not_block(self):
+        """Publishing carries on when the worker has not drained its pipe."""
+        publisher = BusPublisher(self.bus, 'ETHGBP', self.writer)
+        for idx in range(100000):
+            publisher.on_candle(candle(idx))
+
+        self.assertEqual(self.bus.seq(0), 100000)
+
+
+class TestBusSubscriber(unittest.TestCase):
+    """Unittests for the `BusSubscriber` class."""
+
+    def setUp(self):
+        self.bus = MarketDataBus(SYMBOLS, capacity=4)
+        self.reader, self.writer = Pipe(duplex=False)
+        self.trader = FakeTrader()
+        self.otherTrader = FakeTrader()
+        self.subscriber = BusSubscriber(
+            CONFIG,
+            self.bus,
+            {'ETHGBP': self.trader, 'BTCGBP': self.otherTrader},
+            self.reader
+        )
+        self.batch = self.subscriber._batch = RecordingBatch()
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.bus.close()
+
+    def test_poll(self):
+        """Each candle published is traded on once."""
+        for idx in range(3):
+            self.bus.publish(0, candle(idx))
+        self.subscriber.poll()
+        self.subscriber.poll()
+
+        self.assertEqual(self.trader.candles.openTimes.tolist(),
+                         [0, 60000, 120000])
+
+    def test_rounds(self):
+        """The candles of every symbol are traded together, at most one per
+        symbol at a time.
+        """
+        for idx in range(3):
+            self.bus.publish(0, candle(idx))
+        self.bus.publish(1, candle(0))
+        self.subscriber.poll()
+
+        self.assertEqual(self.batch.rounds, [[0, 0], [60000], [120000]])
+        self.assertEqual(self.otherTrader.candles.openTimes.tolist(), [0])
+
+    def test_duplicates_skipped(self):
+        """Candles the trader already has are skipped."""
+        self.trader.on_candle(candle(1))
+        for idx in range(3):
+            self.bus.publish(0, candle(idx))
+        self.subscriber.poll()
+
+        self.assertEqual(self.trader.candles.openTimes.tolist(),
+                         [60000, 120000])
+        self.assertEqual(self.trader.caughtUp, 0)
+
+    def test_gap_caught_up(self):
+        """A gap between candles is caught up before trading."""
+        self.trader.on_candle(candle(0))
+        self.bus.publish(0, candle(5))
+        self.subscriber.poll()
+
+        self.assertEqual(self.trader.caughtUp, 1)
+        self.assertEqual(self.trader.candles.openTimes[-1], 5 * 60000)
+
+
+if __name__ == '__main__':
+    unittest.main()
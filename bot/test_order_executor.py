@@ -0,0 +1,147 @@
+"""Unittests for the `OrderExecutor` class and the order results of the
+`Trader`.
+"""
+
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from binance.enums import SIDE_BUY, SIDE_SELL
+from order_executor import OrderExecutor, OrderIntent
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestOrderExecutor(unittest.TestCase):
+    """Unittests for the `OrderExecutor` class."""
+
+    def test_failing_on_result(self):
+        """An error raised whilst reporting a result does not stop the
+        worker from running the next intents.
+        """
+        results = []
+        done = threading.Event()
+
+        def on_result(intent, res):
+            results.append(intent.reason)
+            if intent.reason == 'fails':
+                raise ValueError('Reporting failed.')
+            done.set()
+
+        executor = OrderExecutor(lambda intent: {'success': True}, on_result)
+        executor.submit(OrderIntent(SIDE_BUY, 1.0, 'fails'))
+        executor.submit(OrderIntent(SIDE_SELL, 1.0, 'succeeds'))
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(results, ['fails', 'succeeds'])
+        self.assertTrue(executor.running)
+        executor.stop(5)
+        self.assertFalse(executor.running)
+
+    def test_failing_execute(self):
+        """An error raised whilst placing an order is reported as a failed
+        result.
+        """
+        reported = []
+        done = threading.Event()
+
+        def execute(intent):
+            raise ConnectionError('No connection.')
+
+        def on_result(intent, res):
+            reported.append(res)
+            done.set()
+
+        executor = OrderExecutor(execute, on_result)
+        executor.submit(OrderIntent(SIDE_BUY, 1.0, 'buy'))
+
+        self.assertTrue(done.wait(5))
+        self.assertFalse(reported[0]['success'])
+        self.assertIn('No connection.', reported[0]['error'])
+        executor.stop(5)
+
+
+class FailingLedger:
+    """Ledger that fails to apply orders."""
+
+    stale = False
+
+    def apply_order(self, *args):
+        raise KeyError('executedQty')
+
+    def invalidate(self):
+        self.stale = True
+
+    def balance(self, asset):
+        return 0.0
+
+
+class TestTraderOrderResult(unittest.TestCase):
+    """Checks that a trader keeps trading when handling a result fails."""
+
+    def setUp(self):
+        # The trader writes its logs and cache relative to the bot directory.
+        self.cwd = os.getcwd()
+        os.chdir(BOT_DIR)
+
+        from controller import load_config
+        from trader import Trader
+
+        self.config = load_config(SimpleNamespace(
+            buy_mode=None,
+            balance_percent=None,
+            flat_amount=None,
+            test_mode=True,
+            rest_gateway=False
+        ))
+        self.trader = Trader(self.config, 'ETHGBP', 0, ledger=FailingLedger())
+        self.trader.log = lambda msg: None
+        self.trader.log_error = lambda msg: None
+        self.trader._postRequests = True
+
+    def tearDown(self):
+        self.trader.orderExecutor.stop(5)
+        os.chdir(self.cwd)
+
+    def test_pending_flag_cleared(self):
+        """The pending flag is cleared even though the ledger fails, so the
+        trader can place its next order.
+        """
+        done = threading.Event()
+        onResult = self.trader.on_order_result
+
+        def on_result(intent, res):
+            try:
+                onResult(intent, res)
+            finally:
+                done.set()
+
+        self.trader.orderExecutor = OrderExecutor(
+            lambda intent: {'success': True, 'results': {}},
+            on_result
+        )
+        self.trader.send_order(OrderIntent(SIDE_BUY, 10.0, 'buy'))
+
+        self.assertTrue(done.wait(5))
+        self.assertFalse(self.trader._orderPending)
+        self.assertTrue(self.trader.ownCoins)
+        self.assertEqual(self.trader.purchasedPrice, 10.0)
+
+    def test_failed_order_invalidates_ledger(self):
+        """A rejected order marks the ledger stale so that the balances are
+        reloaded before the next order is sized.
+        """
+        self.trader._orderPending = True
+        self.trader.on_order_result(
+            OrderIntent(SIDE_BUY, 10.0, 'buy'),
+            {'success': False, 'error': 'Insufficient balance.',
+             'params': {}}
+        )
+
+        self.assertTrue(self.trader._ledger.stale)
+        self.assertFalse(self.trader._orderPending)
+        self.assertFalse(self.trader.ownCoins)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Unittests for the `RateLimiter` class."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import rate_limiter
+from rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Clock that only moves forward when slept on."""
+
+    def __init__(self, now: float):
+        self.now = now
+        self.slept = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.slept.append(secs)
+        self.now += secs
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Unittests for the `RateLimiter` class."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'rate_limit.bin')
+        self.clock = FakeClock(120.0)
+
+        patches = (
+            mock.patch.object(rate_limiter, 'time', SimpleNamespace(
+                time=self.clock.time,
+                sleep=self.clock.sleep
+            )),
+            mock.patch.object(rate_limiter, 'WEIGHT_LIMIT',
+                              ('X-MBX-USED-WEIGHT-1M', 60, 4)),
+            mock.patch.object(rate_limiter, 'ORDER_RESERVE_WEIGHT', 0),
+            mock.patch('builtins.print'),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.limiter = RateLimiter(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def used_weight(self, limiter: RateLimiter = None) -> int:
+        """Request weight counted in the current window."""
+        limiter = limiter or self.limiter
+        return rate_limiter._STATE.unpack_from(limiter._state)[1]
+
+    def test_costs(self):
+        """Only orders that are posted count towards the order limits."""
+        self.assertEqual(RateLimiter._costs('/api/v3/klines', 'get'),
+                         (2, 0, 0))
+        self.assertEqual(RateLimiter._costs('/api/v3/order', 'post'),
+                         (1, 1, 1))
+        self.assertEqual(RateLimiter._costs('/api/v3/order', 'get'),
+                         (1, 0, 0))
+        self.assertEqual(RateLimiter._costs('/api/v3/ping', 'get'),
+                         (1, 0, 0))
+
+    def test_window_reset(self):
+        """A request that would exceed the limit waits for the window to
+        reset, after which the count starts again.
+        """
+        self.limiter.acquire('/api/v3/klines')
+        self.limiter.acquire('/api/v3/klines')
+        self.assertEqual(self.clock.slept, [])
+        self.assertEqual(self.used_weight(), 4)
+
+        self.clock.now = 150.0
+        self.limiter.acquire('/api/v3/klines')
+        self.assertEqual(self.clock.slept, [30.0])
+        self.assertEqual(self.used_weight(), 2)
+
+    def test_retry_after(self):
+        """No request is sent until the time asked for has passed."""
+        self.limiter.update({'Retry-After': '30'})
+        self.limiter.acquire('/api/v3/ping')
+        self.assertEqual(self.clock.slept, [30.0])
+
+    def test_headers_correct_count(self):
+        """The count is raised, but never lowered, by the reported usage."""
+        self.limiter.acquire('/api/v3/klines')
+        self.limiter.update({'X-MBX-USED-WEIGHT-1M': '1'})
+        self.assertEqual(self.used_weight(), 2)
+
+        self.limiter.update({'X-MBX-USED-WEIGHT-1M': '4'})
+        self.limiter.acquire('/api/v3/ping')
+        self.assertEqual(self.clock.slept, [60.0])
+
+    def test_shared(self):
+        """Limiters opened on the same file share the counts."""
+        other = RateLimiter(self.path)
+        self.limiter.acquire('/api/v3/klines')
+        other.acquire('/api/v3/klines')
+        self.assertEqual(self.used_weight(other), 4)
+
+        self.limiter.acquire('/api/v3/ping')
+        self.assertEqual(self.clock.slept, [60.0])
+
+    def test_order_reserve(self):
+        """Requests other than orders leave the reserved weight for orders.
+        """
+        with mock.patch.object(rate_limiter, 'ORDER_RESERVE_WEIGHT', 2):
+            self.limiter.acquire('/api/v3/klines')
+            self.limiter.acquire('/api/v3/order', 'post')
+            self.limiter.acquire('/api/v3/order/test', 'post')
+            self.assertEqual(self.clock.slept, [])
+
+            self.limiter.acquire('/api/v3/ping')
+            self.assertEqual(self.clock.slept, [60.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
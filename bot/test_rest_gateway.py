@@ -0,0 +1,75 @@
+"""Unittests for the `RestGateway` and `GatewayClient` classes."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from rest_gateway import GatewayClient, GatewayError, RestGateway
+
+
+class FakeClient:
+    """Client whose balance checks wait until they are released."""
+
+    def __init__(self, released: threading.Event):
+        self._released = released
+
+    def get_account(self):
+        self._released.wait(10)
+        return {'balances': []}
+
+    def create_order(self, **params):
+        return {'status': 'FILLED', **params}
+
+    def get_historical_klines(self, *args):
+        raise ValueError('No klines.')
+
+
+class TestRestGateway(unittest.TestCase):
+    """Unittests for the `RestGateway` class."""
+
+    def setUp(self):
+        # The gateway removes its socket once the tests have finished.
+        self.released = threading.Event()
+        address = os.path.join(tempfile.mkdtemp(), 'gateway.sock')
+        with mock.patch('builtins.print'):
+            threading.Thread(
+                target=RestGateway(
+                    [FakeClient(self.released), FakeClient(self.released)],
+                    address
+                ).run,
+                daemon=True
+            ).start()
+            self.client = GatewayClient(address)
+
+    def tearDown(self):
+        self.released.set()
+
+    def test_orders_not_held_up(self):
+        """An order is run whilst balance checks hold up every other
+        session.
+        """
+        balances = [self.client.submit('get_account') for _ in range(2)]
+        order = self.client.submit('create_order', symbol='ETHGBP')
+
+        self.assertEqual(order.result(5),
+                         {'status': 'FILLED', 'symbol': 'ETHGBP'})
+        self.assertFalse(any(future.done() for future in balances))
+
+        self.released.set()
+        for future in balances:
+            self.assertEqual(future.result(5), {'balances': []})
+
+    def test_errors_returned(self):
+        """Errors raised by the client are raised by the caller."""
+        with self.assertRaises(ValueError):
+            self.client.get_historical_klines('ETHGBP')
+
+    def test_unknown_method(self):
+        """Only the methods listed can be called."""
+        with self.assertRaises(GatewayError):
+            self.client.submit('get_deposit_address').result(5)
+
+
+if __name__ == '__main__':
+    unittest.main()
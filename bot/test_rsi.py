@@ -22,6 +22,7 @@ coinsOwned = False
 
 f = open('tmp.csv', 'w+')
 closes = []
+rsi = RSI()
 
 for data in historicalData:
     s, ms = divmod(int(data[6]), 1000)
@@ -29,6 +30,5 @@ for data in historicalData:
         '%Y-%m-%d %H:%M:%S', time.gmtime(s)), ms)
     close = float(data[4])
     closes.append(close)
-    rsi = RSI().apply_indicator(np.array(closes), config, coinsOwned)
-    f.write(
-        f"{timestamp}|{close}|{rsi['results']['RSI Value']}|{rsi['decision']}")
+    decision = rsi.apply_indicator(np.array(closes), config, coinsOwned)
+    f.write(f"{timestamp}|{close}|{rsi.results[0]}|{decision}")
@@ -0,0 +1,125 @@
+"""Unittests for splitting the symbols between shards and supervising the
+shard processes.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from shards import ConsistentHashRing, ShardSupervisor, assign_shards
+
+SYMBOLS = [f'SYM{idx}USDT' for idx in range(1000)]
+
+
+def shard_of(shards: dict) -> dict:
+    """Shard of each symbol."""
+    return {tradeSymbol: shard
+            for shard, shardSyms in shards.items()
+            for tradeSymbol in shardSyms}
+
+
+def crash_once(directory: str, shard: int, crashAfterSecs: float) -> None:
+    """Records when the shard started and crashes on its first run."""
+    path = os.path.join(directory, str(shard))
+    firstRun = not os.path.exists(path)
+    with open(path, 'a') as f:
+        f.write(f'{time.monotonic()}\n')
+
+    if firstRun:
+        time.sleep(crashAfterSecs)
+        os._exit(3)
+
+
+def record(directory: str, name: str) -> None:
+    """Records the name of the function that ran."""
+    open(os.path.join(directory, name), 'w').close()
+
+
+def record_other(directory: str, name: str) -> None:
+    record(directory, f'other-{name}')
+
+
+class TestConsistentHashRing(unittest.TestCase):
+    """Unittests for the `ConsistentHashRing` class."""
+
+    def test_stable(self):
+        """The same key always belongs to the same node."""
+        ring = ConsistentHashRing(range(8))
+        self.assertEqual(
+            [ring.node_for(tradeSymbol) for tradeSymbol in SYMBOLS],
+            [ConsistentHashRing(range(8)).node_for(tradeSymbol)
+             for tradeSymbol in SYMBOLS]
+        )
+
+    def test_node_added(self):
+        """Adding a node only moves keys onto the new node, and only around
+        its share of them.
+        """
+        before = shard_of(assign_shards(SYMBOLS, 8))
+        after = shard_of(assign_shards(SYMBOLS, 9))
+
+        moved = [tradeSymbol for tradeSymbol in SYMBOLS
+                 if before[tradeSymbol] != after[tradeSymbol]]
+        self.assertTrue(moved)
+        self.assertTrue(all(after[tradeSymbol] == 8
+                            for tradeSymbol in moved))
+        self.assertLess(len(moved), 2 * len(SYMBOLS) / 9)
+
+    def test_spread(self):
+        """Every shard is given a share of the keys."""
+        shards = assign_shards(SYMBOLS, 8)
+        self.assertEqual(len(shards), 8)
+        self.assertEqual(sum(map(len, shards.values())), len(SYMBOLS))
+        self.assertGreater(min(map(len, shards.values())), len(SYMBOLS) / 16)
+
+
+class TestShardSupervisor(unittest.TestCase):
+    """Unittests for the `ShardSupervisor` class."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def started_at(self, shard: int) -> list:
+        with open(os.path.join(self.directory, str(shard))) as f:
+            return [float(line) for line in f]
+
+    def test_restarts_are_not_serialised(self):
+        """A shard waiting to be restarted does not hold up restarting
+        another shard that crashed whilst it waited.
+        """
+        ShardSupervisor(
+            crash_once,
+            {0: (self.directory, 0, 0), 1: (self.directory, 1, 0.1)},
+            0.5,
+            60
+        ).run()
+
+        for shard in (0, 1):
+            startedAt = self.started_at(shard)
+            self.assertEqual(len(startedAt), 2)
+            self.assertGreaterEqual(startedAt[1] - startedAt[0], 0.5)
+
+        # Shard 1 is restarted half a second after it crashed, rather than
+        # once shard 0 has been restarted.
+        self.assertLess(self.started_at(1)[1] - self.started_at(0)[1], 0.4)
+
+    def test_targets(self):
+        """Shards given their own target run it instead of the default."""
+        ShardSupervisor(
+            record,
+            {0: (self.directory, '0'), 'ingestion': (self.directory, 'i')},
+            0.1,
+            60,
+            {'ingestion': record_other}
+        ).run()
+
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['0', 'other-i'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unittests for saving and restoring the state of a `Trader`."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from send_order_signal import HistoricalData
+from snapshot import load_snapshot, save_snapshot
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CLOSES = np.genfromtxt(os.path.join(
+    BOT_DIR,
+    'strategies',
+    'test_data',
+    'closing_prices.csv'
+))
+
+
+def history(size: int) -> HistoricalData:
+    """Builds historical data from the test closing prices."""
+    closes = CLOSES[:size]
+    return HistoricalData(
+        closes,
+        closes - 1,
+        closes + 1,
+        closes - 0.5,
+        np.ones(size),
+        np.arange(size) * 60000.0
+    )
+
+
+def indicator_values(trader) -> list:
+    """Latest value of every indicator of a trader."""
+    return [
+        (key, getattr(node, 'value', None), getattr(node, 'mean', None))
+        for key, node in trader._indicators._nodes.items()
+    ]
+
+
+class TestSnapshot(unittest.TestCase):
+    """Unittests for the snapshots of a trader."""
+
+    def setUp(self):
+        # The trader writes its logs and cache relative to the bot directory.
+        self.cwd = os.getcwd()
+        os.chdir(BOT_DIR)
+        self.stateDir = tempfile.mkdtemp()
+
+        from controller import load_config
+        self.config = load_config(SimpleNamespace(
+            buy_mode=None,
+            balance_percent=None,
+            flat_amount=None,
+            test_mode=True,
+            rest_gateway=False
+        ))
+        self.traders = []
+
+    def tearDown(self):
+        for trader in self.traders:
+            trader._orderExecutor.stop(5)
+        shutil.rmtree(self.stateDir)
+        os.chdir(self.cwd)
+
+    def trader(self):
+        from trader import Trader
+        trader = Trader(self.config, 'ETHGBP', 0)
+        trader.log = lambda msg: None
+        trader._statePath = os.path.join(self.stateDir, 'ETHGBP.npz')
+        self.traders.append(trader)
+        return trader
+
+    def test_restore(self):
+        """The candles and the position are restored and the indicators are
+        seeded as they were when the history was loaded.
+        """
+        trader = self.trader()
+        trader.load_historical_data(history(trader._candles.capacity))
+        trader.ownCoins = True
+        trader.purchasedPrice = 123.5
+        trader.save_state()
+
+        restored = self.trader()
+        self.assertTrue(restored.restore_state())
+        np.testing.assert_array_equal(restored.closes, trader.closes)
+        np.testing.assert_array_equal(restored._candles.openTimes,
+                                      trader._candles.openTimes)
+        np.testing.assert_equal(indicator_values(restored),
+                                indicator_values(trader))
+        self.assertTrue(restored.ownCoins)
+        self.assertEqual(restored.purchasedPrice, 123.5)
+        self.assertFalse(restored._inStopLoss)
+
+    def test_rejected_snapshot_keeps_position(self):
+        """The position is left alone when the snapshot is not restored."""
+        trader = self.trader()
+        save_snapshot(trader._statePath, {
+            'candles': np.zeros((6, 0)),
+            'position': np.array([1.0, 123.5, 1.0]),
+        })
+
+        self.assertFalse(trader.restore_state())
+        self.assertFalse(trader.ownCoins)
+        self.assertEqual(trader.purchasedPrice, 0)
+        self.assertFalse(trader._inStopLoss)
+
+    def test_unreadable_snapshot(self):
+        """A partially written snapshot is ignored."""
+        path = os.path.join(self.stateDir, 'broken.npz')
+        with open(path, 'wb') as f:
+            f.write(b'PK\x03\x04broken')
+        self.assertIsNone(load_snapshot(path))
+
+    def test_throttled(self):
+        """Snapshots are only saved every few candles, unless the position
+        changes.
+        """
+        trader = self.trader()
+        trader._snapshotInterval = 3
+        trader.load_historical_data(history(50))
+        trader.save_state()
+        os.remove(trader._statePath)
+
+        trader.save_state_throttled()
+        trader.save_state_throttled()
+        self.assertFalse(os.path.exists(trader._statePath))
+        trader.save_state_throttled()
+        self.assertTrue(os.path.exists(trader._statePath))
+
+        os.remove(trader._statePath)
+        trader.ownCoins = True
+        trader.save_state_throttled()
+        self.assertTrue(os.path.exists(trader._statePath))
+
+
+if __name__ == '__main__':
+    unittest.main()
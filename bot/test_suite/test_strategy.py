@@ -114,11 +114,6 @@ class TestStrategy:
         """
         startTime = time()
 
-        # Prices
-        closes = []
-        lows = []
-        highs = []
-
         # Collects wins and losses.
         wins = []
         losses = []
@@ -145,61 +140,49 @@ class TestStrategy:
         resultsFile = open(f'{outputFileName}.txt', 'w+')
 
         progressBar = ProgressBar(loadedData.count)
-        writeHeaders = True
 
-        # In the config, certain strategies require additional arguments.
-        # These strategies will use the following argument map to fetch the
-        # correct variable.
-        argsMap = {
-            'keltnerchannels': {
-                '_lowPrices': lambda: lows,
-                '_highPrices': lambda: highs
-            }
-        }
+        # Prices
+        data = list(loadedData.data)
+        openTimes = [d['openTime'] for d in data]
+        closes = np.array([d['closePrice'] for d in data], dtype=float)
+        lows = np.array([d['lowPrice'] for d in data], dtype=float)
+        highs = np.array([d['highPrice'] for d in data], dtype=float)
+
+        # Each strategy is applied to the whole series in one go. Only the
+        # buy/sell state needs to be walked through candle by candle.
+        results = [
+            strategy(lambda _: None).apply_series(
+                closes,
+                lows,
+                highs,
+                self.config['strategies'][strategy.__name__.lower()]
+            )
+            for strategy in strategies
+        ]
+        decisions = np.stack([result['decisions'] for result in results])
 
-        npArraySize = self.config['defaults']['closes_array_size']
+        headers = ['Open Time', 'Close Price', 'PnL']
+        for strategy, result in zip(strategies, results):
+            headers += list(result['results'].keys())
+            headers.append(f'{strategy.__name__} Decision')
+        outputFile.write(f"{'|'.join(headers)}\n")
 
-        for idx, data in enumerate(loadedData.data):
+        for idx, closePrice in enumerate(closes.tolist()):
             try:
-                results = []
-
-                closes.append(data['closePrice'])
-                lows.append(data['lowPrice'])
-                highs.append(data['highPrice'])
-
-                # To save memory, keep the size of the arrays limited.
-                while len(closes) > npArraySize:
-                    closes.pop(0)
-                    lows.pop(0)
-                    highs.pop(0)
-
-                for strategy in strategies:
-                    className = strategy.__name__.lower()
-                    config = self.config['strategies'][className]
-
-                    result = strategy(lambda _: None).apply_indicator(
-                        np.array(closes[-npArraySize:]),
-                        config,
-                        ownCoin,
-                        *[argsMap[className][arg]()[-npArraySize:]
-                          for arg in config.get('additional_args', [])]
-                    )
-                    results.append(result)
-
-                decisions = [result['decision'] for result in results]
-                if (all(decision == 1 for decision in decisions)
+                candleDecisions = decisions[:, int(ownCoin), idx]
+                if (all(decision == 1 for decision in candleDecisions)
                         and not inStopLoss):
                     ownCoin = True
-                    unitsOwned = buyPrice / data['closePrice']
+                    unitsOwned = buyPrice / closePrice
                     pnl -= buyPrice
-                    purchasePrice = data['closePrice']
+                    purchasePrice = closePrice
 
-                elif all(decision == -1 for decision in decisions):
+                elif all(decision == -1 for decision in candleDecisions):
                     ownCoin = False
-                    pnl += data['closePrice'] * unitsOwned
+                    pnl += closePrice * unitsOwned
                     unitsOwned = 0
 
-                    priceDiff = ((data['closePrice'] - purchasePrice)
+                    priceDiff = ((closePrice - purchasePrice)
                                  / purchasePrice)
 
                     purchasePrice = 0
@@ -211,13 +194,13 @@ class TestStrategy:
 
                 elif (stopLoss
                       and ownCoin
-                      and self.stopLoss(purchasePrice, data['closePrice'])):
+                      and self.stopLoss(purchasePrice, closePrice)):
 
                     ownCoin = False
-                    pnl += data['closePrice'] * unitsOwned
+                    pnl += closePrice * unitsOwned
                     unitsOwned = 0
 
-                    priceDiff = ((data['closePrice'] - purchasePrice)
+                    priceDiff = ((closePrice - purchasePrice)
                                  / purchasePrice)
 
                     purchasePrice = 0
@@ -225,30 +208,22 @@ class TestStrategy:
                     stopLossCount += 1
                     inStopLoss = True
 
-                elif inStopLoss and data['closePrice'] >= closes[-2]:
+                elif inStopLoss and idx and closePrice >= closes[idx - 1]:
                     inStopLoss = False
 
                     # Force a buy after the stop loss period.
                     if buyAfterSL:
                         ownCoin = True
-                        unitsOwned = buyPrice / data['closePrice']
+                        unitsOwned = buyPrice / closePrice
                         pnl -= buyPrice
-                        purchasePrice = data['closePrice']
+                        purchasePrice = closePrice
 
                 # Write the results to a csv.
-                if writeHeaders:
-                    headers = ['Open Time', 'Close Price', 'PnL']
-                    for res in results:
-                        headers += list(res['results'].keys())
-
-                    outputFile.write(f"{'|'.join(headers)}\n")
-                    writeHeaders = False
-
-                resultVals = [str(data['openTime']), str(data['closePrice']),
-                              str(pnl)]
-
-                for res in results:
-                    resultVals += [str(r) for r in res['results'].values()]
+                resultVals = [str(openTimes[idx]), str(closePrice), str(pnl)]
+                for result, decision in zip(results, candleDecisions):
+                    resultVals += [str(column[idx]) for column
+                                   in result['results'].values()]
+                    resultVals.append(str(decision))
                 outputFile.write(f"{'|'.join(resultVals)}\n")
 
                 # Update progress
@@ -0,0 +1,118 @@
+"""Unittests for the handling of candles by the `Trader` class."""
+
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+from kline_decoder import Candle
+from send_order_signal import HistoricalData
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CLOSES = np.genfromtxt(os.path.join(
+    BOT_DIR,
+    'strategies',
+    'test_data',
+    'closing_prices.csv'
+))
+
+
+def history(size: int) -> HistoricalData:
+    """Builds historical data from the test closing prices."""
+    closes = CLOSES[:size]
+    return HistoricalData(
+        closes,
+        closes - 1,
+        closes + 1,
+        closes - 0.5,
+        np.ones(size),
+        np.arange(size) * 60000.0
+    )
+
+
+def candle(historicalData: HistoricalData, idx: int) -> Candle:
+    """Candle at `idx` of the historical data."""
+    return Candle(
+        historicalData.opens[idx],
+        historicalData.highs[idx],
+        historicalData.lows[idx],
+        historicalData.closes[idx],
+        historicalData.volumes[idx],
+        historicalData.openTimes[idx]
+    )
+
+
+def indicator_state(trader) -> list:
+    """State of every indicator of a trader."""
+    return [
+        (key, getattr(node, 'value', None), getattr(node, 'mean', None))
+        for key, node in trader._indicators._nodes.items()
+    ]
+
+
+class TestTraderCandles(unittest.TestCase):
+    """Unittests for `Trader.on_candle`."""
+
+    def setUp(self):
+        # The trader writes its logs and cache relative to the bot directory.
+        self.cwd = os.getcwd()
+        os.chdir(BOT_DIR)
+
+        from controller import load_config
+        from trader import Trader
+
+        config = load_config(SimpleNamespace(
+            buy_mode=None,
+            balance_percent=None,
+            flat_amount=None,
+            test_mode=True,
+            rest_gateway=False
+        ))
+        self.trader = Trader(config, 'ETHGBP', 0)
+        self.trader.log = lambda msg: None
+        self.trader.save_state_throttled = lambda: None
+        self.trader._klineCache = mock.Mock()
+        self.history = history(150)
+
+    def tearDown(self):
+        self.trader._orderExecutor.stop(5)
+        os.chdir(self.cwd)
+
+    def test_loaded_candle_replayed(self):
+        """A candle received again after being loaded with the history is
+        skipped, leaving the candles and indicators untouched.
+        """
+        trader = self.trader
+        trader.load_historical_data(self.history)
+        closes = trader.closes.copy()
+        state = indicator_state(trader)
+
+        with mock.patch.object(trader, 'trade') as trade, \
+                mock.patch('builtins.print'):
+            for idx in (-2, -1):
+                trader.on_candle(candle(self.history, idx))
+
+        trade.assert_not_called()
+        trader._klineCache.append.assert_not_called()
+        np.testing.assert_array_equal(trader.closes, closes)
+        np.testing.assert_equal(indicator_state(trader), state)
+
+    def test_new_candle(self):
+        """A candle newer than the history is traded on once."""
+        trader = self.trader
+        trader.load_historical_data(history(149))
+
+        with mock.patch.object(trader, 'trade') as trade, \
+                mock.patch('builtins.print'):
+            trader.on_candle(candle(self.history, 149))
+            trader.on_candle(candle(self.history, 149))
+
+        trade.assert_called_once_with(self.history.closes[149])
+        trader._klineCache.append.assert_called_once()
+        self.assertEqual(trader.candles.openTimes[-1],
+                         self.history.openTimes[149])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Unittests for the `WarmupScheduler` class."""
+
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from warmup import HISTORY_WEIGHT, WarmupScheduler, WeightBudget
+
+
+class RecordingBudget:
+    """Budget that records the weight acquired without waiting."""
+
+    def __init__(self):
+        self.acquired = []
+
+    def acquire(self, weight):
+        self.acquired.append(weight)
+
+
+class FakeClock:
+    """Clock that only moves when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, secs):
+        with self._lock:
+            self.now += secs
+
+
+class TestWarmupScheduler(unittest.TestCase):
+    """Unittests for the `WarmupScheduler` class."""
+
+    def test_failed_fetch_is_handed_over(self):
+        """A symbol whose data could not be fetched is still handed over, so
+        that its trader is started and fetches the data itself.
+        """
+        def fetch(tradeSymbol):
+            if tradeSymbol == 'BTCGBP':
+                raise ConnectionError('No connection.')
+            return [tradeSymbol]
+
+        ready = {}
+        budget = RecordingBudget()
+        readySecs = WarmupScheduler(fetch, budget, 2).run(
+            ['ETHGBP', 'BTCGBP'],
+            lambda tradeSymbol, data: ready.update({tradeSymbol: data})
+        )
+
+        self.assertEqual(ready, {'ETHGBP': ['ETHGBP'], 'BTCGBP': None})
+        self.assertEqual(list(readySecs), ['ETHGBP'])
+
+    def test_history_weight(self):
+        """Each symbol is charged for both of the klines requests sent."""
+        budget = RecordingBudget()
+        WarmupScheduler(lambda tradeSymbol: [], budget).run(
+            ['ETHGBP', 'BTCGBP'],
+            lambda tradeSymbol, data: None
+        )
+
+        self.assertEqual(budget.acquired, [HISTORY_WEIGHT] * 2)
+
+    def test_budget_window(self):
+        """No more warm-ups are started than the budget allows within a
+        window, the rest are deferred until the budget refills.
+        """
+        weightPerMinute = 5 * HISTORY_WEIGHT
+        clock = FakeClock()
+        startedAt = []
+
+        def fetch(tradeSymbol):
+            startedAt.append(clock.monotonic())
+            return []
+
+        with mock.patch('warmup.time', SimpleNamespace(
+                monotonic=clock.monotonic, sleep=clock.sleep)):
+            WarmupScheduler(fetch, WeightBudget(weightPerMinute), 4).run(
+                [f'SYM{idx}' for idx in range(12)],
+                lambda tradeSymbol, data: None
+            )
+
+        startedAt.sort()
+        self.assertEqual(len(startedAt), 12)
+
+        # A full bucket is started at once, the rest wait for it to refill.
+        self.assertEqual(startedAt.count(0.0), 5)
+        self.assertTrue(all(secs > 0 for secs in startedAt[5:]))
+
+        # By any time, the weight started is at most the capacity plus what
+        # has refilled since.
+        for count, secs in enumerate(startedAt, 1):
+            self.assertLessEqual(
+                count * HISTORY_WEIGHT,
+                weightPerMinute + secs * weightPerMinute / 60 + 1e-9
+            )
+
+        # Within the first minute, only the capacity and the weight
+        # refilled in that minute are used, the rest is deferred past it.
+        self.assertLessEqual(sum(secs < 60 for secs in startedAt),
+                             2 * weightPerMinute // HISTORY_WEIGHT)
+        self.assertGreater(startedAt[-1], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
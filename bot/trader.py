@@ -2,23 +2,39 @@
 
 import sys
 import os
-import json
 import time
-from typing import List
+from typing import List, Optional, Sequence
 import traceback
 from datetime import datetime
+from functools import partial
 import numpy as np
 import websocket
 from send_order_signal import SendOrderSignal
+from candle_store import CandleStore
+from kline_decoder import Candle, decode_closed_kline
+from backoff import Backoff, run_reconnecting
+from order_executor import OrderExecutor, OrderIntent
+from ledger import Ledger
+from kline_cache import KlineCache
+from snapshot import snapshot_path, save_snapshot, load_snapshot
+from binance.helpers import interval_to_milliseconds
 from binance.enums import SIDE_BUY, SIDE_SELL
 from binance.exceptions import BinanceAPIException
-from strategies import RSI, Bollinger, KeltnerChannels, StochRSI, EMABuy100
+from strategies import (RSI, Bollinger, KeltnerChannels, StochRSI, EMABuy100,
+                        IndicatorRegistry)
 
 
 class Trader:
     """Applies strategies and sends buy/sell orders for a single coin."""
 
-    def __init__(self, config: dict, tradeSymbol: str, seed: int) -> None:
+    def __init__(
+        self,
+        config: dict,
+        tradeSymbol: str,
+        seed: int,
+        historicalData: Optional[tuple] = None,
+        ledger: Optional[Ledger] = None
+    ) -> None:
         """Main controller that will maintain the connection, and send buy/sell
         singals.
 
@@ -26,6 +42,11 @@ class Trader:
             config - (dict) Set of configurations for the class to use.
             tradeSymbol - (str) Trade symbol
             seed - (int) Seed number for selecting strategies to run.
+            historicalData - (namedtuple) Historical data already fetched,
+                i.e: by the `WarmupScheduler`. It is loaded once the
+                connection is opened instead of being fetched.
+            ledger - (Ledger) Ledger shared with other traders in the same
+                process. A ledger is created if one is not provided.
         """
 
         self.tradeSymbol = tradeSymbol
@@ -41,13 +62,27 @@ class Trader:
             self._postRequests = self.config['testing']['post_requests']
 
         # Vars to help keep a track of the state.
-        self._closes = []
-        self._lowPrices = []
-        self._highPrices = []
         self._purchasedPrice = 0
         self._inStopLoss = False
 
+        # Orders are run on a worker thread so that candles keep being
+        # processed whilst they are in flight. No other orders are placed
+        # whilst one is pending.
+        self._orderExecutor = OrderExecutor(
+            self.place_order,
+            self.on_order_result,
+            f'{tradeSymbol}-orders'
+        )
+        self._orderPending = False
+
+        # Balances are tracked from the order responses, the API is only
+        # used to reload them periodically.
+        self._ledger = ledger or Ledger(
+            self.config['defaults']['balance_reconcile_secs']
+        )
+
         self._tradeCurrency = self._set_trade_currency()
+        self._tradeAsset = self.tradeSymbol.replace(self._tradeCurrency, '')
         self._stopLoss = self._set_stop_loss()
 
         # Create loggers
@@ -55,10 +90,22 @@ class Trader:
         self._errLogger = self._set_error_logger()
         self._outputDataset = self._set_output_dataset()
 
-        if seed == 0:
-            self._strategies = [RSI, Bollinger]
-        else:
-            self._strategies = [KeltnerChannels, StochRSI]
+        self._strategies = self.select_strategies(seed)
+
+        # Closed candles are kept on disk so that a restart only fetches the
+        # candles missed whilst the bot was down.
+        lookback = self.lookback(config, self._strategies)
+        self._candles = CandleStore(lookback)
+        self._klineCache = KlineCache(
+            tradeSymbol,
+            self.config['defaults']['interval'],
+            lookback
+        )
+
+        # Indicators are calculated once per candle by the registry and
+        # shared between the strategies that require them.
+        self._indicators = IndicatorRegistry()
+        self._pipeline = self._build_pipeline()
 
         self._ownCoins = False
 
@@ -68,20 +115,108 @@ class Trader:
         self._createDatasetHead = True
 
         self._historyDataFetched = False
+        self._warmupData = historicalData
+
+        # The state is saved every few candles, and after any candle that
+        # changed the position, so that a restart can resume from where it
+        # left off.
+        self._statePath = snapshot_path(tradeSymbol)
+        self._snapshotInterval = \
+            self.config['defaults']['snapshot_interval_candles']
+        self._candlesSinceSnapshot = 0
+        self._savedPosition = None
+        self._intervalMs = interval_to_milliseconds(
+            self.config['defaults']['interval']
+        )
+
+        self._backoff = Backoff(
+            self.config['defaults']['reconnect_backoff_secs'],
+            self.config['defaults']['reconnect_max_backoff_secs']
+        )
+
+    @staticmethod
+    def select_strategies(seed: int) -> List[type]:
+        """Selects the strategies to run.
+
+        Args:
+            seed - (int) Seed number for selecting strategies to run.
+
+        Returns:
+            type[] - Strategy classes.
+        """
+        if seed == 0:
+            return [RSI, Bollinger]
+        else:
+            return [KeltnerChannels, StochRSI]
+
+    @staticmethod
+    def lookback(config: dict, strategies: List[type]) -> int:
+        """Number of candles to keep for a set of strategies.
+
+        Args:
+            config - (dict) Config dict.
+            strategies - (type[]) Strategy classes.
+
+        Returns:
+            int - The number of candles needed by the strategy needing the
+                most candles, and no fewer than `closes_array_size`.
+        """
+        return max(
+            [config['defaults']['closes_array_size']]
+            + [strat.lookback(config['strategies'][strat.__name__.lower()])
+               for strat in strategies]
+        )
 
     @property
-    def closes(self) -> list:
+    def candles(self) -> CandleStore:
+        """Fetches the store of the latest candles."""
+        return self._candles
+
+    @property
+    def closes(self) -> np.array:
         """Fetches the closing prices."""
-        return self._closes
+        return self._candles.closes
 
-    @closes.setter
-    def closes(self, closingPrices: list) -> None:
-        """Updates the closing prices.
+    @property
+    def lowPrices(self) -> np.array:
+        """Fetches the low prices."""
+        return self._candles.lows
+
+    @property
+    def highPrices(self) -> np.array:
+        """Fetches the high prices."""
+        return self._candles.highs
+
+    @property
+    def orderExecutor(self):
+        """Fetches the executor orders are placed with."""
+        return self._orderExecutor
+
+    @orderExecutor.setter
+    def orderExecutor(self, executor) -> None:
+        """Replaces the executor orders are placed with, i.e: by the asyncio
+        runtime.
 
         Args:
-            closingPrices - (list) New closing prices.
+            executor - (OrderExecutor|AsyncOrderExecutor) Executor taking
+                `OrderIntent`s.
         """
-        self._closes = closingPrices
+        self._orderExecutor = executor
+
+    @property
+    def historyLoaded(self) -> bool:
+        """Has the historical data been loaded?"""
+        return self._historyDataFetched
+
+    @property
+    def strategies(self) -> List[type]:
+        """Fetches the strategies applied by the trader."""
+        return self._strategies
+
+    @property
+    def indicators(self) -> IndicatorRegistry:
+        """Fetches the indicators kept up to date with each candle."""
+        return self._indicators
 
     @property
     def purchasedPrice(self) -> float:
@@ -138,31 +273,38 @@ class Trader:
         """Fetches the stop loss multiplier."""
         return self._stopLoss
 
-    def trade(self, close: float):
+    def trade(
+        self,
+        close: float,
+        decisions: Optional[Sequence[int]] = None,
+        results: Optional[np.array] = None
+    ):
         """Main controller for trading. The method will run the defined
         strategies and make a purchase/sale when relevant and update the log.
 
         Args:
             close - (float) Latest closing price.
+            decisions - (int[]) Decision of each strategy, when already made
+                for many traders at once by a `BatchEvaluator`.
+            results - (np.array) Results row matching `decisions`.
         """
         try:
-            closes = np.array(self.closes)
+            if decisions is None:
+                # Run each strategy and collect the decisions.
+                decisions = self.run_strategies(self.closes)
+            else:
+                self._resultsRow[:] = results
 
-            # Run each strategy and collect the results.
-            stratResults = self.run_strategies(closes)
-            self.action_decision(
-                close,
-                [stratResult['decision'] for stratResult in stratResults]
-            )
+            self.action_decision(close, decisions)
             self.stop_loss(close)
-            self.update_dataset(close, stratResults)
+            self.update_dataset(close)
 
         except Exception:
             err = traceback.format_exc()
             self.log_error(err)
             print(f'\033[92m{err}\033[0m')
 
-    def buy_quantity(self, closePrice: float) -> float:
+    def buy_quantity(self, closePrice: float) -> Optional[str]:
         """Calculates the buy quantity taking in consideration the price for
         each coin and the buy strategy defined in the config.
 
@@ -170,7 +312,8 @@ class Trader:
             closePrice - (float) The closing price of the coin.
 
         Returns:
-            float - Quantity to buy.
+            str|None - Quantity to buy or `None` if it would be below the
+                minimum notional.
         """
         buyOpts = self.config['buy_options']
 
@@ -183,37 +326,75 @@ class Trader:
         # balance to invest by multiplying by the chosen percentage and then
         # devide by the closing price.
         elif buyOpts['mode'] == 'balance_percent':
-            balance = self.signalDispatcher.asset_balance(self._tradeCurrency)
+            balance = self._ledger.balance(self._tradeCurrency)
             quantity = balance * buyOpts['balance_percent'] / 100 / closePrice
 
         return self.signalDispatcher.apply_filters(
             self.tradeSymbol,
-            quantity
+            quantity,
+            closePrice
         )
 
-    def run_strategies(self, npCloses: np.array) -> List[dict]:
-        """Runs each strategy on collections of closing prices.
+    def _build_pipeline(self) -> List[tuple]:
+        """Creates each strategy once, resolving its config and the accessors
+        for any additional arguments it needs, and registers the indicators
+        it requires.
 
-        Args:
-            npCloses - (np.array) Closing prices.
+        Every strategy writes its results to its own slice of a single row,
+        `_resultsRow`, which is what is written to the dataset.
 
         Returns:
-            A list of there results from running each strategy. Each list item
-            will with dictionaries containing a results produced by that
-            strategy and a decision.
+            tuple[] - For each strategy, its bound `apply_indicator` method,
+                its config and a tuple of accessors for the additional
+                arguments.
         """
-        stratResults = []
+        self._datasetColumns = [column for strat in self._strategies
+                                for column in strat.columns]
+        self._resultsRow = np.full(len(self._datasetColumns), np.nan)
+
+        pipeline = []
+        rowStart = 0
         for strat in self._strategies:
             config = self.config['strategies'][strat.__name__.lower()]
+            self._indicators.require_all(strat.indicators(config))
+
+            # The attributes are fetched on every call as the views of the
+            # candle store move along with each new candle.
+            accessors = tuple(
+                partial(getattr, self, arg)
+                for arg in config.get('additional_args', [])
+            )
 
-            stratResults.append(strat(self.log).apply_indicator(
+            rowEnd = rowStart + len(strat.columns)
+            strategy = strat(self.log, self._resultsRow[rowStart:rowEnd])
+            rowStart = rowEnd
+
+            pipeline.append((strategy.apply_indicator, config, accessors))
+
+        return pipeline
+
+    def run_strategies(self, npCloses: np.array) -> List[int]:
+        """Runs each strategy on collections of closing prices.
+
+        Args:
+            npCloses - (np.array) Closing prices.
+
+        Returns:
+            int[] - The decision made by each strategy. The results of each
+                strategy are written to `_resultsRow`.
+        """
+        ownCoins = self.ownCoins
+        indicators = self._indicators
+        return [
+            applyIndicator(
                 npCloses,
                 config,
-                self.ownCoins,
-                *[getattr(self, arg) for arg
-                  in config.get('additional_args', [])]
-            ))
-        return stratResults
+                ownCoins,
+                *[accessor() for accessor in accessors],
+                indicators=indicators
+            )
+            for applyIndicator, config, accessors in self._pipeline
+        ]
 
     def action_decision(self, close: float, decisions: List[int]) -> None:
         """Using the results, check the buy/sell decisions returned by each
@@ -225,76 +406,19 @@ class Trader:
             decisions - (int[]) List of decisions.
         """
 
+        # Wait for the order in flight to complete before placing another.
+        if self._orderPending:
+            return
+
         if (all(decision == 1 for decision in decisions)
                 and not self._inStopLoss):
             self.log('CONTROLLER: BUY')
-            if self._postRequests:
-                res = self.signalDispatcher.send_signal(
-                    SIDE_BUY,
-                    self.tradeSymbol,
-                    self.buy_quantity(close),
-                    self._testMode
-                )
-
-                # Send buys signal.
-                if res['success']:
-                    self.ownCoins = True
-                    self.purchasedPrice = close
-
-                    self.log('SIGNAL: BOUGHT')
-                    print(f'\033[92mSIGNAL BOUGHT {self.tradeSymbol}.\033[0m')
-
-                else:
-                    self.ownCoins = False
-                    self.purchasedPrice = 0
-
-                    self.log('SIGNAL: ERROR BUYING')
-                    self.log_error(res['error'])
-                    self.log_error(res['params'])
-
-            else:
-                # The post request mode would equal False during testing,
-                # so assume that the request has gone through.
-                self.ownCoins = True
-                self.purchasedPrice = close
+            self.send_order(OrderIntent(SIDE_BUY, close, 'strategy'))
 
         elif all(decision == -1 for decision in decisions):
             # Get and sell the entire stock.
-
             self.log('CONTROLLER: SELL')
-            if self._postRequests:
-                quantity = self.signalDispatcher.apply_filters(
-                    self.tradeSymbol,
-                    self.signalDispatcher.asset_balance(
-                        self.tradeSymbol.replace(self._tradeCurrency, '')
-                    )
-                )
-
-                res = self.signalDispatcher.send_signal(
-                    SIDE_SELL,
-                    self.tradeSymbol,
-                    quantity,
-                    self._testMode
-                )
-
-                # Send sell signal
-                if res['success']:
-                    self.ownCoins = False
-                    self._purchasedPrice = 0
-                    self.log('SIGNAL: SOLD')
-                    print(f'\033[92mSIGNAL SOLD {self.tradeSymbol}.\033[0m')
-
-                else:
-                    self.ownCoins = True
-                    self.log('SIGNAL: ERROR SELLING')
-                    self.log_error(res['error'])
-                    self.log_error(res['params'])
-
-            else:
-                # The post request mode would equal False during testing,
-                # so assume that the request has gone through.
-                self.ownCoins = False
-                self.purchasedPrice = 0
+            self.send_order(OrderIntent(SIDE_SELL, close, 'strategy'))
 
     def stop_loss(self, close: float) -> None:
         """Attempts to migate any losses by selling coins if the value drops
@@ -304,45 +428,15 @@ class Trader:
             close - (float) Closing price.
         """
 
+        if self._orderPending:
+            return
+
         if (self.purchasedPrice
                 and close <= self.purchasedPrice * self.get_stop_loss()):
             print('\033[92mSELLING TO PREVENT STOP LOSS.\033[0m')
             self.log('STOP LOSS SELLING')
             self._inStopLoss = True
-
-            if self._postRequests:
-                quantity = self.signalDispatcher.apply_filters(
-                    self.tradeSymbol,
-                    self.signalDispatcher.asset_balance(
-                        self.tradeSymbol.replace(self._tradeCurrency, '')
-                    )
-                )
-
-                res = self.signalDispatcher.send_signal(
-                    SIDE_SELL,
-                    self.tradeSymbol,
-                    quantity,
-                    self._testMode
-                )
-
-                # Send sell signal
-                if res['success']:
-                    self.ownCoins = False
-                    self.purchasedPrice = 0
-                    self.log('SIGNAL: SOLD')
-                    print(f'\033[92mSIGNAL SOLD {self.tradeSymbol}.\033[0m')
-
-                else:
-                    self.ownCoins = True
-                    self.log('SIGNAL: ERROR SELLING')
-                    self.log_error(res['error'])
-                    self.log_error(res['params'])
-
-            else:
-                # The post request mode would equal False during testing,
-                # so assume that the request has gone through.
-                self.ownCoins = False
-                self.purchasedPrice = 0
+            self.send_order(OrderIntent(SIDE_SELL, close, 'stop_loss'))
 
         # Check if out of stop loss.
         elif self._inStopLoss and close >= self.closes[-2]:
@@ -351,66 +445,143 @@ class Trader:
             # Force a purchase
             print('\033[92mFORCING A PURCHASE AFTER STOP LOSS.\033[0m')
             self.log('FORCING A PURCHASE AFTER STOP LOSS.')
-            if self._postRequests:
-                res = self.signalDispatcher.send_signal(
-                    SIDE_BUY,
-                    self.tradeSymbol,
-                    self.buy_quantity(close),
-                    self._testMode
-                )
+            self.send_order(OrderIntent(SIDE_BUY, close, 'stop_loss'))
 
-                # Send buys signal.
-                if res['success']:
-                    self.ownCoins = True
-                    self.purchasedPrice = close
+    def send_order(self, intent: OrderIntent) -> None:
+        """Hands an order to the order executor. The position is updated
+        once the executor reports the result back to `on_order_result`.
+
+        Args:
+            intent - (OrderIntent) Order to place.
+        """
+        if self._postRequests:
+            self._orderPending = True
+            self._orderExecutor.submit(intent)
+        else:
+            # The post request mode would equal False during testing,
+            # so assume that the request has gone through.
+            self._update_position(intent.side == SIDE_BUY, intent.close)
+
+    def place_order(self, intent: OrderIntent) -> dict:
+        """Works out the quantity for an order and sends it. This is run by
+        the order executor on its worker thread.
+
+        Args:
+            intent - (OrderIntent) Order to place.
+
+        Returns:
+            dict - Result of `SendOrderSignal.send_signal`, or of skipping
+                an order the exchange would reject.
+        """
+        if self._ledger.stale:
+            self.reconcile_balances()
 
+        if intent.side == SIDE_BUY:
+            quantity = self.buy_quantity(intent.close)
+        else:
+            # Sell the entire stock.
+            quantity = self.signalDispatcher.apply_filters(
+                self.tradeSymbol,
+                self._ledger.balance(self._tradeAsset),
+                intent.close
+            )
+
+        # The exchange would reject the order.
+        if quantity is None:
+            return {
+                'success': False,
+                'skipped': True,
+                'params': {'side': intent.side, 'close': intent.close},
+                'error': 'Order value is below the minimum notional.'
+            }
+
+        return self.signalDispatcher.send_signal(
+            intent.side,
+            self.tradeSymbol,
+            quantity,
+            self._testMode
+        )
+
+    def on_order_result(self, intent: OrderIntent, res: dict) -> None:
+        """Updates the position once an order has been run. This is called by
+        the order executor on its worker thread.
+
+        Args:
+            intent - (OrderIntent) Order that was placed.
+            res - (dict) Result of `SendOrderSignal.send_signal`.
+        """
+        # The flag is always cleared, otherwise an error here would stop
+        # the trader from ever placing another order.
+        try:
+            buying = intent.side == SIDE_BUY
+
+            if res['success']:
+                # The order has been filled, so the position is updated
+                # before anything else can fail.
+                self._update_position(buying, intent.close)
+                self._ledger.apply_order(
+                    intent.side,
+                    self._tradeAsset,
+                    self._tradeCurrency,
+                    res['results']
+                )
+                if buying:
                     self.log('SIGNAL: BOUGHT')
                     print(f'\033[92mSIGNAL BOUGHT {self.tradeSymbol}.\033[0m')
-
                 else:
-                    self.ownCoins = False
-                    self.purchasedPrice = 0
+                    self.log('SIGNAL: SOLD')
+                    print(f'\033[92mSIGNAL SOLD {self.tradeSymbol}.\033[0m')
 
+            else:
+                # The order may have been rejected because the balances are
+                # out of date, i.e: another process spent them, so they are
+                # reloaded before the next order is placed. Orders skipped
+                # before being sent leave the balances as they are.
+                if not res.get('skipped'):
+                    self._ledger.invalidate()
+
+                if buying:
+                    self._update_position(False, 0)
                     self.log('SIGNAL: ERROR BUYING')
-                    self.log_error(res['error'])
-                    self.log_error(res['params'])
+                else:
+                    self.ownCoins = True
+                    self.log('SIGNAL: ERROR SELLING')
+                self.log_error(res['error'])
+                self.log_error(res['params'])
+        finally:
+            self._orderPending = False
 
-            else:
-                # The post request mode would equal False during testing,
-                # so assume that the request has gone through.
-                self.ownCoins = True
-                self.purchasedPrice = close
+    def reconcile_balances(self) -> None:
+        """Reloads the ledger from a snapshot of the account balances."""
+        self._ledger.load(self.signalDispatcher.account_balances())
+
+    def _update_position(self, owned: bool, close: float) -> None:
+        """Updates the owned state and the purchased price.
+
+        Args:
+            owned - (bool) Are the coins owned?
+            close - (float) Closing price the coins were bought at.
+        """
+        self.ownCoins = owned
+        self.purchasedPrice = close if owned else 0
 
-    def update_dataset(self, close: float, results: List[dict]) -> None:
+    def update_dataset(self, close: float) -> None:
         """Logs information from running the strategies into the dataset log.
 
         Args:
             close - (float) Closing price.
-            results - (dict[]) Collection of result dictionaries which should
-                contain a `results` and `decision` key with respective values.
         """
 
         # Create the headers for the dataset csv is it has not already been
         # created.
         if self._createDatasetHead:
-            headers = []
-            for result in results:
-                headers += list(result['results'].keys())
-
-            self.add_dataset('|'.join(headers))
+            self.add_dataset('|'.join(self._datasetColumns))
             self._createDatasetHead = False
 
-        # Create a single string from all the results and log.
-        resultVals = []
-        for result in results:
-            resultVals += list(result['results'].values())
-
-        # Casting each element into a string to ensure that there are no
-        # `np.float64` datatypes.
-        resultVals = [str(result) for result in resultVals]
-
-        # Convert any numpy floats to strings
-        self.add_dataset('|'.join([str(close)] + resultVals))
+        # `tolist` converts the row into Python floats in a single call.
+        self.add_dataset(
+            '|'.join(map(str, [close] + self._resultsRow.tolist()))
+        )
 
     def _set_logger(self):
         """Creates and opens the log."""
@@ -494,16 +665,44 @@ class Trader:
         """Adds to the dataset."""
         self._outputDataset.write(f'{self.timestamp()}|{msg}\n')
 
-    def load_historical_data(self) -> None:
-        """Prepends historical data onto the dataset."""
+    def load_historical_data(
+        self,
+        historicalData: Optional[tuple] = None
+    ) -> None:
+        """Prepends historical data onto the dataset.
+
+        Args:
+            historicalData - (namedtuple) Historical data to load. When not
+                provided, it is fetched.
+        """
         try:
-            historicalData = self.signalDispatcher.historical_data(
-                self.tradeSymbol,
+            if historicalData is None:
+                historicalData = self._klineCache.sync(partial(
+                    self.signalDispatcher.historical_data,
+                    self.tradeSymbol,
+                    self.config['defaults']['interval']
+                ))
+
+            candles = self._candles
+            opens, highs, lows, closes, volumes, openTimes = (
+                np.concatenate((history, current))
+                for history, current in (
+                    (historicalData.opens, candles.opens),
+                    (historicalData.highs, candles.highs),
+                    (historicalData.lows, candles.lows),
+                    (historicalData.closes, candles.closes),
+                    (historicalData.volumes, candles.volumes),
+                    (historicalData.openTimes, candles.openTimes),
+                )
             )
 
-            self.closes = historicalData.closes + self.closes
-            self._lowPrices = historicalData.lows + self._lowPrices
-            self._highPrices = historicalData.highs + self._highPrices
+            # The indicators are seeded with all of the history, the store
+            # only keeps the latest `lookback` candles.
+            self._indicators.seed(closes, lows, highs)
+
+            candles.clear()
+            candles.extend(opens, highs, lows, closes, volumes, openTimes)
+            self._historyDataFetched = True
 
             print(f'\033[92mData loaded for {self.tradeSymbol}\033[0m')
 
@@ -511,6 +710,111 @@ class Trader:
             print(f'\033[91mFailed loading data loaded for\
                 {self.tradeSymbol}\033[0m')
 
+    def catch_up(self) -> None:
+        """Loads the candles that closed whilst the trader was disconnected
+        without trading on them.
+        """
+        if not len(self._candles):
+            self.load_historical_data()
+            return
+
+        # The latest closed candle opened one interval before the candle that
+        # is currently open.
+        lastOpenTime = self._candles.openTimes[-1]
+        if lastOpenTime + 2 * self._intervalMs > time.time() * 1000:
+            return
+
+        historicalData = self._klineCache.sync(partial(
+            self.signalDispatcher.historical_data,
+            self.tradeSymbol,
+            self.config['defaults']['interval']
+        ))
+
+        missed = historicalData.openTimes > lastOpenTime
+        if not missed.any():
+            return
+
+        # Too many candles were missed to continue on from the latest
+        # candle, so the candles are reloaded.
+        firstMissed = historicalData.openTimes[missed][0]
+        if firstMissed - lastOpenTime > self._intervalMs:
+            self._candles.clear()
+            self.load_historical_data(historicalData)
+            return
+
+        for close, low, high, openPrice, volume, openTime in zip(
+            *(field[missed] for field in historicalData)
+        ):
+            self._candles.append(openPrice, high, low, close, volume,
+                                 openTime)
+            self._indicators.update(close, low, high)
+
+        print(f'\033[92mLoaded {missed.sum()} missed candles for '
+              f'{self.tradeSymbol}\033[0m')
+
+    def position(self) -> tuple:
+        """The owned state, the purchased price and the stop loss state."""
+        return (self.ownCoins, self.purchasedPrice, self._inStopLoss)
+
+    def save_state(self) -> None:
+        """Saves a snapshot of the candles and the position."""
+        candles = self._candles
+        position = self.position()
+        save_snapshot(self._statePath, {
+            'candles': np.array([candles.field(field)
+                                 for field in candles.FIELDS]),
+            'position': np.array(position, dtype=float),
+        })
+        self._savedPosition = position
+        self._candlesSinceSnapshot = 0
+
+    def save_state_throttled(self) -> None:
+        """Saves a snapshot once every `snapshot_interval_candles` candles,
+        or straight away if the position has changed since the last one.
+        """
+        self._candlesSinceSnapshot += 1
+        if (self._candlesSinceSnapshot >= self._snapshotInterval
+                or self.position() != self._savedPosition):
+            self.save_state()
+
+    def restore_state(self) -> bool:
+        """Resumes from a snapshot, if one exists. The indicators are seeded
+        from the restored candles.
+
+        Returns:
+            bool - Was the snapshot restored?
+        """
+        state = load_snapshot(self._statePath)
+        if state is None:
+            return False
+
+        candles = state.get('candles')
+        position = state.get('position')
+        if (candles is None or position is None
+                or candles.ndim != 2
+                or candles.shape[0] != len(self._candles.FIELDS)
+                or not candles.shape[1]
+                or position.shape != (3,)):
+            return False
+
+        self._candles.clear()
+        self._candles.extend(*candles)
+        self._indicators.seed(
+            self._candles.closes,
+            self._candles.lows,
+            self._candles.highs
+        )
+        self._historyDataFetched = True
+
+        ownCoins, purchasedPrice, inStopLoss = position.tolist()
+        self.ownCoins = bool(ownCoins)
+        self.purchasedPrice = purchasedPrice
+        self._inStopLoss = bool(inStopLoss)
+        self._savedPosition = self.position()
+
+        print(f'\033[92mResumed {self.tradeSymbol} from snapshot.\033[0m')
+        return True
+
     def on_open(self, ws: websocket.WebSocketApp):
         """Method to run when the socket is opened.
 
@@ -520,99 +824,152 @@ class Trader:
 
         print(f'\033[92m\nConnected to {self.tradeSymbol} opened.\033[0m')
 
+        # The trading rules are loaded before any order can be placed.
+        self.signalDispatcher.load_exchange_info()
+        if self._ledger.stale:
+            self.reconcile_balances()
         self.ownCoins = self.signalDispatcher.has_coins(
             self._tradeCurrency,
-            self.tradeSymbol
+            self.tradeSymbol,
+            self._ledger.balance(self._tradeAsset)
         )
         if self.ownCoins:
             self.log(f'Setting {self.tradeSymbol} to owned.')
             print(f'\033[92mSetting {self.tradeSymbol} to owned.\033[0m')
+        else:
+            self.purchasedPrice = 0
 
-        # Loading historical data.
-        # Creating a 30s delay between capturing historical data to allow
-        # coin state to load before capturing historical data in case of IP
-        # ban.
+        # Loading historical data, using the data fetched during the warm up
+        # if there is any. When reconnecting or resuming from a snapshot,
+        # only the candles missed are loaded.
         if not self._historyDataFetched:
-            time.sleep(30)
-            self.load_historical_data()
+            self.load_historical_data(self._warmupData)
+            self._warmupData = None
+        else:
+            self.catch_up()
 
-    def on_close(self, ws: websocket.WebSocketApp):
-        """Method to run when the socket is closed.
+    def on_close(self, ws: websocket.WebSocketApp, *args):
+        """Method to run when the socket is closed. The connection is
+        reopened by `run`.
 
          Args:
             ws - (websocket.WebSocketApp) Websocket object.
         """
-
-        # Attempt to reopen the connection
-
         print(f'\033[91mConnection to {self.tradeSymbol} closed.\033[0m')
-        try:
-            time.sleep(10)
-            self.run()
-        except KeyboardInterrupt:
-            self._logger.close()
-            self._errLogger.close()
-            self._outputDataset.close()
-            sys.exit()
 
-    def on_message(self, ws: websocket.WebSocketApp, message: json) -> None:
+    def on_message(self, ws: websocket.WebSocketApp, message: str) -> None:
         """Action to perform whenever a new message is received.
 
          Args:
             ws - (websocket.WebSocketApp) Websocket object.
-            message - (json) Message returned from websocket.
+            message - (str) Message returned from websocket.
         """
 
-        # Message response information can be found by visting:
-        # https://github.com/binance/binance-spot-api-docs/blob/master/web-socket-streams.md
         try:
             # Retrieve data from the websocket and progress on once a closing
             # price has been registered.
-            msg = json.loads(message)
-            candle = msg['k']
-
-            if not candle['x']:
+            candle = decode_closed_kline(message)
+            if candle is None:
                 return
 
-            close = float(candle['c'])
-            low = float(candle['l'])
-            high = float(candle['h'])
+            self.on_candle(candle)
 
-            self.log(f'CONTROLLER: CLOSED AT {close}')
-            print(f'{self.tradeSymbol} CLOSED AT: {close}')
+            # The connection is healthy again.
+            self._backoff.reset()
 
-            self.closes.append(close)
-            self._lowPrices.append(low)
-            self._highPrices.append(high)
+        except Exception:
+            err = traceback.format_exc()
+            self.log_error(err)
+            print(f'\033[92m{err}\033[0m')
 
-            # To save memory and prevent a infinitely long closes array,
-            # truncate the size to whatever we actually need.
-            # This is done in a while loop as supposed to a if statement in
-            # case the closing prices are provided using the setter.
-            while (len(self.closes)
-                   > self.config['defaults']['closes_array_size']):
-                self.closes.pop(0)
-                self._lowPrices.pop(0)
-                self._highPrices.pop(0)
+    def add_candle(self, candle: Candle) -> bool:
+        """Adds a closed candle to the store and updates the indicators.
+        Candles that are not newer than the latest candle loaded are skipped.
+
+        Args:
+            candle - (Candle) Closed candle.
+
+        Returns:
+            bool - Was the candle added?
+        """
+        # Candles received whilst the history was being loaded, or caught up
+        # on, may already have been loaded with it.
+        candles = self._candles
+        if len(candles) and candle.openTime <= candles.openTimes[-1]:
+            return False
 
-            self.trade(close)
+        close = candle.close
+
+        # The store drops the oldest candle once it is full.
+        candles.append(*candle)
+        self._klineCache.append(*candle)
+
+        self.log(f'CONTROLLER: CLOSED AT {close}')
+        print(f'{self.tradeSymbol} CLOSED AT: {close}')
+
+        self._indicators.update(close, candle.low, candle.high)
+        return True
+
+    def on_candle(self, candle: Candle) -> None:
+        """Trades on a closed candle. Candles that are not newer than the
+        latest candle loaded are skipped.
+
+        Args:
+            candle - (Candle) Closed candle.
+        """
+        try:
+            if self.add_candle(candle):
+                self.trade(candle.close)
+                self.save_state_throttled()
 
         except Exception:
             err = traceback.format_exc()
             self.log_error(err)
             print(f'\033[92m{err}\033[0m')
 
+    def close(self) -> None:
+        """Stops the order executor, saves the state and closes the logs."""
+        self._orderExecutor.stop()
+        if self._historyDataFetched:
+            self.save_state()
+        self._logger.close()
+        self._errLogger.close()
+        self._outputDataset.close()
+
     def run(self):
-        """Runs the trading process."""
-        self.signalDispatcher = SendOrderSignal()
-
-        ws = websocket.WebSocketApp(
-            self.config['defaults']['socket_address'].replace(
-                '{{trade_symbol}}',
-                self.tradeSymbol.lower()
-            ),
-            on_open=self.on_open,
-            on_close=self.on_close,
-            on_message=self.on_message
+        """Runs the trading process, reconnecting whenever the connection is
+        closed, until interrupted. Reconnection attempts after an error are
+        backed off exponentially until a candle is received.
+        """
+        defaults = self.config['defaults']
+
+        if self.signalDispatcher is None:
+            self.signalDispatcher = SendOrderSignal(
+                defaults['exchange_info_ttl_secs'],
+                defaults['rest_gateway_address']
+            )
+        self.restore_state()
+
+        socketAddress = defaults['socket_address'].replace(
+            '{{trade_symbol}}',
+            self.tradeSymbol.lower()
         )
-        ws.run_forever()
+
+        try:
+            run_reconnecting(
+                lambda onError: websocket.WebSocketApp(
+                    socketAddress,
+                    on_open=self.on_open,
+                    on_close=self.on_close,
+                    on_message=self.on_message,
+                    on_error=onError
+                ),
+                self._backoff,
+                self.tradeSymbol
+            )
+        except KeyboardInterrupt:
+            # Interrupted whilst waiting to reconnect.
+            pass
+
+        self.close()
+        sys.exit()
@@ -0,0 +1,127 @@
+"""Fetches the historical data of many symbols concurrently at startup."""
+
+from typing import Callable, Dict, Iterable
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Weight of a single klines request.
+KLINES_WEIGHT = 2
+
+# Weight of fetching the historical data of a symbol.
+# `Client.get_historical_klines` sends a klines request for the earliest
+# available candle before the klines request for the candles themselves.
+HISTORY_WEIGHT = 2 * KLINES_WEIGHT
+
+
+class WeightBudget:
+    """Token bucket limiting the request weight used per minute. The bucket
+    starts full and refills continuously.
+    """
+
+    def __init__(self, weightPerMinute: int) -> None:
+        """Sets up a full bucket.
+
+        Args:
+            weightPerMinute - (int) Request weight allowed per minute.
+        """
+        self._capacity = weightPerMinute
+        self._rate = weightPerMinute / 60
+        self._tokens = float(weightPerMinute)
+        self._updatedAt = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, weight: int) -> None:
+        """Blocks until `weight` can be used.
+
+        Args:
+            weight - (int) Weight of the request about to be sent.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updatedAt) * self._rate
+                )
+                self._updatedAt = now
+
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+
+                waitSecs = (weight - self._tokens) / self._rate
+
+            time.sleep(waitSecs)
+
+
+class WarmupScheduler:
+    """Fetches the historical data of a collection of symbols concurrently,
+    handing each symbol over as soon as its data is ready.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], object],
+        budget: WeightBudget,
+        maxWorkers: int = 8
+    ) -> None:
+        """Sets up the scheduler.
+
+        Args:
+            fetch - (Callable) Returns the historical data of a symbol.
+            budget - (WeightBudget) Budget the requests are made under.
+            maxWorkers - (int) Maximum number of concurrent requests.
+        """
+        self._fetch = fetch
+        self._budget = budget
+        self._maxWorkers = maxWorkers
+
+    def _fetch_symbol(self, tradeSymbol: str) -> object:
+        self._budget.acquire(HISTORY_WEIGHT)
+        return self._fetch(tradeSymbol)
+
+    def run(
+        self,
+        tradeSymbols: Iterable[str],
+        onReady: Callable[[str, object], None]
+    ) -> Dict[str, float]:
+        """Fetches the historical data of each symbol.
+
+        Args:
+            tradeSymbols - (str[]) Trade symbols.
+            onReady - (Callable) Called from the calling thread with the
+                symbol and its historical data, in the order the data is
+                ready. If the data could not be fetched, it is called with
+                `None` so that the trader can fetch the data itself.
+
+        Returns:
+            dict - Number of seconds taken for each symbol to be ready.
+                Symbols that failed to load are not included.
+        """
+        startedAt = time.monotonic()
+        readySecs = {}
+
+        with ThreadPoolExecutor(self._maxWorkers) as executor:
+            futures = {
+                executor.submit(self._fetch_symbol, tradeSymbol): tradeSymbol
+                for tradeSymbol in tradeSymbols
+            }
+
+            for future in as_completed(futures):
+                tradeSymbol = futures[future]
+                try:
+                    historicalData = future.result()
+                except Exception as err:
+                    print(f'\033[91mFailed loading data for {tradeSymbol}: '
+                          f'{err}\033[0m')
+                    onReady(tradeSymbol, None)
+                    continue
+
+                onReady(tradeSymbol, historicalData)
+                readySecs[tradeSymbol] = time.monotonic() - startedAt
+                print(f'\033[92m{tradeSymbol} ready in '
+                      f'{readySecs[tradeSymbol]:.1f}s.\033[0m')
+
+        return readySecs